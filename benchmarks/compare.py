@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.compare
+    ~~~~~~~~~~~~~~~~~~
+
+    Compare two sets of results saved by ``python -m benchmarks.suite --output``.
+
+    Run with ``python -m benchmarks.compare before.json after.json``, exits with status 1 if any scenario's calls per
+    second regressed by more than ``--threshold``.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path) as results:
+        data = json.load(results)
+    return data['metadata'], {result['name']: result for result in data['results']}
+
+
+def main(argv: list=None) -> int:
+    parser = argparse.ArgumentParser(description='Compare two sets of benchmark results.')
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='The proportional drop in calls per second considered a regression.')
+    args = parser.parse_args(argv)
+
+    before_meta, before = load(args.before)
+    after_meta, after = load(args.after)
+    print('before: %s  after: %s' % (before_meta.get('commit'), after_meta.get('commit')))
+
+    regressions = []
+    print('%-28s %12s %12s %8s %10s %10s' % ('scenario', 'before/sec', 'after/sec', 'change', 'p99 before', 'p99 after'))
+    for name in before:
+        if name not in after:
+            continue
+        old, new = before[name], after[name]
+        change = new['calls_per_sec'] / old['calls_per_sec'] - 1
+        flag = ''
+        if change < -args.threshold:
+            regressions.append(name)
+            flag = ' !'
+        print('%-28s %12.1f %12.1f %+7.1f%% %10.2f %10.2f%s' % (
+            name, old['calls_per_sec'], new['calls_per_sec'], change * 100, old['p99_ms'], new['p99_ms'], flag
+        ))
+
+    if regressions:
+        print('\n%d scenario(s) regressed by more than %.0f%%: %s' % (
+            len(regressions), args.threshold * 100, ', '.join(regressions)
+        ))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
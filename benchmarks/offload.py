@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.offload
+    ~~~~~~~~~~~~~~~~~~
+
+    Compare decoding and validating large responses in the calling thread and in a process pool with
+    :py:mod:`eater.api.offload` - both the elapsed time and the CPU time of the calling thread, which is the time the
+    GIL is held - and the throughput of several threads doing so at once.
+
+    Run with ``python -m benchmarks.offload``.
+"""
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.payloads import BookListResponse, payload
+from eater.api.codecs import get_codec
+from eater.api.offload import ProcessOffload
+from eater.api.validation import FullValidation
+
+
+def in_thread(codec, content: bytes):
+    return FullValidation().build(BookListResponse, codec.loads(content))
+
+
+def measure(func, repeat: int) -> tuple:
+    elapsed, cpu = [], []
+    for _ in range(repeat):
+        start, start_cpu = time.perf_counter(), time.thread_time()
+        func()
+        elapsed.append(time.perf_counter() - start)
+        cpu.append(time.thread_time() - start_cpu)
+    return min(elapsed), min(cpu)
+
+
+def main(sizes=(1000, 10000), threads=4, repeat=3):
+    warnings.simplefilter('ignore')
+    codec = get_codec()
+    offload = ProcessOffload(threshold=0, max_workers=threads)
+
+    # Start the workers
+    offload.build(BookListResponse, codec.dumps(payload(1)), codec, FullValidation())
+
+    print('%8s %10s %14s %14s %14s %14s' % ('items', 'size', 'thread', 'thread cpu', 'offload', 'offload cpu'))
+    for size in sizes:
+        content = codec.dumps(payload(size))
+        local = measure(lambda: in_thread(codec, content), repeat)
+        remote = measure(lambda: offload.build(BookListResponse, content, codec, FullValidation()), repeat)
+        print('%8d %8.1fMB %12.2fms %12.2fms %12.2fms %12.2fms' % (
+            size, len(content) / 1024 / 1024, local[0] * 1000, local[1] * 1000, remote[0] * 1000, remote[1] * 1000
+        ))
+
+    print()
+    print('%8s %14s %14s   %d threads' % ('items', 'thread', 'offload', threads))
+    for size in sizes:
+        content = codec.dumps(payload(size))
+        with ThreadPoolExecutor(threads) as executor:
+            start = time.perf_counter()
+            list(executor.map(lambda _: in_thread(codec, content), range(threads)))
+            local = time.perf_counter() - start
+
+            start = time.perf_counter()
+            list(executor.map(
+                lambda _: offload.build(BookListResponse, content, codec, FullValidation()), range(threads)
+            ))
+            remote = time.perf_counter() - start
+        print('%8d %12.2fms %12.2fms' % (size, local * 1000, remote * 1000))
+
+    offload.shutdown()
+
+if __name__ == '__main__':
+    main()
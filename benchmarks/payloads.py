@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.payloads
+    ~~~~~~~~~~~~~~~~~~~
+
+    Models and payloads shared by the benchmarks.
+"""
+from schematics import Model
+from schematics.types import BooleanType, FloatType, IntType, ListType, ModelType, StringType
+
+#: The number of books in each payload size.
+SIZES = {
+    'small': 10,
+    'medium': 1000,
+    'huge': 10000,
+}
+
+
+class Author(Model):
+    name = StringType(required=True, min_length=2)
+    age = IntType(min_value=0)
+
+
+class Book(Model):
+    id = IntType(required=True)  # pylint: disable=invalid-name
+    title = StringType(required=True, min_length=3)
+    price = FloatType()
+    in_print = BooleanType()
+    tags = ListType(StringType())
+    authors = ListType(ModelType(Author))
+
+
+class BookListResponse(Model):
+    count = IntType()
+    books = ListType(ModelType(Book))
+
+
+class BookListRequest(Model):
+    ids = ListType(IntType(), required=True)
+
+
+def payload(count: int) -> dict:
+    return {
+        'count': count,
+        'books': [
+            {
+                'id': pk,
+                'title': 'Book %s' % pk,
+                'price': pk + 0.99,
+                'in_print': bool(pk % 2),
+                'tags': ['fiction', 'classic'],
+                'authors': [{'name': 'Author %s' % pk, 'age': 40}, {'name': 'Editor'}],
+            }
+            for pk in range(count)
+        ]
+    }
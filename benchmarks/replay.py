@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.replay
+    ~~~~~~~~~~~~~~~~~
+
+    Record responses from the local stub server with :py:mod:`eater.api.replay`, then replay them - without a network
+    the calls per second are bound only by eater's own CPU cost.
+
+    Run with ``python -m benchmarks.replay``, profile eater with ``python -m cProfile -s cumtime -m benchmarks.replay``.
+"""
+import argparse
+import os
+import tempfile
+import time
+import warnings
+
+from benchmarks.payloads import SIZES, BookListRequest, BookListResponse
+from benchmarks.server import StubServer
+from eater import HTTPEater
+from eater.api.replay import ReplayRegistry
+
+
+def create_api(base_url: str, size: str, registry: ReplayRegistry) -> type:
+    class PostBooksAPI(HTTPEater):
+        url = base_url + '/books/%s/' % size
+        method = 'post'
+        request_cls = BookListRequest
+        response_cls = BookListResponse
+        session_registry = registry
+
+    return PostBooksAPI
+
+
+def main(argv: list=None):
+    parser = argparse.ArgumentParser(description='Benchmark HTTPEater replaying recorded responses.')
+    parser.add_argument('--calls', type=int, default=100000, help='The number of calls to replay.')
+    parser.add_argument('--size', choices=list(SIZES), default='small', help='Payload size.')
+    parser.add_argument('--requests', type=int, default=100, help='The number of distinct requests recorded.')
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter('ignore')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'books.replay')
+
+        with StubServer() as server:
+            recorder = ReplayRegistry(path, mode='record')
+            api_cls = create_api(server.url, args.size, recorder)
+            start = time.perf_counter()
+            for index in range(args.requests):
+                api_cls(ids=[index])()
+            recorded = time.perf_counter() - start
+            recorder.close()
+            recorder.store.close()
+
+        player = ReplayRegistry(path)
+        api_cls = create_api(server.url, args.size, player)
+        start = time.perf_counter()
+        for index in range(args.calls):
+            api_cls(ids=[index % args.requests])()
+        replayed = time.perf_counter() - start
+        player.store.close()
+
+    print('%10s %12s %14s' % ('mode', 'calls', 'calls/s'))
+    print('%10s %12d %14.0f' % ('record', args.requests, args.requests / recorded))
+    print('%10s %12d %14.0f' % ('replay', args.calls, args.calls / replayed))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.server
+    ~~~~~~~~~~~~~~~~~
+
+    A local, in-process HTTP server serving pre-encoded JSON payloads.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.payloads import SIZES, payload
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Serve ``/books/<size>/`` for ``GET`` and ``POST``, keeping connections alive.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.respond()
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        # Consume the request body so the connection can be reused
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.respond()
+
+    def respond(self):
+        body = self.server.bodies.get(self.path.strip('/').split('/')[-1])
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class StubServer:
+    """
+    Run a :py:class:`StubHandler` server on a random local port in a background thread.
+
+    .. code-block:: python
+
+        with StubServer() as server:
+            url = server.url + '/books/small/'
+    """
+
+    def __init__(self):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.bodies = {name: json.dumps(payload(size)).encode() for name, size in SIZES.items()}
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return 'http://%s:%s' % (host, port)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.suite
+    ~~~~~~~~~~~~~~~~
+
+    Measure calls per second and latency of :py:class:`eater.HTTPEater` against a local stub server.
+
+    Run with ``python -m benchmarks.suite``, supply ``--output results.json`` to save machine readable results that
+    can be compared with ``python -m benchmarks.compare``.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import warnings
+from datetime import datetime, timezone
+from typing import Callable, Iterator
+
+import eater
+from benchmarks.payloads import SIZES, BookListRequest, BookListResponse
+from benchmarks.server import StubServer
+from eater import HTTPEater
+from eater.api.codecs import get_codec, get_media_codec
+from eater.api.memo import ModelMemo
+from eater.api.transport import Urllib3Transport
+
+
+def create_apis(base_url: str, size: str) -> tuple:
+    """
+    Create GET and POST API classes for the payload ``size``.
+    """
+    class GetBooksAPI(HTTPEater):
+        url = base_url + '/books/%s/' % size
+        response_cls = BookListResponse
+
+    class PostBooksAPI(GetBooksAPI):
+        method = 'post'
+        request_cls = BookListRequest
+
+    class GetBooksNewSessionAPI(GetBooksAPI):
+        pool_sessions = False
+
+    return GetBooksAPI, PostBooksAPI, GetBooksNewSessionAPI
+
+
+def scenarios(base_url: str, sizes: tuple) -> Iterator[tuple]:
+    """
+    Generate ``(name, call)`` tuples, where ``call`` performs a single operation.
+    """
+    ids = list(range(100))
+
+    for size in sizes:
+        get_api, post_api, new_session_api = create_apis(base_url, size)
+
+        yield 'get-%s' % size, lambda get_api=get_api: get_api()()
+        yield 'post-%s' % size, lambda post_api=post_api: post_api(ids=ids)()
+
+        def new_session(new_session_api=new_session_api):
+            api = new_session_api()
+            try:
+                api()
+            finally:
+                api.session.close()
+        yield 'get-%s-new-session' % size, new_session
+
+        # The same calls sent through urllib3 directly, without requests' per call overhead
+        transport = Urllib3Transport()
+        for name, api_cls, kwargs in (('get', get_api, {}), ('post', post_api, {'ids': ids})):
+            lean_api = type(api_cls)(api_cls.__name__, (api_cls,), {'transport': transport})
+            yield '%s-%s-urllib3' % (name, size), lambda api=lean_api, kwargs=kwargs: api(**kwargs)()
+
+        # The cost of decoding and validating alone, without the network
+        response = get_api().session.get(get_api.url)
+        body = response.content
+        raw_data = json.loads(body)
+        api = get_api()
+        yield 'decode-%s' % size, lambda api=api, body=body: api.json_codec.loads(body)
+        yield 'decode-%s-stdlib' % size, lambda body=body: json.loads(body)
+        try:
+            orjson = get_codec('orjson')
+        except ImportError:
+            pass
+        else:
+            yield 'decode-%s-orjson' % size, lambda orjson=orjson, body=body: orjson.loads(body)
+        try:
+            msgpack = get_media_codec('application/msgpack')
+        except NotImplementedError:
+            pass
+        else:
+            packed = msgpack.dumps(raw_data)
+            yield 'decode-%s-msgpack' % size, lambda packed=packed: msgpack.loads(packed)
+        yield 'validate-%s' % size, lambda api=api, raw_data=raw_data: api.build_model(BookListResponse, raw_data)
+        yield 'validate-%s-compiled' % size, lambda api=api, raw_data=raw_data: api.validation.build(
+            BookListResponse, raw_data, compiled=True
+        )
+
+        # Building the response model from a byte-identical body, memoized
+        for name, memo in (('memo', ModelMemo()), ('memo-copy', ModelMemo(copy=True))):
+            memo_api = type(get_api)(get_api.__name__, (get_api,), {'memo': memo})()
+            yield '%s-%s' % (name, size), lambda api=memo_api, response=response: api.create_response_model(
+                response, None
+            )
+
+
+def measure(call: Callable, duration: float, min_iterations: int=5, warmup: int=2) -> dict:
+    """
+    Call ``call`` repeatedly for at least ``duration`` seconds and ``min_iterations`` times.
+
+    :return: A dict of statistics, latencies are in milliseconds.
+    :rtype: dict
+    """
+    for _ in range(warmup):
+        call()
+
+    latencies = []
+    start = time.perf_counter()
+    while len(latencies) < min_iterations or time.perf_counter() - start < duration:
+        before = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - before)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'iterations': len(latencies),
+        'calls_per_sec': len(latencies) / elapsed,
+        'mean_ms': sum(latencies) / len(latencies) * 1000,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'min_ms': latencies[0] * 1000,
+    }
+
+
+def percentile(ordered: list, percent: float) -> float:
+    """
+    Calculate the nearest rank ``percent`` percentile of the sorted list ``ordered``.
+    """
+    rank = max(int(round(percent / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def get_metadata() -> dict:
+    """
+    Describe the environment the benchmarks were run in.
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True
+        ).stdout.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'eater': eater.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def main(argv: list=None):
+    parser = argparse.ArgumentParser(description='Benchmark HTTPEater against a local stub server.')
+    parser.add_argument('--output', help='Write the results as JSON to this file.')
+    parser.add_argument('--duration', type=float, default=1.0, help='Seconds to run each scenario for.')
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES), help='Payload sizes.')
+    parser.add_argument('--filter', default='', help='Only run scenarios containing this string.')
+    args = parser.parse_args(argv)
+
+    warnings.simplefilter('ignore')
+    results = []
+
+    print('%-28s %10s %12s %10s %10s' % ('scenario', 'iterations', 'calls/sec', 'p50 ms', 'p99 ms'))
+    with StubServer() as server:
+        for name, call in scenarios(server.url, tuple(args.sizes)):
+            if args.filter not in name:
+                continue
+            stats = measure(call, args.duration)
+            results.append(dict(name=name, **stats))
+            print('%-28s %10d %12.1f %10.2f %10.2f' % (
+                name, stats['iterations'], stats['calls_per_sec'], stats['p50_ms'], stats['p99_ms']
+            ))
+            sys.stdout.flush()
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'metadata': get_metadata(), 'results': results}, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+    benchmarks.validation
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Compare validating large nested payloads with schematics and with :py:mod:`eater.api.compiled`, and the cost of
+    each :py:mod:`eater.api.validation` policy.
+
+    Run with ``python -m benchmarks.validation``.
+"""
+import timeit
+import warnings
+
+from benchmarks.payloads import BookListResponse, payload
+from eater.api.compiled import compile_model
+from eater.api.validation import FullValidation, LazyValidation, SampledValidation, TypesOnlyValidation
+
+
+def main(sizes=(10, 1000, 10000), repeat=3):
+    warnings.simplefilter('ignore')
+    compiled = compile_model(BookListResponse)
+
+    print('%8s %14s %14s %8s' % ('items', 'schematics', 'compiled', 'speedup'))
+    for size in sizes:
+        raw_data = payload(size)
+        number = max(1, 1000 // size)
+        reference = min(timeit.repeat(
+            lambda: BookListResponse(raw_data=raw_data, validate=True, partial=False), number=number, repeat=repeat
+        )) / number
+        fast = min(timeit.repeat(lambda: compiled(raw_data), number=number, repeat=repeat)) / number
+        print('%8d %12.2fms %12.2fms %7.1fx' % (size, reference * 1000, fast * 1000, reference / fast))
+
+    policies = (
+        ('full', FullValidation()),
+        ('types-only', TypesOnlyValidation()),
+        ('sampled', SampledValidation(rate=10, items=5)),
+        ('lazy', LazyValidation()),
+    )
+
+    for compiled_validation in (False, True):
+        print()
+        print('%8s' % 'items' + ''.join('%14s' % name for name, _ in policies) + '   compiled=%s' % compiled_validation)
+        for size in sizes:
+            raw_data = payload(size)
+            number = max(1, 1000 // size)
+            timings = [
+                min(timeit.repeat(
+                    lambda: policy.build(BookListResponse, raw_data, compiled_validation), number=number, repeat=repeat
+                )) / number
+                for _, policy in policies
+            ]
+            print('%8d' % size + ''.join('%12.2fms' % (timing * 1000) for timing in timings))
+
+if __name__ == '__main__':
+    main()
@@ -20,5 +20,13 @@ __docformat__ = 'restructuredtext'
 # -eof meta-
 
 from eater.api.base import BaseEater  # pylint: disable=wrong-import-position
+from eater.api.batch import BatchResult  # pylint: disable=wrong-import-position
 from eater.api.http import HTTPEater  # pylint: disable=wrong-import-position
+from eater.api.pagination import PaginatedHTTPEater  # pylint: disable=wrong-import-position
 from eater.errors import *  # pylint: disable=wrong-import-position,wildcard-import
+from eater.api.session import SessionRegistry, registry as session_registry  # pylint: disable=wrong-import-position
+
+try:
+    from eater.api.aio import AsyncHTTPEater, gather  # pylint: disable=wrong-import-position
+except ImportError:  # pragma: no cover - aiohttp is an optional dependency
+    pass
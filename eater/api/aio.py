@@ -0,0 +1,543 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.aio
+    ~~~~~~~~~~~~~
+
+    Eater asyncio HTTP API classes, requires aiohttp_.
+
+    .. _aiohttp: https://github.com/aio-libs/aiohttp
+"""
+import asyncio
+import contextvars
+import os
+import ssl
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import partial
+from typing import Awaitable, Callable, Hashable, Iterable
+
+import aiohttp
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import select_proxy
+from schematics import Model
+
+from eater.api.batch import BATCH_ERRORS, BatchResult, create_api
+from eater.api.http import HTTPEater
+from eater.api.session import SessionRegistry
+from eater.api.streaming import JSONArrayParser, get_stream_field, iter_ndjson, validate_items
+from eater.api.timing import NULL_PHASE, get_listeners, phase, record_response, time_call
+from eater.errors import EaterTimeoutError, EaterConnectError
+
+
+class AsyncSessionRegistry(SessionRegistry):
+    """
+    A registry of ``aiohttp.ClientSession`` instances.
+
+    As aiohttp sessions are bound to an event loop the running loop forms part of the key, sessions belonging to loops
+    that have since been closed are forgotten.
+    """
+
+    def get_session(self, url: str, auth: tuple=None, headers: dict=None, pool_connections: int=10,
+                    pool_maxsize: int=10) -> aiohttp.ClientSession:
+        """
+        Retrieve the pooled session for ``url`` on the running event loop, creating it if necessary.
+
+        Must be called from within a coroutine.
+        """
+        with self._lock:
+            for key in [key for key in self._sessions if key[-1].is_closed()]:
+                del self._sessions[key]
+        return super().get_session(url, auth=auth, headers=headers, pool_connections=pool_connections,
+                                   pool_maxsize=pool_maxsize)
+
+    def get_key(self, url: str, auth: tuple=None, headers: dict=None, pool_connections: int=10,
+                pool_maxsize: int=10) -> Hashable:
+        key = super().get_key(url, auth=auth, headers=headers, pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize)
+        return None if key is None else key + (asyncio.get_running_loop(),)
+
+    def create_session(self, auth: tuple=None, headers: dict=None, pool_connections: int=10,
+                       pool_maxsize: int=10) -> aiohttp.ClientSession:
+        """
+        Create a new ``aiohttp.ClientSession`` with a pooled connector.
+
+        ``pool_maxsize`` limits the connections per host and ``pool_connections * pool_maxsize`` the total number of
+        connections.
+        """
+        connector = aiohttp.TCPConnector(limit=pool_connections * pool_maxsize, limit_per_host=pool_maxsize)
+        return aiohttp.ClientSession(
+            connector=connector,
+            auth=to_basic_auth(auth),
+            headers=headers,
+        )
+
+    async def close(self, url: str=None):  # pylint: disable=invalid-overridden-method
+        """
+        Close and forget pooled sessions.
+
+        :param url: If supplied only sessions for the scheme and host of ``url`` are closed, otherwise all sessions are
+                    closed.
+        :type url: str|None
+        """
+        for session in self.pop(url):
+            if not session.closed:
+                await session.close()
+
+
+#: The process wide session registry used by :py:class:`eater.AsyncHTTPEater`.
+async_registry = AsyncSessionRegistry()  # pylint: disable=invalid-name
+
+
+class AsyncHTTPEater(HTTPEater):
+    """
+    Eat JSON HTTP APIs for breakfast, without blocking the event loop.
+
+    Identical to :py:class:`.HTTPEater` except that calling an instance returns a coroutine;
+
+    .. code-block:: python
+
+        response = await api()
+
+    The same hooks (``url``, ``request_cls``, ``response_cls``, :py:meth:`.HTTPEater.get_request_kwargs` and
+    :py:meth:`.HTTPEater.create_response_model`) and options (``validation``, ``cache`` etc..) are used.
+    ``get_request_kwargs`` should return kwargs in the form expected by requests, they are translated for aiohttp by
+    :py:meth:`.AsyncHTTPEater.get_aiohttp_kwargs`.
+    """
+
+    #: The registry that pooled sessions are retrieved from.
+    session_registry = async_registry
+
+    @classmethod
+    def map(cls, items: Iterable, concurrency: int=10, ordered: bool=True, _requests: dict=None,
+            request_kwargs: dict=None):
+        """
+        Call the API once for every item in ``items``, with at most ``concurrency`` requests in flight.
+
+        Identical to :py:meth:`.HTTPEater.map` except that it returns an asynchronous generator;
+
+        .. code-block:: python
+
+            async for result in GetBookAPI.map({'id': id} for id in ids):
+                ...
+        """
+        return aimap(cls, items, concurrency=concurrency, ordered=ordered, _requests=_requests,
+                     request_kwargs=request_kwargs)
+
+    def call(self, request_model: Model=None, *, _request_kwargs: dict=None, **kwargs):
+        """
+        Make a call with its own request model, without modifying the eater.
+
+        Identical to :py:meth:`.HTTPEater.call` except that it returns an awaitable;
+
+        .. code-block:: python
+
+            api = GetBookAPI()
+            books = await asyncio.gather(*(api.call(id=id) for id in ids))
+        """
+        return super().call(request_model, _request_kwargs=_request_kwargs, **kwargs)
+
+    def create_session(self, session: aiohttp.ClientSession=None, auth: tuple=None, headers: dict=None):
+        """
+        Store the session options, the ``aiohttp.ClientSession`` itself is bound to an event loop so it is created
+        lazily by :py:meth:`.AsyncHTTPEater.get_session`.
+
+        :param session: An existing ``aiohttp.ClientSession`` to use rather than creating one.
+        :type session: aiohttp.ClientSession|None
+        :param auth: A ``(username, password)`` tuple or ``aiohttp.BasicAuth``.
+        :type auth: tuple|None
+        :param headers: A dict of headers to be sent with every request.
+        :type headers: dict|None
+        :return: ``session``
+        :rtype: aiohttp.ClientSession|None
+        """
+        self.session_options = {'auth': auth, 'headers': headers}
+        return session
+
+    def get_session_options(self) -> tuple:
+        """
+        Retrieve the auth and headers the request is made with, from the session if one was supplied, otherwise from
+        the options the pooled session is created with.
+        """
+        if self.session is not None:
+            return self.session.auth, self.session.headers
+        return self.session_options['auth'], self.session_options['headers']
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Retrieve the ``aiohttp.ClientSession`` to make the request with, must be called from within a coroutine.
+
+        :return: An instance of ``aiohttp.ClientSession``
+        :rtype: aiohttp.ClientSession
+        """
+        if self.session is not None:
+            return self.session
+
+        if self.pool_sessions:
+            return self.session_registry.get_session(
+                self.url,
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                **self.session_options
+            )
+
+        return self.session_registry.create_session(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            **self.session_options
+        )
+
+    async def request(self, **kwargs) -> Model:  # pylint: disable=invalid-overridden-method
+        """
+        Make a HTTP request of of type method.
+
+        You should generally leave this method alone. If you need to customise the behaviour use the methods that
+        this method uses.
+        """
+        listeners = get_listeners(type(self))
+        with time_call(listeners, self) if listeners else NULL_PHASE:
+            if self.batch_loader is not None:
+                return await self.load_batched(**kwargs)
+
+            with phase('prepare'):
+                kwargs = self.prepare_request_kwargs(**kwargs)
+
+            if self.single_flight is not None and self.method.lower() in self.single_flight.methods:
+                key = self.get_request_key(kwargs)
+                if key is not None:
+                    return await self.single_flight.ado(key, partial(self.fetch, kwargs))
+
+            return await self.fetch(kwargs)
+
+    async def load_batched(self, **kwargs) -> Model:  # pylint: disable=invalid-overridden-method
+        """
+        Retrieve the response model through ``batch_loader``, whose ``batch_cls`` must be an ``AsyncHTTPEater``.
+        """
+        if kwargs:
+            raise TypeError("Calls batched by batch_loader can't supply request kwargs.")
+        return self.get_batched_model(await self.batch_loader.aload(self.request_model))
+
+    async def fetch(self, kwargs: dict) -> Model:  # pylint: disable=invalid-overridden-method
+        """
+        Retrieve the response model, either from the cache or by making the HTTP request.
+        """
+        cache_key, cache_entry = self.get_cache_entry(kwargs)
+        if cache_entry is not None and cache_entry.fresh:
+            return cache_entry.model
+
+        response = await self.dispatch(kwargs)
+
+        if self.offload is not None:
+            # Waiting on the process pool would block the event loop, so wait in a thread with the timing context
+            return await asyncio.get_running_loop().run_in_executor(None, partial(
+                contextvars.copy_context().run, self.process_response, response, cache_key, cache_entry
+            ))
+
+        return self.process_response(response, cache_key, cache_entry)
+
+    async def dispatch(self, kwargs: dict) -> requests.Response:  # pylint: disable=invalid-overridden-method
+        """
+        Make the HTTP request with :py:meth:`.AsyncHTTPEater.send`, through ``hedge``, ``rate_limit``,
+        ``circuit_breaker`` and ``retry``.
+        """
+        send = partial(self.send, kwargs)
+        if self.hedge is not None and self.method.lower() in self.hedge.methods:
+            send = partial(self.hedge.acall, self.guard(send, rate_limit=False), self.guard(send))
+            send = self.guard(send, circuit_breaker=False)
+        else:
+            send = self.guard(send)
+        if self.retry is not None and self.method.lower() in self.retry.methods:
+            send = partial(self.retry.acall, send)
+        return await send()
+
+    def guard(self, send: Callable[[], Awaitable[requests.Response]], rate_limit: bool=True,
+              circuit_breaker: bool=True) -> Callable[[], Awaitable[requests.Response]]:
+        """
+        Identical to :py:meth:`eater.HTTPEater.guard` except that ``send`` returns an awaitable.
+        """
+        if rate_limit and self.rate_limit is not None:
+            send = partial(self.rate_limit.acall, self.rate_limit.get_key(type(self), self.url), send)
+        if circuit_breaker and self.circuit_breaker is not None:
+            send = partial(self.circuit_breaker.acall, self.circuit_breaker.get_key(type(self), self.url), send)
+        return send
+
+    async def send(self, kwargs: dict) -> requests.Response:  # pylint: disable=invalid-overridden-method
+        """
+        Make the HTTP request, reading the whole body.
+
+        :return: The response, converted by :py:func:`to_requests_response`.
+        :rtype: requests.Response
+        """
+        session = self.get_session()
+
+        try:
+            with self.translate_errors():
+                start = time.perf_counter()
+                async with session.request(self.method.upper(), self.url, **self.get_aiohttp_kwargs(**kwargs)) as response:
+                    elapsed = time.perf_counter() - start
+                    body = await response.read()
+                    result = to_requests_response(response, body)
+                    result.elapsed = timedelta(seconds=elapsed)
+                    record_response(result, time.perf_counter() - start)
+                    return result
+
+        finally:
+            if not self.pool_sessions and session is not self.session:
+                await session.close()
+
+    async def stream(self, **kwargs):  # pylint: disable=invalid-overridden-method
+        """
+        Make a HTTP request of type method, yielding the items of the response as they are received.
+
+        Identical to :py:meth:`.HTTPEater.stream` except that it returns an asynchronous generator, and the request is
+        made directly with aiohttp so ``hedge``, ``rate_limit``, ``circuit_breaker``, ``retry`` and timing listeners
+        don't apply.
+        """
+        field, model_cls = get_stream_field(self.response_cls, self.stream_field)
+        build = partial(self.build_model, model_cls)
+        kwargs = self.prepare_request_kwargs(**kwargs)
+        session = self.get_session()
+
+        try:
+            with self.translate_errors():
+                async with session.request(self.method.upper(), self.url, **self.get_aiohttp_kwargs(**kwargs)) as response:
+                    self.check_response_status(to_requests_response(response, b''))
+
+                    if response.content_type == 'application/x-ndjson':
+                        index = 0
+                        async for line in response.content:
+                            for model in validate_items(iter_ndjson([line], self.json_codec.loads), build, start=index):
+                                index += 1
+                                yield model
+
+                    elif response.content_type == 'application/json':
+                        parser = JSONArrayParser(field, self.json_codec.loads)
+                        index = 0
+                        async for chunk in response.content.iter_chunked(self.stream_chunk_size):
+                            for model in validate_items(parser.feed(chunk), build, field, start=index):
+                                index += 1
+                                yield model
+                            if parser.done:
+                                break
+
+                    else:
+                        raise NotImplementedError("Content type '%s' can't be streamed." % response.content_type)
+
+        finally:
+            if not self.pool_sessions and session is not self.session:
+                await session.close()
+
+    @contextmanager
+    def translate_errors(self):
+        """
+        Translate exceptions raised by aiohttp into :py:class:`eater.errors.EaterError`.
+        """
+        try:
+            yield
+
+        except asyncio.TimeoutError:
+            raise EaterTimeoutError("%s.%s for URL '%s' timed out." % (
+                type(self).__name__,
+                self.method,
+                self.url
+            ))
+
+        except aiohttp.ClientError as exc_info:
+            raise EaterConnectError("Exception raised for URL '%s'." % self.url) from exc_info
+
+    def get_aiohttp_kwargs(self, timeout=None, auth=None, verify=None, cert=None, proxies=None, files=None,
+                           **kwargs) -> dict:
+        """
+        Translate kwargs in the form expected by requests into the form expected by aiohttp.
+
+        :param timeout: A timeout in seconds or a ``(connect, read)`` tuple, as supported by requests.
+        :type timeout: float|tuple|aiohttp.ClientTimeout|None
+        :param auth: A ``(username, password)`` tuple or ``aiohttp.BasicAuth``.
+        :type auth: tuple|None
+        :param verify: Whether to verify the server's certificate, or the path of a CA bundle (or directory) to verify
+                       it with.
+        :type verify: bool|str|None
+        :param cert: The path of a client certificate, or a ``(certificate, key)`` tuple of paths.
+        :type cert: str|tuple|None
+        :param proxies: A dict of proxy URLs keyed by scheme (or scheme and host), as supported by requests.
+        :type proxies: dict|None
+        :param files: A dict of files to upload as ``multipart/form-data``, along with the fields of ``data``.
+        :type files: dict|None
+        :return: A dict of kwargs to be supplied to ``aiohttp.ClientSession.request``.
+        :rtype: dict
+        :raises TypeError: If a kwarg only requests supports is supplied.
+        """
+        if 'hooks' in kwargs:
+            raise TypeError("%s doesn't support requests' hooks, aiohttp has no equivalent." % type(self).__name__)
+
+        if isinstance(timeout, tuple):
+            kwargs['timeout'] = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        elif isinstance(timeout, (int, float)):
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        elif timeout is not None:
+            kwargs['timeout'] = timeout
+
+        if auth is not None:
+            kwargs['auth'] = to_basic_auth(auth)
+
+        if verify is False:
+            kwargs['ssl'] = False
+        elif isinstance(verify, str) or cert is not None:
+            kwargs['ssl'] = create_ssl_context(verify, cert)
+
+        if proxies:
+            proxy = select_proxy(self.url, proxies)
+            if proxy is not None:
+                kwargs['proxy'] = proxy
+
+        if files:
+            kwargs['data'] = to_form_data(kwargs.get('data'), files)
+
+        return kwargs
+
+
+def create_ssl_context(verify, cert) -> ssl.SSLContext:
+    """
+    Create an SSL context from requests style ``verify`` and ``cert`` kwargs.
+    """
+    if isinstance(verify, str):
+        context = ssl.create_default_context(**{'capath' if os.path.isdir(verify) else 'cafile': verify})
+    else:
+        context = ssl.create_default_context()
+        if verify is False:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+    if isinstance(cert, tuple):
+        context.load_cert_chain(*cert)
+    elif cert is not None:
+        context.load_cert_chain(cert)
+    return context
+
+
+def to_form_data(data, files: dict) -> aiohttp.FormData:
+    """
+    Convert requests style ``data`` and ``files`` kwargs into ``aiohttp.FormData``.
+
+    Files are either a file object or content, or a ``(filename, file[, content_type])`` tuple.
+    """
+    form = aiohttp.FormData()
+    for name, value in (data or {}).items():
+        form.add_field(name, value)
+    for name, value in files.items():
+        if isinstance(value, tuple):
+            filename, content = value[:2]
+            form.add_field(name, content, filename=filename, content_type=value[2] if len(value) > 2 else None)
+        else:
+            form.add_field(name, value, filename=os.path.basename(getattr(value, 'name', name)))
+    return form
+
+
+async def aimap(api_cls: type, items: Iterable, concurrency: int=10, ordered: bool=True, _requests: dict=None,
+                request_kwargs: dict=None):
+    """
+    Call ``api_cls``, a subclass of :py:class:`eater.AsyncHTTPEater`, for every item in ``items`` concurrently, see
+    :py:meth:`.AsyncHTTPEater.map`.
+    """
+    async def acall(index, item):
+        request = item
+        try:
+            api = create_api(api_cls, item, _requests)
+            request = api.request_model
+            return BatchResult(index, request, await api(**(request_kwargs or {})), None)
+        except BATCH_ERRORS as exc_info:
+            return BatchResult(index, request, None, exc_info)
+
+    items = enumerate(items)
+
+    def submit():
+        for index, item in items:
+            return asyncio.ensure_future(acall(index, item))
+        return None
+
+    pending = deque()
+    try:
+        for _ in range(concurrency):
+            task = submit()
+            if task is None:
+                break
+            pending.append(task)
+
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+                await done[0]
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.remove(task)
+
+            for _ in done:
+                task = submit()
+                if task is not None:
+                    pending.append(task)
+
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def gather(api_cls: type, items: Iterable, concurrency: int=10, _requests: dict=None,
+                 request_kwargs: dict=None) -> list:
+    """
+    Call ``api_cls``, a subclass of :py:class:`eater.AsyncHTTPEater`, for every item in ``items`` concurrently and
+    return a list of :py:data:`eater.api.batch.BatchResult` in the same order as ``items``.
+
+    :param api_cls: A subclass of :py:class:`eater.AsyncHTTPEater`.
+    :type api_cls: type
+    :param items: An iterable of ``request_cls`` instances or dicts of kwargs used to create them.
+    :type items: Iterable
+    :param concurrency: The maximum number of requests in flight at any one time.
+    :type concurrency: int
+    :param _requests: A dict of kwargs to be supplied when creating a session.
+    :type _requests: dict|None
+    :param request_kwargs: A dict of kwargs supplied when calling each instance of ``api_cls``.
+    :type request_kwargs: dict|None
+    :return: A list of :py:data:`eater.api.batch.BatchResult`.
+    :rtype: list
+    """
+    return [
+        result async for result in aimap(api_cls, items, concurrency=concurrency, ordered=True, _requests=_requests,
+                                         request_kwargs=request_kwargs)
+    ]
+
+
+def to_basic_auth(auth):
+    """
+    Convert a requests style ``(username, password)`` tuple into ``aiohttp.BasicAuth``.
+    """
+    if isinstance(auth, tuple) and not isinstance(auth, aiohttp.BasicAuth):
+        return aiohttp.BasicAuth(*auth)
+    return auth
+
+
+def to_requests_response(response: aiohttp.ClientResponse, body: bytes) -> requests.Response:
+    """
+    Build a ``requests.Response`` from an aiohttp response and its body.
+
+    This allows :py:meth:`.HTTPEater.create_response_model` to be shared between synchronous and asynchronous eaters.
+
+    :param response: The aiohttp response.
+    :type response: aiohttp.ClientResponse
+    :param body: The body of the response, as already read from ``response``.
+    :type body: bytes
+    :return: An equivalent ``requests.Response``.
+    :rtype: requests.Response
+    """
+    result = requests.Response()
+    result.status_code = response.status
+    result.reason = response.reason
+    result.headers = CaseInsensitiveDict(response.headers)
+    result.url = str(response.url)
+    result.encoding = response.charset
+    result._content = body  # pylint: disable=protected-access
+    result._content_consumed = True  # pylint: disable=protected-access
+    return result
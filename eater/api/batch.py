@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.batch
+    ~~~~~~~~~~~~~~~
+
+    Call an API many times with bounded concurrency.
+"""
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterable, Iterator, Union
+
+from schematics import Model
+from schematics.exceptions import DataError
+
+from eater.errors import EaterError
+
+#: The outcome of a single call made as part of a batch. ``index`` is the position of the item in the supplied
+#: iterable, ``request`` is the request model (or the item itself if a request model could not be created) and one of
+#: ``response`` or ``error`` is set.
+BatchResult = namedtuple('BatchResult', ('index', 'request', 'response', 'error'))
+
+#: The exceptions that are captured in a :py:data:`BatchResult` rather than aborting the batch.
+BATCH_ERRORS = (DataError, EaterError)
+
+
+def create_api(api_cls: type, item: Union[Model, dict, None], _requests: dict=None):
+    """
+    Create an instance of ``api_cls`` for an item in a batch.
+
+    :param api_cls: A subclass of :py:class:`eater.HTTPEater`.
+    :type api_cls: type
+    :param item: An instance of ``request_cls``, a dict of kwargs used to create one or None.
+    :type item: Model|dict|None
+    :param _requests: A dict of kwargs to be supplied when creating a requests session.
+    :type _requests: dict|None
+    :return: An instance of ``api_cls``.
+    """
+    if isinstance(item, dict):
+        return api_cls(_requests=_requests or {}, **item)
+    return api_cls(item, _requests=_requests or {})
+
+
+def call(api_cls: type, index: int, item: Union[Model, dict, None], _requests: dict=None,
+         request_kwargs: dict=None) -> BatchResult:
+    """
+    Call ``api_cls`` for a single item, capturing :py:data:`BATCH_ERRORS`.
+    """
+    request = item
+    try:
+        api = create_api(api_cls, item, _requests)
+        request = api.request_model
+        return BatchResult(index, request, api(**(request_kwargs or {})), None)
+    except BATCH_ERRORS as exc_info:
+        return BatchResult(index, request, None, exc_info)
+
+
+def imap(api_cls: type, items: Iterable, concurrency: int=10, ordered: bool=True, _requests: dict=None,
+         request_kwargs: dict=None) -> Iterator[BatchResult]:
+    """
+    Call ``api_cls`` for every item in ``items`` using a pool of threads, see :py:meth:`.HTTPEater.map`.
+    """
+    items = enumerate(items)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        def submit():
+            for index, item in items:
+                return executor.submit(call, api_cls, index, item, _requests, request_kwargs)
+            return None
+
+        pending = deque()
+        try:
+            for _ in range(concurrency):
+                future = submit()
+                if future is None:
+                    break
+                pending.append(future)
+
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                    wait(done)
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+
+                for _ in done:
+                    future = submit()
+                    if future is not None:
+                        pending.append(future)
+
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
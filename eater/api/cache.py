@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.cache
+    ~~~~~~~~~~~~~~~
+
+    An in-memory LRU cache of validated response models.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Iterable, Mapping, Union
+
+import requests
+from schematics import Model
+
+__all__ = ['CacheEntry', 'ResponseCache', 'parse_cache_control']
+
+
+class CacheEntry:
+    """
+    A validated response model and the validators used to revalidate it.
+    """
+
+    __slots__ = ('model', 'expires', 'etag', 'last_modified')
+
+    def __init__(self, model: Model, expires: float, etag: str=None, last_modified: str=None):
+        self.model = model
+        #: The ``time.monotonic()`` after which the entry must be revalidated, ``None`` if it never expires.
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def fresh(self) -> bool:
+        """
+        ``True`` if the entry can be used without revalidating it.
+        """
+        return self.expires is None or time.monotonic() < self.expires
+
+    @property
+    def revalidatable(self) -> bool:
+        """
+        ``True`` if the entry can be revalidated with a conditional request.
+        """
+        return self.etag is not None or self.last_modified is not None
+
+    def get_conditional_headers(self) -> dict:
+        """
+        Retrieve the ``If-None-Match`` and ``If-Modified-Since`` headers used to revalidate the entry.
+
+        :return: A dict of headers.
+        :rtype: dict
+        """
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    A thread safe, size bounded LRU cache of validated response models.
+
+    Entries are keyed by method, formatted URL and the request model. They are fresh for ``max-age`` seconds if the
+    response has a ``Cache-Control`` header, otherwise ``ttl`` seconds. Stale entries with an ``ETag`` or
+    ``Last-Modified`` header are revalidated with a conditional request, on a ``304 Not Modified`` the cached model
+    is returned without being decoded or validated again.
+
+    Note that the same model instance is returned to every caller, it should be treated as read only.
+    """
+
+    def __init__(self, maxsize: int=128, ttl: float=60, methods: Iterable[str]=('get', 'head')):
+        """
+        :param maxsize: The maximum number of entries, once reached the least recently used entry is evicted.
+        :type maxsize: int
+        :param ttl: The number of seconds an entry is fresh for if the response doesn't specify ``max-age``, ``None``
+                    to keep entries until they are evicted.
+        :type ttl: float|None
+        :param methods: The HTTP methods whose responses are cached.
+        :type methods: Iterable[str]
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.methods = frozenset(method.lower() for method in methods)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        #: The number of fresh entries returned.
+        self.hits = 0
+        #: The number of lookups that found no entry, or one that could not be revalidated.
+        self.misses = 0
+        #: The number of entries refreshed by a ``304 Not Modified``.
+        self.revalidated = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Union[CacheEntry, None]:
+        """
+        Retrieve the entry for ``key``.
+
+        Stale entries that can't be revalidated are discarded.
+
+        :return: The entry, which may be stale, or ``None``.
+        :rtype: CacheEntry|None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.fresh:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                if entry.revalidatable:
+                    return entry
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def store(self, key: Hashable, response: requests.Response, model: Model):
+        """
+        Cache ``model``, the validated model built from ``response``, unless ``response`` forbids it.
+        """
+        directives = parse_cache_control(response.headers.get('cache-control'))
+        if 'no-store' in directives:
+            self.discard(key)
+            return
+
+        entry = CacheEntry(
+            model,
+            self.get_expires(directives),
+            etag=response.headers.get('etag'),
+            last_modified=response.headers.get('last-modified'),
+        )
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def revalidate(self, key: Hashable, entry: CacheEntry, response: requests.Response) -> Model:
+        """
+        Refresh ``entry`` given a ``304 Not Modified`` response to a conditional request.
+
+        :return: The cached model.
+        :rtype: Model
+        """
+        directives = parse_cache_control(response.headers.get('cache-control'))
+        entry.expires = self.get_expires(directives)
+        entry.etag = response.headers.get('etag', entry.etag)
+        entry.last_modified = response.headers.get('last-modified', entry.last_modified)
+
+        with self._lock:
+            self.revalidated += 1
+            if 'no-store' in directives:
+                self._entries.pop(key, None)
+            elif key in self._entries:
+                self._entries.move_to_end(key)
+
+        return entry.model
+
+    def get_expires(self, directives: dict) -> Union[float, None]:
+        """
+        Calculate when an entry expires given the ``Cache-Control`` directives of its response.
+        """
+        if 'no-cache' in directives:
+            return 0
+        max_age = directives.get('max-age')
+        if isinstance(max_age, int):
+            return time.monotonic() + max_age
+        if self.ttl is None:
+            return None
+        return time.monotonic() + self.ttl
+
+    def discard(self, key: Hashable):
+        """
+        Remove the entry for ``key``, if any.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+def parse_cache_control(value: str=None) -> dict:
+    """
+    Parse a ``Cache-Control`` header into a dict of lower case directives.
+
+    Directives without a value map to ``True`` and numeric values are converted to ``int``.
+
+    :param value: The value of the header.
+    :type value: str|None
+    :return: A dict of directives.
+    :rtype: dict
+    """
+    directives = {}
+    for directive in (value or '').split(','):
+        name, _, arg = directive.partition('=')
+        name = name.strip().lower()
+        if not name:
+            continue
+        arg = arg.strip().strip('"')
+        directives[name] = int(arg) if arg.isdigit() else (arg or True)
+    return directives
+
+
+def freeze(value) -> Hashable:
+    """
+    Convert ``value``, a kwarg supplied to requests such as ``params``, ``headers`` or ``data``, into a hashable
+    equivalent for use in a key.
+
+    :raises TypeError: If ``value`` can't be converted, for instance a file or a generator.
+    """
+    if value is None or isinstance(value, (str, bytes, int, float, bool)):
+        return value
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(key), freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    raise TypeError("%s can't be used in a key." % type(value).__name__)
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.circuit
+    ~~~~~~~~~~~~~~~~~
+
+    Fail fast while an upstream is down.
+"""
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Hashable, Iterable
+
+import requests
+
+from eater.api.endpoint import PerEndpoint
+from eater.errors import EaterCircuitOpenError, EaterConnectError, EaterTimeoutError
+
+__all__ = ['Circuit', 'CircuitBreaker']
+
+
+class Circuit:
+    """
+    The state of a single circuit, see :py:class:`CircuitBreaker`.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, breaker: 'CircuitBreaker'):
+        self.breaker = breaker
+        self.state = self.CLOSED
+        #: The outcomes of the most recent calls, ``True`` for a failure.
+        self.outcomes = deque(maxlen=breaker.window)
+        self.opened_at = None
+        self.probes = 0
+
+    @property
+    def failure_rate(self) -> float:
+        """
+        The proportion of the most recent calls that failed.
+        """
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def allow(self) -> bool:
+        """
+        Called, with the breaker's lock held, before a call is made.
+
+        :return: ``False`` if the circuit is open, or half open and already probing.
+        :rtype: bool
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.breaker.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self.probes = 0
+
+        if self.state == self.HALF_OPEN:
+            if self.probes >= self.breaker.half_open_calls:
+                return False
+            self.probes += 1
+
+        return True
+
+    def record(self, failure: bool):
+        """
+        Called, with the breaker's lock held, with the outcome of a call.
+        """
+        if self.state == self.HALF_OPEN:
+            if failure:
+                self.trip()
+            else:
+                self.state = self.CLOSED
+                self.outcomes.clear()
+            return
+
+        self.outcomes.append(failure)
+        if self.state == self.CLOSED and len(self.outcomes) >= self.breaker.minimum_calls and \
+                self.failure_rate >= self.breaker.failure_threshold:
+            self.trip()
+
+    def trip(self):
+        """
+        Open the circuit.
+        """
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.outcomes.clear()
+
+
+class CircuitBreaker(PerEndpoint):
+    """
+    A thread safe circuit breaker, keeping a separate circuit for each eater class or host.
+
+    A circuit starts closed. Once at least ``minimum_calls`` of the last ``window`` calls have been made and the
+    proportion that failed reaches ``failure_threshold`` it opens, and calls raise
+    :py:class:`eater.errors.EaterCircuitOpenError` without touching the network. After ``reset_timeout`` seconds it's
+    half open and up to ``half_open_calls`` probe calls are made, if they succeed it closes again otherwise it reopens.
+    """
+
+    def __init__(self, failure_threshold: float=0.5, minimum_calls: int=10, window: int=20,
+                 reset_timeout: float=30, half_open_calls: int=1, per: str='class',
+                 exceptions: tuple=(EaterConnectError, EaterTimeoutError), statuses: Iterable[int]=range(500, 600)):
+        """
+        :param failure_threshold: The proportion of failed calls that opens the circuit.
+        :type failure_threshold: float
+        :param minimum_calls: The number of calls that must be made before the circuit can open.
+        :type minimum_calls: int
+        :param window: The number of most recent calls the failure rate is calculated over.
+        :type window: int
+        :param reset_timeout: The number of seconds the circuit stays open before probing the upstream.
+        :type reset_timeout: float
+        :param half_open_calls: The number of concurrent probe calls allowed while half open.
+        :type half_open_calls: int
+        :param per: ``'class'`` to keep a circuit per eater class or ``'host'`` per scheme and host.
+        :type per: str
+        :param exceptions: The exceptions that count as failures.
+        :type exceptions: tuple
+        :param statuses: The HTTP status codes that count as failures.
+        :type statuses: Iterable[int]
+        """
+        super().__init__(per)
+
+        self.failure_threshold = failure_threshold
+        self.minimum_calls = minimum_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.exceptions = exceptions
+        self.statuses = frozenset(statuses)
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+    def get_circuit(self, key: Hashable) -> Circuit:
+        """
+        Retrieve the circuit for ``key``, creating it if necessary.
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                circuit = self._circuits[key] = Circuit(self)
+            return circuit
+
+    def get_state(self, key: Hashable) -> str:
+        """
+        Retrieve the state of the circuit for ``key``, one of ``'closed'``, ``'open'`` or ``'half-open'``.
+        """
+        return self.get_circuit(key).state
+
+    def acquire(self, key: Hashable) -> Circuit:
+        """
+        Acquire permission to make a call.
+
+        :raises EaterCircuitOpenError: If the circuit is open.
+        """
+        circuit = self.get_circuit(key)
+        with self._lock:
+            if not circuit.allow():
+                raise EaterCircuitOpenError("Circuit for %s is %s, failing fast." % (self.describe(key), circuit.state))
+        return circuit
+
+    def record(self, circuit: Circuit, failure: bool):
+        """
+        Record the outcome of a call.
+        """
+        with self._lock:
+            circuit.record(failure)
+
+    def release(self, circuit: Circuit):
+        """
+        Release permission to make a call without recording an outcome, for instance if the call was cancelled.
+        """
+        with self._lock:
+            if circuit.state == Circuit.HALF_OPEN and circuit.probes:
+                circuit.probes -= 1
+
+    def call(self, key: Hashable, send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Call ``send`` unless the circuit for ``key`` is open, recording the outcome.
+
+        :param key: The key of the circuit, see :py:meth:`.CircuitBreaker.get_key`.
+        :type key: Hashable
+        :param send: A callable that makes the request and returns the response.
+        :type send: Callable
+        :return: The response.
+        :rtype: requests.Response
+        :raises EaterCircuitOpenError: If the circuit is open.
+        """
+        circuit = self.acquire(key)
+        try:
+            response = send()
+        except self.exceptions:
+            self.record(circuit, True)
+            raise
+        except BaseException:
+            self.release(circuit)
+            raise
+        self.record(circuit, response.status_code in self.statuses)
+        return response
+
+    async def acall(self, key: Hashable, send: Callable[[], Awaitable[requests.Response]]) -> requests.Response:
+        """
+        Identical to :py:meth:`.CircuitBreaker.call` except that ``send`` returns an awaitable.
+        """
+        circuit = self.acquire(key)
+        try:
+            response = await send()
+        except self.exceptions:
+            self.record(circuit, True)
+            raise
+        except BaseException:
+            self.release(circuit)
+            raise
+        self.record(circuit, response.status_code in self.statuses)
+        return response
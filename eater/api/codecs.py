@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.codecs
+    ~~~~~~~~~~~~~~~~
+
+    Pluggable codecs used to decode response bodies and encode request bodies.
+
+    JSON is handled by the eater's ``json_codec``, other formats are looked up by media type in a registry, see
+    :py:func:`register_media_codec`. :py:class:`OrjsonCodec` requires orjson_ (``pip install eater[fast]``),
+    :py:class:`MsgpackCodec` requires msgpack_ (``pip install eater[msgpack]``) and :py:class:`CBORCodec` requires
+    cbor2_ (``pip install eater[cbor]``).
+
+    .. _orjson: https://github.com/ijl/orjson
+    .. _msgpack: https://github.com/msgpack/msgpack-python
+    .. _cbor2: https://github.com/agronholm/cbor2
+"""
+import json
+import threading
+from typing import IO, Any, Union
+
+__all__ = [
+    'Codec', 'JSONCodec', 'OrjsonCodec', 'MsgpackCodec', 'CBORCodec', 'get_codec', 'set_default_codec',
+    'parse_media_type', 'is_json', 'register_media_codec', 'get_media_codec', 'format_accept'
+]
+
+
+class Codec:
+    """
+    Base codec - encode and decode a serialisation format.
+    """
+
+    #: The name of the codec.
+    name = None
+
+    #: The extra that installs the library the codec requires, if any.
+    extra = None
+
+    #: The media types of the format, the first is used in ``Content-Type`` headers.
+    media_types = ()
+
+    def loads(self, data: bytes) -> Any:
+        """
+        Decode ``data``, the raw bytes of a document.
+
+        :raises ValueError: If ``data`` isn't valid.
+        """
+        raise NotImplementedError()
+
+    def load(self, fp: IO[bytes]) -> Any:
+        """
+        Decode a document read from the binary file ``fp``.
+
+        By default the whole document is read and decoded with :py:meth:`.Codec.loads`, codecs that can decode
+        incrementally override this.
+
+        :raises ValueError: If the document isn't valid.
+        """
+        return self.loads(fp.read())
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encode ``obj``.
+        """
+        raise NotImplementedError()
+
+
+class JSONCodec(Codec):
+    """
+    Encode and decode JSON with the standard library.
+    """
+
+    #: The name of the codec, as used for ``HTTPEater.json_codec``.
+    name = 'json'
+
+    media_types = ('application/json',)
+
+    def loads(self, data: Union[bytes, str]) -> Any:  # pylint: disable=no-self-use
+        """
+        Decode ``data``, the raw bytes of a JSON document.
+
+        :raises ValueError: If ``data`` isn't valid JSON.
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:  # pylint: disable=no-self-use
+        """
+        Encode ``obj`` as UTF-8 JSON.
+        """
+        return json.dumps(obj, allow_nan=False).encode('utf-8')
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Encode and decode JSON with orjson_, directly from and to bytes.
+
+    Anything orjson can't handle (for instance a body that isn't UTF-8, or an integer larger than 64 bits) falls back
+    to the standard library.
+    """
+
+    name = 'orjson'
+
+    extra = 'fast'
+
+    def __init__(self):
+        import orjson  # pylint: disable=import-outside-toplevel
+        self.orjson = orjson
+
+    def __reduce__(self):
+        # Modules can't be pickled, import orjson again when unpickled (for instance in a worker process)
+        return type(self), ()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self.orjson.loads(data)
+        except ValueError:
+            return super().loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self.orjson.dumps(obj)
+        except TypeError:
+            return super().dumps(obj)
+
+
+class MsgpackCodec(Codec):
+    """
+    Encode and decode MessagePack with msgpack_.
+    """
+
+    name = 'msgpack'
+
+    extra = 'msgpack'
+    media_types = ('application/msgpack', 'application/x-msgpack', 'application/vnd.msgpack')
+
+    def __init__(self):
+        import msgpack  # pylint: disable=import-outside-toplevel
+        self.msgpack = msgpack
+
+    def __reduce__(self):
+        # Modules can't be pickled, import msgpack again when unpickled (for instance in a worker process)
+        return type(self), ()
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return self.msgpack.unpackb(data, raw=False)
+        except Exception as exc_info:  # pylint: disable=broad-except
+            raise ValueError("Invalid MessagePack: %s" % exc_info) from exc_info
+
+    def load(self, fp: IO[bytes]) -> Any:
+        # A limit of 0 lifts the default 100MiB limit on the buffered data, unpackb has no such limit either
+        unpacker = self.msgpack.Unpacker(fp, raw=False, max_buffer_size=0)
+        try:
+            obj = unpacker.unpack()
+        except self.msgpack.OutOfData as exc_info:
+            raise ValueError("Invalid MessagePack: the document is incomplete.") from exc_info
+        except Exception as exc_info:  # pylint: disable=broad-except
+            raise ValueError("Invalid MessagePack: %s" % exc_info) from exc_info
+        try:
+            unpacker.skip()
+        except self.msgpack.OutOfData:
+            return obj
+        raise ValueError("Invalid MessagePack: extra data after the document.")
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.msgpack.packb(obj, use_bin_type=True)
+
+
+class CBORCodec(Codec):
+    """
+    Encode and decode CBOR (`RFC 8949`_) with cbor2_.
+
+    .. _RFC 8949: https://tools.ietf.org/html/rfc8949
+    """
+
+    name = 'cbor'
+
+    extra = 'cbor'
+    media_types = ('application/cbor',)
+
+    def __init__(self):
+        import cbor2  # pylint: disable=import-outside-toplevel
+        self.cbor2 = cbor2
+
+    def __reduce__(self):
+        # Modules can't be pickled, import cbor2 again when unpickled (for instance in a worker process)
+        return type(self), ()
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return self.cbor2.loads(data)
+        except Exception as exc_info:  # pylint: disable=broad-except
+            raise ValueError("Invalid CBOR: %s" % exc_info) from exc_info
+
+    def load(self, fp: IO[bytes]) -> Any:
+        try:
+            return self.cbor2.load(fp)
+        except Exception as exc_info:  # pylint: disable=broad-except
+            raise ValueError("Invalid CBOR: %s" % exc_info) from exc_info
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.cbor2.dumps(obj)
+
+
+#: Codecs that can be referred to by name.
+CODECS = {
+    'json': JSONCodec,
+    'orjson': OrjsonCodec,
+}
+
+_default = None
+
+
+def get_codec(codec: Union[str, JSONCodec, None]=None) -> JSONCodec:
+    """
+    Resolve ``codec``.
+
+    :param codec: ``'json'``, ``'orjson'``, ``'auto'`` (orjson if it's installed, otherwise the standard library), an
+                  instance of :py:class:`JSONCodec` or ``None`` for the default set by :py:func:`set_default_codec`,
+                  the standard library unless set.
+    :type codec: str|JSONCodec|None
+    :return: An instance of :py:class:`JSONCodec`.
+    :rtype: JSONCodec
+    """
+    if codec is None:
+        global _default  # pylint: disable=global-statement
+        if _default is None:
+            _default = JSONCodec()
+        return _default
+
+    if isinstance(codec, JSONCodec):
+        return codec
+
+    if codec == 'auto':
+        try:
+            return OrjsonCodec()
+        except ImportError:
+            return JSONCodec()
+
+    try:
+        return CODECS[codec]()
+    except KeyError as exc_info:
+        raise ValueError(
+            "Unknown JSON codec '%s', expected one of auto, %s." % (codec, ', '.join(sorted(CODECS)))
+        ) from exc_info
+
+
+def set_default_codec(codec: Union[str, JSONCodec]):
+    """
+    Set the codec used by every eater that doesn't set ``json_codec``.
+
+    :param codec: See :py:func:`get_codec`.
+    :type codec: str|JSONCodec
+    """
+    global _default  # pylint: disable=global-statement
+    _default = get_codec(codec)
+
+
+#: Codecs (or codec classes, instantiated on first use) keyed by media type, JSON is handled by ``json_codec``.
+_media_codecs = {
+    media_type: codec_cls for codec_cls in (MsgpackCodec, CBORCodec) for media_type in codec_cls.media_types
+}
+_media_codecs_lock = threading.Lock()
+
+
+def parse_media_type(content_type: str) -> str:
+    """
+    Parse the media type of a ``Content-Type`` header, for instance ``'application/json; charset=utf-8'`` is
+    ``'application/json'``.
+    """
+    return content_type.split(';', 1)[0].strip().lower()
+
+
+def is_json(media_type: str) -> bool:
+    """
+    Determine if ``media_type`` is JSON, either ``application/json`` or has a ``+json`` suffix.
+    """
+    return media_type == 'application/json' or media_type.endswith('+json')
+
+
+def register_media_codec(media_type: str, codec: Union[Codec, type]):
+    """
+    Register ``codec`` to decode responses, and encode requests, of ``media_type``.
+
+    :param media_type: The media type, for instance ``'application/cbor'``.
+    :type media_type: str
+    :param codec: An instance of :py:class:`Codec` or a subclass, instantiated the first time it's used.
+    :type codec: Codec|type
+    """
+    with _media_codecs_lock:
+        _media_codecs[parse_media_type(media_type)] = codec
+
+
+def get_media_codec(media_type: str) -> Union[Codec, None]:
+    """
+    Retrieve the codec registered for ``media_type``, or for its structured syntax suffix (``+msgpack``).
+
+    :param media_type: A media type, as returned by :py:func:`parse_media_type`.
+    :type media_type: str
+    :return: The codec or ``None`` if there isn't one.
+    :rtype: Codec|None
+    :raises NotImplementedError: If the library the codec requires isn't installed.
+    """
+    with _media_codecs_lock:
+        codec = _media_codecs.get(media_type)
+        if codec is None and '+' in media_type:
+            media_type = '%s/%s' % (media_type.split('/', 1)[0], media_type.rsplit('+', 1)[1])
+            codec = _media_codecs.get(media_type)
+        if isinstance(codec, type):
+            try:
+                codec = _media_codecs[media_type] = codec()
+            except ImportError as exc_info:
+                raise NotImplementedError("Content type '%s' requires %s, which isn't installed%s." % (
+                    media_type, exc_info.name, ' - pip install eater[%s]' % codec.extra if codec.extra else ''
+                )) from exc_info
+        return codec
+
+
+def format_accept(media_types: tuple) -> str:
+    """
+    Build an ``Accept`` header preferring ``media_types`` in order.
+
+    :param media_types: Media types, most preferred first.
+    :type media_types: tuple
+    :return: For instance ``'application/msgpack, application/json;q=0.9'``.
+    :rtype: str
+    """
+    return ', '.join(
+        media_type if index == 0 else '%s;q=%.1f' % (media_type, max(1 - index / 10, 0.1))
+        for index, media_type in enumerate(media_types)
+    )
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.compiled
+    ~~~~~~~~~~~~~~~~~~
+
+    Compile schematics models into specialised validation functions.
+
+    A :py:class:`CompiledModel` walks ``raw_data`` once, converting and validating each field with a function built
+    for that field when the model class was compiled, then builds the model from the already validated data. It only
+    handles the happy path - as soon as anything looks wrong it hands ``raw_data`` to schematics, so that errors are
+    exactly the ``DataError`` schematics would raise.
+
+    Models may also be compiled with ``validate=False``, in which case values are only converted to their native
+    types (and required fields checked) - validators such as ``min_length`` or ``min_value`` aren't run.
+"""
+from typing import Callable, Iterator
+
+from schematics import Model
+from schematics.types import BaseType, BooleanType, FloatType, IntType, ListType, ModelType, StringType
+from schematics.undefined import Undefined
+from schematics.transforms import get_import_context
+from schematics.validate import get_validation_context
+
+__all__ = ['CompiledModel', 'compile_model']
+
+#: Compiled models, keyed by model class and whether they validate.
+_compiled = {}
+
+
+class Fallback(Exception):
+    """
+    Raised by a compiled field function when the value should be handed to schematics.
+    """
+
+
+def compile_model(model_cls: type, validate: bool=True) -> 'CompiledModel':
+    """
+    Retrieve the :py:class:`CompiledModel` for ``model_cls``, compiling it on first use.
+
+    :param model_cls: A schematics model class.
+    :type model_cls: type
+    :param validate: If ``False`` values are only converted to their native types rather than validated.
+    :type validate: bool
+    :return: The compiled model.
+    :rtype: CompiledModel
+    """
+    try:
+        return _compiled[model_cls, validate]
+    except KeyError:
+        compiled = _compiled[model_cls, validate] = CompiledModel(model_cls, validate)
+        compiled.compile()
+        return compiled
+
+
+def get_schema(model_cls: type) -> tuple:
+    """
+    Retrieve the fields and model level validators of ``model_cls``, supporting schematics 2.0 and 2.1.
+
+    :return: A tuple of a dict of fields and a dict of validators.
+    :rtype: tuple
+    """
+    schema = getattr(model_cls, '_schema', None)
+    if schema is not None:
+        return schema.fields, schema.validators
+    return model_cls._fields, model_cls._validator_functions  # pylint: disable=protected-access
+
+
+class CompiledModel:
+    """
+    A schematics model class compiled into a specialised validation function.
+
+    Calling an instance is equivalent to ``model_cls(raw_data=raw_data, validate=validate, partial=False)``.
+    """
+
+    def __init__(self, model_cls: type, validate: bool=True):
+        self.model_cls = model_cls
+        self.validate = validate
+        #: A list of ``(name, input_keys, converter, field)`` tuples, or ``None`` if ``model_cls`` can't be compiled.
+        self.fields = None
+        #: The keys that may be present in ``raw_data``.
+        self.input_keys = frozenset()
+        self.context = (get_validation_context if validate else get_import_context)(
+            partial=False, strict=True, oo=True, recursive=False, init_values=True, apply_defaults=True, app_data={}
+        )
+
+    def compile(self):
+        """
+        Build the converter for each field of ``model_cls``.
+        """
+        fields, validators = get_schema(self.model_cls)
+
+        if (validators and self.validate) or any(getattr(field, 'fset', None) is not None for field in fields.values()):
+            # Model level validators and setters need the model instance, leave them to schematics
+            return
+
+        compiled = []
+        input_keys = set()
+        for name, field in fields.items():
+            if not isinstance(field, BaseType):
+                continue
+            keys = tuple(field.get_input_keys()) if hasattr(field, 'get_input_keys') else (
+                (name, field.serialized_name) if field.serialized_name else (name,)
+            ) + tuple(field.deserialize_from or ())
+            input_keys.update(keys)
+            compiled.append((name, keys, self.compile_field(field), field))
+
+        self.input_keys = frozenset(input_keys)
+        self.fields = compiled
+
+    def compile_field(self, field: BaseType) -> Callable:
+        """
+        Build a function that converts and validates a single (not ``None``) value of ``field``.
+        """
+        context = self.context
+
+        if self.validate:
+            def generic(value):
+                return field.validate(value, context)
+
+            if any(getattr(validator, '__self__', None) is not field for validator in field.validators):
+                # Custom validators have been supplied
+                return generic
+
+            choices = field.choices
+
+        else:
+            def generic(value):
+                return field.convert(value, context)
+
+            choices = None
+
+        if type(field) is StringType:  # pylint: disable=unidiomatic-typecheck
+            return self.compile_string(field, generic)
+
+        if type(field) in (IntType, FloatType, BooleanType):  # pylint: disable=unidiomatic-typecheck
+            native = {IntType: int, FloatType: float, BooleanType: bool}[type(field)]
+            min_value = getattr(field, 'min_value', None) if self.validate else None
+            max_value = getattr(field, 'max_value', None) if self.validate else None
+
+            def number(value):
+                if type(value) is not native:  # pylint: disable=unidiomatic-typecheck
+                    return generic(value)
+                if choices is not None and value not in choices:
+                    raise Fallback()
+                if (min_value is not None and value < min_value) or (max_value is not None and value > max_value):
+                    raise Fallback()
+                return value
+            return number
+
+        if type(field) is ModelType and choices is None:  # pylint: disable=unidiomatic-typecheck
+            compiled = compile_model(field.model_class, self.validate)
+
+            def model(value):
+                if type(value) is not dict:  # pylint: disable=unidiomatic-typecheck
+                    return generic(value)
+                return compiled.build(value)
+            return model
+
+        if type(field) is ListType and choices is None:  # pylint: disable=unidiomatic-typecheck
+            return self.compile_list(field, generic)
+
+        return generic
+
+    def compile_string(self, field: StringType, generic: Callable) -> Callable:
+        """
+        Build a function that converts and validates a ``StringType``.
+        """
+        if self.validate:
+            choices, regex = field.choices, field.regex
+            min_length, max_length = field.min_length, field.max_length
+        else:
+            choices = regex = min_length = max_length = None
+
+        def string(value):
+            if type(value) is not str:  # pylint: disable=unidiomatic-typecheck
+                return generic(value)
+            if (choices is not None and value not in choices) or (regex is not None and regex.match(value) is None):
+                raise Fallback()
+            if (min_length is not None and len(value) < min_length) or \
+                    (max_length is not None and len(value) > max_length):
+                raise Fallback()
+            return value
+        return string
+
+    def compile_list(self, field: ListType, generic: Callable) -> Callable:
+        """
+        Build a function that converts and validates a ``ListType``.
+        """
+        item_field = field.field
+        if item_field.required or (self.validate and item_field.choices is not None):
+            return generic
+
+        convert_item = self.compile_field(item_field)
+        min_size, max_size = (field.min_size, field.max_size) if self.validate else (None, None)
+
+        def items(value):
+            if type(value) is not list:  # pylint: disable=unidiomatic-typecheck
+                return generic(value)
+            if (min_size is not None and len(value) < min_size) or (max_size is not None and len(value) > max_size):
+                raise Fallback()
+            return [None if item is None else convert_item(item) for item in value]
+        return items
+
+    def iter_values(self, raw_data: dict) -> Iterator[tuple]:
+        """
+        Yield a ``(name, convert, field, value)`` tuple for each field, the value being that of the first of the
+        field's input keys in ``raw_data``, otherwise its default or ``None``.
+
+        Raises :py:class:`Fallback` if ``raw_data`` has a key that isn't an input key of any field.
+        """
+        if not self.input_keys.issuperset(raw_data):
+            raise Fallback()
+
+        for name, keys, convert, field in self.fields:
+            value = Undefined
+            for key in keys:
+                if key in raw_data:
+                    value = raw_data[key]
+                    break
+
+            if value is Undefined:
+                value = field.default
+                if value is Undefined:
+                    value = None
+
+            yield name, convert, field, value
+
+    def convert(self, raw_data: dict) -> dict:
+        """
+        Convert (and validate) ``raw_data``, returning a dict of native values keyed by field name.
+
+        Raises an exception (not necessarily a ``DataError``) if ``raw_data`` is invalid.
+        """
+        data = {}
+        for name, convert, field, value in self.iter_values(raw_data):
+            if value is None:
+                if field.required:
+                    raise Fallback()
+            else:
+                value = convert(value)
+
+            data[name] = value
+        return data
+
+    def build(self, raw_data: dict) -> Model:
+        """
+        Build an instance of ``model_cls`` from ``raw_data``.
+
+        Raises an exception (not necessarily a ``DataError``) if ``raw_data`` is invalid.
+        """
+        if self.fields is None:
+            return self.model_cls(raw_data=raw_data, validate=self.validate, partial=False)
+        return self.model_cls(trusted_data=self.convert(raw_data), init=False)
+
+    def __call__(self, raw_data: dict) -> Model:
+        """
+        Convert (and validate) ``raw_data`` returning an instance of ``model_cls``.
+
+        :param raw_data: The data to validate.
+        :type raw_data: dict
+        :return: An instance of ``model_cls``.
+        :rtype: Model
+        :raises DataError: If ``raw_data`` is invalid.
+        """
+        if type(raw_data) is dict:  # pylint: disable=unidiomatic-typecheck
+            try:
+                return self.build(raw_data)
+            except Exception:  # pylint: disable=broad-except
+                pass
+        return self.model_cls(raw_data=raw_data, validate=self.validate, partial=False)
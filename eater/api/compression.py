@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.compression
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Compress request bodies.
+
+    Bodies are compressed with ``gzip``, ``deflate`` or, with brotli_ installed (``pip install eater[brotli]``), ``br``
+    and sent with a ``Content-Encoding`` header. Responses are decompressed by urllib3 as they're received (brotli too,
+    once it's installed), set ``stream_decoding`` on an eater to decode them straight from the decompressed chunks.
+
+    .. _brotli: https://github.com/google/brotli
+"""
+import gzip
+import zlib
+from typing import Callable
+
+__all__ = ['compress', 'register_encoding']
+
+
+def compress_gzip(data: bytes, level: int=None) -> bytes:
+    """
+    Compress ``data`` with gzip.
+    """
+    # Leave the modification time out of the header, so the same body is always compressed to the same bytes
+    return gzip.compress(data, 6 if level is None else level, mtime=0)
+
+
+def compress_deflate(data: bytes, level: int=None) -> bytes:
+    """
+    Compress ``data`` as a zlib stream, which is what HTTP calls ``deflate``.
+    """
+    return zlib.compress(data, 6 if level is None else level)
+
+
+def compress_brotli(data: bytes, level: int=None) -> bytes:
+    """
+    Compress ``data`` with brotli, or brotlicffi on PyPy.
+    """
+    try:
+        import brotli  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        import brotlicffi as brotli  # pylint: disable=import-outside-toplevel
+    # The default quality of 11 is meant for static content, far too slow to spend on every call
+    return brotli.compress(data, quality=4 if level is None else level)
+
+
+#: Compression functions, keyed by content coding.
+ENCODINGS = {
+    'gzip': compress_gzip,
+    'deflate': compress_deflate,
+    'br': compress_brotli,
+}
+
+
+def register_encoding(encoding: str, function: Callable[[bytes, int], bytes]):
+    """
+    Register ``function`` to compress request bodies with the content coding ``encoding``.
+
+    :param encoding: The content coding, as sent in the ``Content-Encoding`` header, for instance ``'zstd'``.
+    :type encoding: str
+    :param function: A callable accepting the body and a compression level (``None`` for its default) and returning
+                     the compressed body.
+    :type function: Callable
+    """
+    ENCODINGS[encoding.lower()] = function
+
+
+def compress(data: bytes, encoding: str, level: int=None) -> bytes:
+    """
+    Compress ``data`` with the content coding ``encoding``.
+
+    :param data: The body.
+    :type data: bytes
+    :param encoding: ``'gzip'``, ``'deflate'``, ``'br'`` or a content coding registered with
+                     :py:func:`register_encoding`.
+    :type encoding: str
+    :param level: The compression level, ``None`` for the default of the encoding.
+    :type level: int|None
+    :return: The compressed body.
+    :rtype: bytes
+    :raises ValueError: If ``encoding`` is unknown.
+    """
+    try:
+        function = ENCODINGS[encoding.lower()]
+    except KeyError as exc_info:
+        raise ValueError(
+            "Unknown content coding '%s', expected one of %s." % (encoding, ', '.join(sorted(ENCODINGS)))
+        ) from exc_info
+    return function(data, level)
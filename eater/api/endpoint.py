@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.endpoint
+    ~~~~~~~~~~~~~~~~~~
+
+    Keep state per eater class or per host.
+"""
+from typing import Hashable
+from urllib.parse import urlsplit
+
+__all__ = ['PerEndpoint']
+
+
+class PerEndpoint:
+    """
+    Base class of policies that keep separate state, such as a circuit or a token bucket, per eater class or per
+    scheme and host.
+    """
+
+    def __init__(self, per: str):
+        """
+        :param per: ``'class'`` to keep state per eater class or ``'host'`` per scheme and host.
+        :type per: str
+        """
+        if per not in ('class', 'host'):
+            raise ValueError("per must be 'class' or 'host', not '%s'." % per)
+        self.per = per
+
+    def get_key(self, eater_cls: type, url: str) -> Hashable:
+        """
+        Build the key of the state used by ``eater_cls`` to call ``url``.
+        """
+        if self.per == 'class':
+            return eater_cls
+        parts = urlsplit(url)
+        return parts.scheme, parts.netloc
+
+    @staticmethod
+    def describe(key: Hashable) -> str:
+        """
+        Describe ``key`` for use in error messages.
+        """
+        if isinstance(key, type):
+            return key.__name__
+        if isinstance(key, tuple):
+            return "'%s://%s'" % key
+        return repr(key)
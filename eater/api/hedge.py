@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.hedge
+    ~~~~~~~~~~~~~~~
+
+    Hedge idempotent requests to cut tail latency.
+
+    If no response has arrived after a delay a duplicate request is sent, the first successful response wins and the
+    other request is cancelled. The delay is either fixed or a percentile of the latencies observed, so only the
+    slowest few percent of requests are hedged, and a budget caps the extra load hedging may add.
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Awaitable, Callable, Iterable, Union
+
+import requests
+
+from eater.api.retry import RetryBudget
+
+__all__ = ['HedgePolicy']
+
+
+class HedgePolicy:
+    """
+    Send a duplicate of a request that hasn't received a response after a delay, using whichever response arrives
+    first.
+
+    A response with a ``5xx`` status code or an exception only wins if the other request fares no better. Errors of
+    the first request raised before the delay aren't hedged, that's the job of ``retry``.
+
+    :py:meth:`.HedgePolicy.call` sends the first request on the calling thread and only duplicates from a pool of
+    ``max_workers`` threads, shared by every eater using the policy. A request sent by requests can't be interrupted,
+    so the duplicate only wins if the first request fails. :py:meth:`.HedgePolicy.acall` cancels whichever request
+    loses, so there the first response to arrive wins.
+    """
+
+    def __init__(self, delay: float=0.1, percentile: float=None, min_samples: int=20, samples: int=1000,
+                 methods: Iterable[str]=('get', 'head', 'options', 'put', 'delete'),
+                 hedge_budget: Union[RetryBudget, None]=None, max_workers: int=64):
+        """
+        :param delay: The number of seconds to wait for a response before hedging, or until ``min_samples`` latencies
+                      have been observed if ``percentile`` is supplied.
+        :type delay: float
+        :param percentile: Hedge once a request has taken longer than this percentile (for instance ``95``) of the
+                           latencies observed, ``None`` to always wait ``delay``.
+        :type percentile: float|None
+        :param min_samples: The number of latencies observed before ``percentile`` is used.
+        :type min_samples: int
+        :param samples: The number of most recent latencies ``percentile`` is calculated from.
+        :type samples: int
+        :param methods: The HTTP methods that are hedged, these must be idempotent so ``POST`` isn't by default.
+        :type methods: Iterable[str]
+        :param hedge_budget: The budget hedges are withdrawn from, by default at most one hedge for every ten requests
+                             (plus five) within ten seconds. ``None`` for the default.
+        :type hedge_budget: RetryBudget|None
+        :param max_workers: The maximum number of threads sending duplicate requests.
+        :type max_workers: int
+        """
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.methods = frozenset(method.lower() for method in methods)
+        self.hedge_budget = hedge_budget if hedge_budget is not None else RetryBudget(ratio=0.1, minimum=5)
+        self.max_workers = max_workers
+        #: The number of requests hedged.
+        self.hedged = 0
+        #: The number of hedged requests won by the duplicate.
+        self.won = 0
+        #: The timers that start duplicate requests once the delay has elapsed.
+        self.timers = Timers()
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=samples)
+        self._percentile_delay = None
+        self._executor = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        The pool of threads duplicate requests are sent from, started on first use.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='eater-hedge')
+            return self._executor
+
+    def get_delay(self) -> float:
+        """
+        Calculate the number of seconds to wait for a response before hedging.
+        """
+        with self._lock:
+            if self._percentile_delay is not None:
+                return self._percentile_delay
+            return self.delay
+
+    def observe(self, seconds: float):
+        """
+        Record the latency of a successful request.
+        """
+        if self.percentile is None:
+            return
+        with self._lock:
+            self._latencies.append(seconds)
+            count = len(self._latencies)
+            # Sorting the samples on every request would cost more than it's worth
+            if count >= self.min_samples and (self._percentile_delay is None or count % 16 == 0):
+                latencies = sorted(self._latencies)
+                self._percentile_delay = latencies[min(count - 1, int(count * self.percentile / 100))]
+
+    def start_hedge(self) -> bool:
+        """
+        Withdraw a hedge from the budget.
+
+        :return: ``True`` if the duplicate request may be sent.
+        :rtype: bool
+        """
+        if not self.hedge_budget.withdraw():
+            return False
+        with self._lock:
+            self.hedged += 1
+        return True
+
+    def timed(self, send: Callable[[], requests.Response]) -> requests.Response:
+        start = time.perf_counter()
+        response = send()
+        if is_success(response):
+            self.observe(time.perf_counter() - start)
+        return response
+
+    async def atimed(self, send: Callable[[], Awaitable[requests.Response]]) -> requests.Response:
+        start = time.perf_counter()
+        response = await send()
+        if is_success(response):
+            self.observe(time.perf_counter() - start)
+        return response
+
+    def call(self, send: Callable[[], requests.Response],
+             duplicate: Callable[[], requests.Response]=None) -> requests.Response:
+        """
+        Call ``send`` on the calling thread, calling ``duplicate`` from the pool if it hasn't returned within the delay.
+
+        :param send: A callable that makes the request and returns the response.
+        :type send: Callable
+        :param duplicate: A callable that makes the duplicate request, it must be safe to call from another thread.
+                          ``None`` to call ``send`` again.
+        :type duplicate: Callable|None
+        :return: The response to the first request, unless it failed and the duplicate didn't.
+        :rtype: requests.Response
+        :raises: The exception raised by the first request, if both failed.
+        """
+        self.hedge_budget.deposit()
+        context = copy_context()
+        hedges = []
+
+        def start():
+            if self.start_hedge():
+                hedges.append(self.executor.submit(context.run, duplicate or send))
+
+        timer = self.timers.schedule(self.get_delay(), start)
+        primary = Future()
+        try:
+            # The first request is timed as part of the call, the duplicate isn't
+            primary.set_result(self.timed(send))
+        except Exception as exc_info:  # pylint: disable=broad-except
+            primary.set_exception(exc_info)
+        finally:
+            self.timers.cancel(timer)
+
+        if not hedges:
+            return primary.result()
+        hedge = hedges[0]
+        if primary.exception() is None and is_success(primary.result()):
+            cancel(hedge)
+            return primary.result()
+
+        # The first request failed, settle for the duplicate unless it fails too
+        if hedge.exception() is None and is_success(hedge.result()):
+            with self._lock:
+                self.won += 1
+            close(primary)
+            return hedge.result()
+        close(hedge)
+        return primary.result()
+
+    async def acall(self, send: Callable[[], Awaitable[requests.Response]],
+                    duplicate: Callable[[], Awaitable[requests.Response]]=None) -> requests.Response:
+        """
+        Identical to :py:meth:`.HedgePolicy.call` except that ``send`` and ``duplicate`` return awaitables, both are
+        awaited on the event loop and the first successful response wins, cancelling the other request.
+        """
+        self.hedge_budget.deposit()
+        primary = asyncio.ensure_future(self.atimed(send))
+        try:
+            return await asyncio.wait_for(asyncio.shield(primary), self.get_delay())
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+
+        if not self.start_hedge():
+            return await primary
+
+        hedge = asyncio.ensure_future((duplicate or send)())
+        pending = {primary, hedge}
+        finished = []
+        winner = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in (primary, hedge):
+                    if task in done:
+                        if winner is None and task.exception() is None and is_success(task.result()):
+                            winner = task
+                        else:
+                            finished.append(task)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if winner is None:
+            winner = finished[0]
+        elif winner is hedge:
+            with self._lock:
+                self.won += 1
+        return winner.result()
+
+    def shutdown(self, wait: bool=True):
+        """
+        Stop the threads duplicate requests are sent from, they're started again if the policy is used afterwards.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def is_success(response: requests.Response) -> bool:
+    """
+    Check whether ``response`` can win a hedged request.
+    """
+    return response.status_code < 500
+
+
+def close(future: Future):
+    """
+    Close the response of the completed ``future``, if it has one, releasing its connection.
+    """
+    if future.exception() is None:
+        future.result().close()
+
+
+def cancel(future: Future):
+    """
+    Cancel ``future`` if it hasn't started, otherwise close its response once it's received.
+
+    A request being sent by requests can't be interrupted, so it's left to finish in the background.
+    """
+    if not future.cancel():
+        future.add_done_callback(close)
+
+
+class Timers:
+    """
+    Call functions once a delay has elapsed, from a single background thread rather than a thread for each.
+    """
+
+    def __init__(self, name: str='eater-hedge-timers'):
+        self.name = name
+        self._condition = threading.Condition()
+        self._heap = []
+        self._counter = itertools.count()
+        self._thread = None
+
+    def schedule(self, delay: float, func: Callable[[], None]) -> list:
+        """
+        Call ``func`` on the background thread once ``delay`` seconds have elapsed.
+
+        ``func`` is called while the timers are locked, so it should return quickly and not raise.
+
+        :return: The timer, to be supplied to :py:meth:`.Timers.cancel`.
+        :rtype: list
+        """
+        timer = [time.monotonic() + delay, next(self._counter), func]
+        with self._condition:
+            heapq.heappush(self._heap, timer)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return timer
+
+    def cancel(self, timer: list) -> bool:
+        """
+        Stop ``timer`` from calling its function.
+
+        :return: ``False`` if the function has already been called.
+        :rtype: bool
+        """
+        with self._condition:
+            cancelled, timer[2] = timer[2] is not None, None
+        return cancelled
+
+    def run(self):
+        with self._condition:
+            while True:
+                # Cancelled timers are left in the heap until they reach the top
+                while self._heap and self._heap[0][2] is None:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                remaining = self._heap[0][0] - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                timer = heapq.heappop(self._heap)
+                func, timer[2] = timer[2], None
+                func()
@@ -6,14 +6,41 @@
     Eater HTTP API classes.
 """
 
+import copy
+import json
+import time
 from abc import abstractmethod
-from typing import Union
+from contextlib import closing, contextmanager
+from functools import partial
+from typing import Callable, Hashable, Iterable, Iterator, Union
 
 import requests
 from schematics import Model
 
 from eater.api.base import BaseEater
-from eater.errors import EaterTimeoutError, EaterConnectError, EaterUnexpectedError
+from eater.api.batch import BatchResult, imap
+from eater.api.cache import CacheEntry, ResponseCache, freeze
+from eater.api.circuit import CircuitBreaker
+from eater.api.codecs import Codec, JSONCodec, format_accept, get_codec, get_media_codec, is_json, parse_media_type
+from eater.api.compression import compress
+from eater.api.hedge import HedgePolicy
+from eater.api.loader import BatchLoader
+from eater.api.memo import ModelMemo
+from eater.api.offload import ProcessOffload
+from eater.api.ratelimit import RateLimiter, get_rate_limiter
+from eater.api.retry import RetryPolicy
+from eater.api.session import SessionRegistry, get_auth_key, registry
+from eater.api.singleflight import SingleFlight
+from eater.api.streaming import ChunkReader, get_stream_field, iter_json_array, iter_ndjson, validate_items
+from eater.api.timing import NULL_PHASE, get_listeners, phase, record_response, time_call
+from eater.api.transport import Transport, requests_transport
+from eater.api.validation import ValidationPolicy, get_validation_policy
+from eater.errors import EaterTimeoutError, EaterConnectError, EaterUnexpectedError, EaterUnexpectedResponseError
+
+
+#: The kwargs supplied to requests that are left out of request keys, either as they don't change the response or
+#: as they're merged with the session's and keyed separately.
+UNKEYED_KWARGS = frozenset(('timeout', 'stream', 'verify', 'cert', 'proxies', 'hooks', 'auth', 'headers'))
 
 
 class HTTPEater(BaseEater):
@@ -35,7 +62,103 @@ class HTTPEater(BaseEater):
     #: The HTTP method to use to make the API call.
     method = 'get'
 
-    def __init__(self, request_model: Model=None, *, _requests: dict={}, **kwargs):
+    #: Share sessions (and their connection pools) between instances, see :py:class:`eater.api.session.SessionRegistry`.
+    pool_sessions = True
+
+    #: The number of connection pools to cache in a pooled session.
+    pool_connections = 10
+
+    #: The maximum number of connections to keep in each pool of a pooled session.
+    pool_maxsize = 10
+
+    #: The registry that pooled sessions are retrieved from.
+    session_registry = registry  # type: SessionRegistry
+
+    #: The :py:class:`eater.api.transport.Transport` requests are sent with, requests itself by default.
+    transport = requests_transport  # type: Transport
+
+    #: The name of the ``ListType(ModelType(...))`` field of ``response_cls`` yielded by :py:meth:`.HTTPEater.stream`,
+    #: if ``None`` ``response_cls`` must have exactly one such field.
+    stream_field = None
+
+    #: The number of bytes read at a time by :py:meth:`.HTTPEater.stream`.
+    stream_chunk_size = 64 * 1024
+
+    #: Validate responses with a compiled version of ``response_cls``, see :py:mod:`eater.api.compiled`.
+    compiled_validation = False
+
+    #: How thoroughly responses are validated - ``'full'``, ``'types-only'``, ``'sampled'`` or an instance of
+    #: :py:class:`eater.api.validation.ValidationPolicy`.
+    validation = 'full'  # type: Union[str, ValidationPolicy]
+
+    #: An instance of :py:class:`eater.api.cache.ResponseCache` to cache validated responses in, ``None`` to disable
+    #: caching. Note that subclasses share the cache unless they set their own.
+    cache = None  # type: ResponseCache
+
+    #: An instance of :py:class:`eater.api.singleflight.SingleFlight` used to coalesce identical concurrent requests,
+    #: ``None`` to disable coalescing.
+    single_flight = None  # type: SingleFlight
+
+    #: An instance of :py:class:`eater.api.loader.BatchLoader` used to batch concurrent calls into a single call to a
+    #: bulk API, ``None`` to make every call individually.
+    batch_loader = None  # type: BatchLoader
+
+    #: An instance of :py:class:`eater.api.retry.RetryPolicy` used to retry failed requests, ``None`` to never retry.
+    retry = None  # type: RetryPolicy
+
+    #: An instance of :py:class:`eater.api.circuit.CircuitBreaker` used to fail fast while the upstream is down,
+    #: ``None`` to disable.
+    circuit_breaker = None  # type: CircuitBreaker
+
+    #: An instance of :py:class:`eater.api.hedge.HedgePolicy` used to send a duplicate of slow idempotent requests,
+    #: ``None`` to disable hedging.
+    hedge = None  # type: HedgePolicy
+
+    #: Limit the rate of requests - an instance of :py:class:`eater.api.ratelimit.RateLimiter`, a tuple of its
+    #: arguments such as ``(100, 'second')`` (shared by every eater declaring the same tuple) or ``None``.
+    rate_limit = None  # type: Union[tuple, RateLimiter]
+
+    #: The codec used to decode JSON responses and encode JSON requests - ``'json'``, ``'orjson'``, ``'auto'``, an
+    #: instance of :py:class:`eater.api.codecs.JSONCodec` or ``None`` for the default (the standard library unless
+    #: changed with :py:func:`eater.api.codecs.set_default_codec`).
+    json_codec = None  # type: Union[str, JSONCodec]
+
+    #: The ``Content-Type`` request bodies are encoded as, JSON is encoded with ``json_codec`` and other media types
+    #: with the codec registered by :py:func:`eater.api.codecs.register_media_codec`.
+    request_content_type = 'application/json'
+
+    #: Compress request bodies of at least ``request_compression_threshold`` bytes with this content coding -
+    #: ``'gzip'``, ``'deflate'`` or ``'br'``, see :py:mod:`eater.api.compression`. ``None`` to never compress them.
+    request_encoding = None
+
+    #: The size in bytes below which request bodies aren't compressed.
+    request_compression_threshold = 1024
+
+    #: The level request bodies are compressed at, ``None`` for the default of ``request_encoding``.
+    request_compression_level = None
+
+    #: Decode response bodies straight from the stream, decompressed chunk by chunk, rather than reading the whole
+    #: body into memory first. The body is read while decoding, so has no effect with ``memo`` or ``offload``.
+    stream_decoding = False
+
+    #: The media types of responses to ask for with an ``Accept`` header, most preferred first, for instance
+    #: ``('application/msgpack', 'application/json')``. ``None`` to not send an ``Accept`` header.
+    accept = None  # type: tuple
+
+    #: An instance of :py:class:`eater.api.offload.ProcessOffload` to decode and validate huge responses in a process
+    #: pool, ``None`` to always decode and validate in the calling thread.
+    offload = None  # type: ProcessOffload
+
+    #: An instance of :py:class:`eater.api.memo.ModelMemo` to return the model built from a byte-identical body
+    #: without decoding or validating it again, ``None`` to disable memoization.
+    memo = None  # type: ModelMemo
+
+    #: Callables that receive the :py:class:`eater.api.timing.CallTiming` of every call, in addition to those
+    #: registered with :py:func:`eater.api.timing.add_listener`.
+    timing_listeners = ()
+
+    def __init__(self, request_model: Model=None, *, _requests: dict={}, _validation: Union[str, ValidationPolicy]=None,
+                 **kwargs):
         """
         Initialise instance of HTTPEater.
 
@@ -43,6 +166,8 @@ class HTTPEater(BaseEater):
         :type request_model: Model
         :param _requests: A dict of kwargs to be supplied when creating a requests session.
         :type _requests: dict
+        :param _validation: Override ``validation`` for this instance.
+        :type _validation: str|ValidationPolicy|None
         :param kwargs: If request_model is not defined a dict of kwargs to be supplied as the first argument
                        ``raw_data`` when creating an instance of ``request_cls``.
         :type kwargs: dict
@@ -50,10 +175,82 @@ class HTTPEater(BaseEater):
         self.request_model = self.create_request_model(request_model=request_model, **kwargs)
         self.url = self.get_url()
         self.session = self.create_session(**_requests)
+        self.validation = get_validation_policy(self.validation if _validation is None else _validation)
+        self.json_codec = get_codec(self.json_codec)
+        self.rate_limit = get_rate_limiter(self.rate_limit)
 
     def __call__(self, *args, **kwargs):
         return self.request(*args, **kwargs)
 
+    def bind(self, request_model: Model=None, **kwargs) -> 'HTTPEater':
+        """
+        Create a copy of the eater for a single call with its own request model and URL, sharing the configuration
+        and session of the eater.
+
+        :param request_model: An instance of ``request_cls``.
+        :type request_model: Model
+        :param kwargs: If request_model is not defined a dict of kwargs to be supplied as the first argument
+                       ``raw_data`` when creating an instance of ``request_cls``.
+        :type kwargs: dict
+        :return: A copy of the eater.
+        :rtype: HTTPEater
+        """
+        eater = copy.copy(self)
+        eater.request_model = eater.create_request_model(request_model=request_model, **kwargs)
+        eater.url = eater.get_url()
+        return eater
+
+    def call(self, request_model: Model=None, *, _request_kwargs: dict=None, **kwargs) -> Model:
+        """
+        Make a call with its own request model, without modifying the eater.
+
+        Anything :py:meth:`.HTTPEater.get_request_kwargs` changes - the url, method or session - only applies to this
+        call, so a single instance can make many calls, including from many threads at once;
+
+        .. code-block:: python
+
+            api = GetBookAPI()
+            book = api.call(id=7)
+
+        :param request_model: An instance of ``request_cls``.
+        :type request_model: Model
+        :param _request_kwargs: kwargs supplied to :py:meth:`.HTTPEater.get_request_kwargs`, as when calling the eater.
+        :type _request_kwargs: dict|None
+        :param kwargs: If request_model is not defined a dict of kwargs to be supplied as the first argument
+                       ``raw_data`` when creating an instance of ``request_cls``.
+        :type kwargs: dict
+        :return: The response model.
+        :rtype: schematics.Model
+        """
+        return self.bind(request_model, **kwargs)(**(_request_kwargs or {}))
+
+    @classmethod
+    def map(cls, items: Iterable, concurrency: int=10, ordered: bool=True, _requests: dict=None,
+            request_kwargs: dict=None) -> Iterator[BatchResult]:
+        """
+        Call the API once for every item in ``items``, with at most ``concurrency`` requests in flight.
+
+        Every call shares the pooled session, so ``pool_maxsize`` should be at least ``concurrency``.
+
+        ``DataError`` and :py:class:`eater.errors.EaterError` raised by an individual call are captured in the
+        ``error`` attribute of its result rather than aborting the batch.
+
+        :param items: An iterable of ``request_cls`` instances or dicts of kwargs used to create them.
+        :type items: Iterable
+        :param concurrency: The maximum number of requests in flight at any one time.
+        :type concurrency: int
+        :param ordered: If ``True`` results are yielded in the same order as ``items``, otherwise as they complete.
+        :type ordered: bool
+        :param _requests: A dict of kwargs to be supplied when creating a requests session.
+        :type _requests: dict|None
+        :param request_kwargs: A dict of kwargs supplied when calling each instance.
+        :type request_kwargs: dict|None
+        :return: A generator of :py:data:`eater.api.batch.BatchResult`.
+        :rtype: Iterator[BatchResult]
+        """
+        return imap(cls, items, concurrency=concurrency, ordered=ordered, _requests=_requests,
+                    request_kwargs=request_kwargs)
+
     @property
     @abstractmethod
     def url(self) -> str:
@@ -83,6 +280,184 @@ class HTTPEater(BaseEater):
         You should generally leave this method alone. If you need to customise the behaviour use the methods that
         this method uses.
         """
+        listeners = get_listeners(type(self))
+        with time_call(listeners, self) if listeners else NULL_PHASE:
+            if self.batch_loader is not None:
+                return self.load_batched(**kwargs)
+
+            with phase('prepare'):
+                kwargs = self.prepare_request_kwargs(**kwargs)
+
+            if self.single_flight is not None and self.method.lower() in self.single_flight.methods:
+                key = self.get_request_key(kwargs)
+                if key is not None:
+                    return self.single_flight.do(key, partial(self.fetch, kwargs))
+
+            return self.fetch(kwargs)
+
+    def load_batched(self, **kwargs) -> Model:
+        """
+        Retrieve the response model through ``batch_loader``, as part of a single call to its bulk API.
+
+        The item of the bulk response is returned if it's an instance of ``response_cls``, otherwise an instance of
+        ``response_cls`` is built from it.
+
+        :return: The response model.
+        :rtype: schematics.Model
+        """
+        if kwargs:
+            raise TypeError("Calls batched by batch_loader can't supply request kwargs.")
+        return self.get_batched_model(self.batch_loader.load(self.request_model))
+
+    def get_batched_model(self, item: Model) -> Model:
+        """
+        Build the response model from ``item``, the item of the response of ``batch_loader``'s bulk API.
+
+        :param item: The item of the bulk response.
+        :type item: schematics.Model
+        :return: The response model.
+        :rtype: schematics.Model
+        """
+        if isinstance(item, self.response_cls):
+            return item
+        with phase('validate'):
+            return self.build_model(self.response_cls, item.to_primitive())
+
+    def fetch(self, kwargs: dict) -> Model:
+        """
+        Retrieve the response model, either from the cache or by making the HTTP request.
+
+        :param kwargs: The kwargs to be supplied to requests, as returned by :py:meth:`.HTTPEater.prepare_request_kwargs`.
+        :type kwargs: dict
+        :return: The response model.
+        :rtype: schematics.Model
+        """
+        cache_key, cache_entry = self.get_cache_entry(kwargs)
+        if cache_entry is not None and cache_entry.fresh:
+            return cache_entry.model
+
+        if self.stream_decoding:
+            kwargs = dict(kwargs, stream=True)
+        response = self.dispatch(kwargs)
+
+        # Closing the response releases its connection, should a streamed body not have been read
+        with closing(response), self.translate_errors():
+            return self.process_response(response, cache_key, cache_entry)
+
+    def dispatch(self, kwargs: dict) -> requests.Response:
+        """
+        Make the HTTP request with :py:meth:`.HTTPEater.send`, through ``hedge``, ``rate_limit``, ``circuit_breaker``
+        and ``retry``.
+
+        A duplicate sent by ``hedge`` takes a ``rate_limit`` token of its own, and each request sent by ``hedge``
+        records its own outcome with ``circuit_breaker``.
+
+        :param kwargs: The kwargs to be supplied to requests, as returned by :py:meth:`.HTTPEater.prepare_request_kwargs`.
+        :type kwargs: dict
+        :return: The response.
+        :rtype: requests.Response
+        :raises EaterError: If the request fails.
+        """
+        send = partial(self.send, kwargs)
+        if self.hedge is not None and self.method.lower() in self.hedge.methods:
+            # The delay starts once the first request has its token
+            send = partial(self.hedge.call, self.guard(send, rate_limit=False), self.guard(send))
+            send = self.guard(send, circuit_breaker=False)
+        else:
+            send = self.guard(send)
+        if self.retry is not None and self.method.lower() in self.retry.methods:
+            send = partial(self.retry.call, send)
+        return send()
+
+    def guard(self, send: Callable[[], requests.Response], rate_limit: bool=True,
+              circuit_breaker: bool=True) -> Callable[[], requests.Response]:
+        """
+        Wrap ``send`` so that it waits for ``rate_limit`` and records its outcome with ``circuit_breaker``.
+
+        :param send: A callable that makes the request and returns the response.
+        :type send: Callable
+        :param rate_limit: Wait for ``rate_limit``.
+        :type rate_limit: bool
+        :param circuit_breaker: Record the outcome with ``circuit_breaker``.
+        :type circuit_breaker: bool
+        :return: The wrapped callable.
+        :rtype: Callable
+        """
+        if rate_limit and self.rate_limit is not None:
+            send = partial(self.rate_limit.call, self.rate_limit.get_key(type(self), self.url), send)
+        if circuit_breaker and self.circuit_breaker is not None:
+            send = partial(self.circuit_breaker.call, self.circuit_breaker.get_key(type(self), self.url), send)
+        return send
+
+    def send(self, kwargs: dict) -> requests.Response:
+        """
+        Make the HTTP request with ``transport``.
+
+        :param kwargs: The kwargs to be supplied to requests, as returned by :py:meth:`.HTTPEater.prepare_request_kwargs`.
+        :type kwargs: dict
+        :return: The response.
+        :rtype: requests.Response
+        :raises EaterError: If the request fails.
+        """
+        with self.translate_errors():
+            start = time.perf_counter()
+            response = self.transport.send(self.session, self.method, self.url, **kwargs)
+            record_response(response, time.perf_counter() - start)
+            return response
+
+    def stream(self, **kwargs) -> Iterator[Model]:
+        """
+        Make a HTTP request of type method, yielding the items of the response as they are received.
+
+        The items are those of the ``ListType(ModelType(...))`` field of ``response_cls`` named by ``stream_field``,
+        each item is validated against the field's model class as it's parsed so memory use is bounded by the size of
+        a single item rather than the whole response.
+
+        The response may either be a JSON object containing the field, a JSON array of items or newline delimited
+        JSON (``application/x-ndjson``). Any other fields of the response are discarded.
+
+        The request is made with :py:meth:`.HTTPEater.dispatch`, so ``hedge``, ``rate_limit``, ``circuit_breaker`` and
+        ``retry`` apply as they do to :py:meth:`.HTTPEater.request`. Timing listeners are notified once the response
+        headers have been received, the items yielded afterwards aren't timed.
+
+        :return: A generator of validated item models.
+        :rtype: Iterator[Model]
+        """
+        field, model_cls = get_stream_field(self.response_cls, self.stream_field)
+        build = partial(self.build_model, model_cls)
+
+        listeners = get_listeners(type(self))
+        with time_call(listeners, self) if listeners else NULL_PHASE:
+            with phase('prepare'):
+                kwargs = self.prepare_request_kwargs(stream=True, **kwargs)
+            response = self.dispatch(kwargs)
+
+        with closing(response), self.translate_errors():
+            self.check_response_status(response)
+            content_type = response.headers.get('content-type', '').split(';')[0].strip()
+
+            if content_type == 'application/x-ndjson':
+                items = iter_ndjson(response.iter_lines(), self.json_codec.loads)
+                yield from validate_items(items, build)
+
+            elif content_type == 'application/json':
+                items = iter_json_array(response.iter_content(self.stream_chunk_size), field, self.json_codec.loads)
+                yield from validate_items(items, build, field)
+
+            else:
+                raise NotImplementedError("Content type '%s' can't be streamed." % response.headers.get('content-type'))
+
+    def prepare_request_kwargs(self, **kwargs) -> dict:
+        """
+        Retrieve the kwargs from :py:meth:`.HTTPEater.get_request_kwargs`, applying any changes it makes to the url,
+        method and session.
+
+        A ``json`` kwarg is encoded as ``request_content_type`` and supplied as ``data``, compressed if
+        ``request_encoding`` is set, and an ``Accept`` header is added if ``accept`` is set.
+
+        :return: A dict of kwargs to be supplied to requests when making a HTTP call.
+        :rtype: dict
+        """
         kwargs = self.get_request_kwargs(request_model=self.request_model, **kwargs)
 
         # get_request_kwargs can permanently alter the url, method and session
@@ -90,9 +465,125 @@ class HTTPEater(BaseEater):
         self.method = kwargs.pop('method', self.method)
         self.session = kwargs.pop('session', self.session)
 
+        if kwargs.get('json') is not None or self.accept:
+            headers = kwargs['headers'] = requests.structures.CaseInsensitiveDict(kwargs.get('headers') or {})
+
+            if kwargs.get('json') is not None:
+                # Encode the body rather than leaving it to requests
+                content_type = headers.setdefault('Content-Type', self.request_content_type)
+                codec = self.get_media_codec(parse_media_type(content_type))
+                if codec is None:
+                    raise NotImplementedError("Content type '%s' can't be encoded." % content_type)
+                kwargs['data'] = codec.dumps(kwargs.pop('json'))
+
+                if self.request_encoding is not None and 'Content-Encoding' not in headers and \
+                        len(kwargs['data']) >= self.request_compression_threshold:
+                    kwargs['data'] = compress(kwargs['data'], self.request_encoding, self.request_compression_level)
+                    headers['Content-Encoding'] = self.request_encoding
+
+            if self.accept:
+                headers.setdefault('Accept', format_accept(self.accept))
+
+        return kwargs
+
+    def get_request_key(self, kwargs: dict) -> Union[Hashable, None]:
+        """
+        Build a key identifying the request from everything that can change its response model - the method, formatted
+        URL and request model, the auth and headers of the session, the kwargs supplied to requests, ``response_cls``
+        and ``validation``.
+
+        Used to key the cache and to coalesce identical requests.
+
+        :param kwargs: The kwargs to be supplied to requests, as returned by :py:meth:`.HTTPEater.prepare_request_kwargs`.
+        :type kwargs: dict
+        :return: A hashable key, or ``None`` if the request can't be keyed - for instance if it uploads a file or its
+                 auth object can't be keyed by its value - in which case it mustn't be cached or coalesced.
+        :rtype: Hashable|None
+        """
+        session_auth, session_headers = self.get_session_options()
+        auth = kwargs.get('auth') or session_auth
+        auth_key = get_auth_key(auth)
+        if auth_key is None and auth is not None:
+            return None
+
+        # Request headers are merged over the session's, as requests does
+        headers = {str(name).lower(): value for name, value in (session_headers or {}).items()}
+        headers.update((str(name).lower(), value) for name, value in (kwargs.get('headers') or {}).items())
+
+        body = None
+        if self.request_model is not None:
+            body = json.dumps(self.request_model.to_primitive(), sort_keys=True, default=str)
+
         try:
-            response = getattr(self.session, self.method)(self.url, **kwargs)
-            return self.create_response_model(response, self.request_model)
+            return (
+                self.method.lower(), self.url, body, auth_key, freeze(headers),
+                freeze({name: value for name, value in kwargs.items() if name not in UNKEYED_KWARGS}),
+                self.response_cls, self.validation,
+            )
+        except TypeError:
+            return None
+
+    def get_session_options(self) -> tuple:
+        """
+        Retrieve the auth and headers the request is made with, besides those of its kwargs.
+
+        :return: A tuple of the ``auth`` and ``headers`` of ``session``.
+        :rtype: tuple
+        """
+        return self.session.auth, self.session.headers
+
+    def get_cache_entry(self, kwargs: dict) -> tuple:
+        """
+        Look up the cached response to the request about to be made.
+
+        If the entry is stale conditional headers are added to ``kwargs`` so that it can be revalidated.
+
+        :param kwargs: The kwargs to be supplied to requests, as returned by :py:meth:`.HTTPEater.prepare_request_kwargs`.
+        :type kwargs: dict
+        :return: A tuple of the cache key and :py:class:`eater.api.cache.CacheEntry`, either of which may be ``None``.
+                 The key is ``None`` if the request isn't cached.
+        :rtype: tuple
+        """
+        if self.cache is None or self.method.lower() not in self.cache.methods:
+            return None, None
+
+        key = self.get_request_key(kwargs)
+        if key is None:
+            return None, None
+        entry = self.cache.get(key)
+        if entry is not None and not entry.fresh:
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **entry.get_conditional_headers())
+        return key, entry
+
+    def process_response(self, response: requests.Response, cache_key=None, cache_entry: CacheEntry=None) -> Model:
+        """
+        Create the response model for ``response``, either from the cache or by calling
+        :py:meth:`.HTTPEater.create_response_model`.
+
+        :param response: A requests.Response object representing the response from the API.
+        :type response: requests.Response
+        :param cache_key: The cache key of the request, as returned by :py:meth:`.HTTPEater.get_cache_entry`.
+        :type cache_key: Hashable|None
+        :param cache_entry: The stale cache entry that was revalidated, if any.
+        :type cache_entry: eater.api.cache.CacheEntry|None
+        :return: The response model.
+        :rtype: schematics.Model
+        """
+        if cache_entry is not None and response.status_code == 304:
+            return self.cache.revalidate(cache_key, cache_entry, response)
+
+        model = self.create_response_model(response, self.request_model)
+        if cache_key is not None:
+            self.cache.store(cache_key, response, model)
+        return model
+
+    @contextmanager
+    def translate_errors(self):
+        """
+        Translate exceptions raised by requests into :py:class:`eater.errors.EaterError`.
+        """
+        try:
+            yield
 
         except requests.Timeout:
             raise EaterTimeoutError("%s.%s for URL '%s' timed out." % (
@@ -104,14 +595,12 @@ class HTTPEater(BaseEater):
         except requests.RequestException as exc_info:
             raise EaterConnectError("Exception raised for URL '%s'." % self.url) from exc_info
 
-    def create_response_model(self, response: requests.Response, request_model: Model) -> Model:  # pylint: disable=unused-argument
+    def check_response_status(self, response: requests.Response):  # pylint: disable=no-self-use
         """
-        Given a requests Response object, return the response model.
+        Raise :py:class:`eater.errors.EaterUnexpectedError` if the response has an error status.
 
         :param response: A requests.Response object representing the response from the API.
         :type response: requests.Response
-        :param request_model: The model used to generate the request - an instance of ``request_cls``.
-        :type request_model: schematics.Model
         """
         if response.status_code >= 400:
             raise EaterUnexpectedError("Received unexpected HTTP response '%s %s' for URL '%s'." % (
@@ -120,16 +609,142 @@ class HTTPEater(BaseEater):
                 response.url,
             ))
 
-        if response.headers['content-type'] == 'application/json':
-            raw_data = response.json()
-            return self.response_cls(raw_data=raw_data, validate=True, partial=False)
+    def create_response_model(self, response: requests.Response, request_model: Model) -> Model:  # pylint: disable=unused-argument
+        """
+        Given a requests Response object, return the response model.
+
+        If ``memo`` is set and a byte-identical body was seen before the model built from it is returned instead.
 
-        raise NotImplementedError(
-            "Content type '%s' is not implemented. Class %s should implement a handle_response method." % (
-                response.headers['content-type'],
-                type(self),
+        :param response: A requests.Response object representing the response from the API.
+        :type response: requests.Response
+        :param request_model: The model used to generate the request - an instance of ``request_cls``.
+        :type request_model: schematics.Model
+        """
+        self.check_response_status(response)
+
+        if self.memo is None:
+            return self.build_response_model(response)
+
+        key = self.memo.get_key(self.response_cls, self.validation, response)
+        model = self.memo.get(key)
+        if model is None:
+            model = self.build_response_model(response)
+            self.memo.store(key, model)
+        return model
+
+    def build_response_model(self, response: requests.Response) -> Model:
+        """
+        Decode ``response`` and build the response model from it, in the ``offload`` process pool if it accepts the
+        response.
+
+        :param response: A requests.Response object representing the response from the API.
+        :type response: requests.Response
+        :return: A validated instance of ``response_cls``.
+        :rtype: schematics.Model
+        """
+        if self.offload is not None and self.offload.accepts(response.content, self.response_cls, self.validation):
+            return self.offload_response(response)
+
+        with phase('decode'):
+            raw_data = self.decode_response(response)
+        with phase('validate'):
+            return self.build_model(self.response_cls, raw_data)
+
+    def get_media_codec(self, media_type: str) -> Union[Codec, None]:
+        """
+        Retrieve the codec for ``media_type``, ``json_codec`` for JSON otherwise the codec registered with
+        :py:func:`eater.api.codecs.register_media_codec`.
+
+        :param media_type: A media type, without parameters.
+        :type media_type: str
+        :return: The codec or ``None`` if there isn't one.
+        :rtype: Codec|None
+        """
+        if is_json(media_type):
+            return self.json_codec
+        return get_media_codec(media_type)
+
+    def get_response_codec(self, response: requests.Response) -> Codec:
+        """
+        Retrieve the codec for the ``Content-Type`` of ``response``.
+
+        :param response: A requests.Response object representing the response from the API.
+        :type response: requests.Response
+        :return: The codec.
+        :rtype: Codec
+        :raises NotImplementedError: If there's no codec for the content type.
+        """
+        content_type = response.headers.get('content-type', '')
+        codec = self.get_media_codec(parse_media_type(content_type))
+        if codec is None:
+            raise NotImplementedError(
+                "Content type '%s' is not implemented. Class %s should implement a handle_response method." % (
+                    content_type,
+                    type(self),
+                )
+            )
+        return codec
+
+    @contextmanager
+    def translate_decode_errors(self, response: requests.Response):  # pylint: disable=no-self-use
+        """
+        Translate a ``ValueError`` raised while decoding ``response`` into an ``EaterUnexpectedResponseError``.
+        """
+        try:
+            yield
+        except ValueError as exc_info:
+            raise EaterUnexpectedResponseError("Unable to decode '%s' response from URL '%s'." % (
+                response.headers.get('content-type', ''),
+                response.url,
+            )) from exc_info
+
+    def decode_response(self, response: requests.Response):
+        """
+        Decode the body of ``response`` with the codec for its ``Content-Type``, as it's read if the body is streamed.
+
+        :param response: A requests.Response object representing the response from the API.
+        :type response: requests.Response
+        :return: The decoded body.
+        :raises NotImplementedError: If there's no codec for the content type.
+        :raises EaterUnexpectedResponseError: If the body can't be decoded.
+        """
+        codec = self.get_response_codec(response)
+        with self.translate_decode_errors(response):
+            if response._content_consumed:  # pylint: disable=protected-access
+                return codec.loads(response.content)
+            return codec.load(ChunkReader(response.iter_content(self.stream_chunk_size)))
+
+    def offload_response(self, response: requests.Response) -> Model:
+        """
+        Decode ``response`` and build the response model from it in the ``offload`` process pool.
+
+        :param response: A requests.Response object representing the response from the API.
+        :type response: requests.Response
+        :return: A validated instance of ``response_cls``.
+        :rtype: schematics.Model
+        :raises NotImplementedError: If there's no codec for the content type.
+        :raises EaterUnexpectedResponseError: If the body can't be decoded.
+        :raises DataError: If the response is invalid.
+        """
+        codec = self.get_response_codec(response)
+        with phase('offload'), self.translate_decode_errors(response):
+            return self.offload.build(
+                self.response_cls, response.content, codec, self.validation, self.compiled_validation
             )
-        )
+
+    def build_model(self, model_cls: type, raw_data: dict) -> Model:
+        """
+        Create an instance of ``model_cls`` from ``raw_data``, validating it according to ``validation``.
+
+        :param model_cls: The schematics model class, ``response_cls`` or the class of a streamed item.
+        :type model_cls: type
+        :param raw_data: The decoded data.
+        :type raw_data: dict
+        :return: A validated instance of ``model_cls``.
+        :rtype: schematics.Model
+        :raises DataError: If ``raw_data`` is invalid.
+        """
+        return self.validation.build(model_cls, raw_data, self.compiled_validation)
 
     def create_request_model(self, request_model: Model=None, **kwargs) -> Model:
         """
@@ -170,15 +785,32 @@ class HTTPEater(BaseEater):
         """
         Create and return an instance of a requests Session.
 
+        Unless ``pool_sessions`` is ``False`` the session is retrieved from ``session_registry`` and shared with every
+        other eater talking to the same scheme and host with the same auth and headers, otherwise a new session is
+        created by ``session_registry``.
+
+        :param session: An existing session to use rather than creating one.
+        :type session: requests.Session|None
         :param auth: The ``auth`` kwarg when to supply when instantiating ``requests.Session``.
-        :type auth: tupel|None
+        :type auth: tuple|None
         :param headers: A dict of headers to be supplied as the ``headers`` kwarg when instantiating ``requests.Session``.
         :type headers: requests.structures.CaseInsensitiveDict
         :return: An instance of ``requests.Session``
         :rtype: requests.Session
         """
         if session is None:
-            session = requests.Session()
+            if self.pool_sessions:
+                return self.session_registry.get_session(
+                    self.url,
+                    auth=auth,
+                    headers=headers,
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                )
+            session = self.session_registry.create_session(
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+            )
 
         if auth:
             session.auth = auth
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.lazy
+    ~~~~~~~~~~~~~~
+
+    Lazily converted and validated response models.
+
+    A :py:class:`LazyModel` checks the top level of a response straight away - unexpected and missing required fields
+    are rejected and simple fields are converted and validated - but compound fields (``ModelType``, ``ListType``,
+    ``DictType``...) are only converted and validated the first time they're accessed.
+"""
+from typing import Callable, Union
+
+from schematics import Model
+from schematics.exceptions import BaseError, DataError
+from schematics.types import BaseType
+from schematics.types.compound import CompoundType
+
+from eater.api.compiled import CompiledModel, Fallback, compile_model
+
+__all__ = ['LazyModel', 'build_lazy']
+
+
+def build_lazy(model_cls: type, raw_data: dict, compiled: bool=False) -> Union['LazyModel', Model]:
+    """
+    Create a :py:class:`LazyModel` of ``model_cls`` from ``raw_data``.
+
+    Models with model level validators (``validate_<field>`` methods) or fields with setters need every field up
+    front, so a fully validated instance of ``model_cls`` is returned for them instead.
+
+    :param model_cls: The schematics model class.
+    :type model_cls: type
+    :param raw_data: The decoded data.
+    :type raw_data: dict
+    :param compiled: Convert fields with a compiled version of ``model_cls``, see :py:mod:`eater.api.compiled`.
+    :type compiled: bool
+    :return: A :py:class:`LazyModel` or an instance of ``model_cls``.
+    :rtype: LazyModel|schematics.Model
+    :raises DataError: If the top level of ``raw_data`` is invalid.
+    """
+    compiled_model = compile_model(model_cls)
+    if compiled_model.fields is not None and type(raw_data) is dict:  # pylint: disable=unidiomatic-typecheck
+        try:
+            return LazyModel(compiled_model, raw_data, compiled)
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    # Let schematics raise the error it would for the whole model
+    if compiled:
+        return compiled_model(raw_data)
+    return model_cls(raw_data=raw_data, validate=True, partial=False)
+
+
+def convert_field(context, name: str, field: BaseType, convert: Callable, value):
+    """
+    Convert and validate ``value`` of the field ``name``, with the compiled ``convert`` function if there is one.
+
+    :raises DataError: If ``value`` is invalid.
+    """
+    if convert is not None:
+        try:
+            return convert(value)
+        except Exception:  # pylint: disable=broad-except
+            pass
+    try:
+        return field.validate(value, context)
+    except BaseError as exc_info:
+        raise DataError({name: exc_info}) from exc_info
+
+
+class LazyModel:
+    """
+    A proxy for an instance of a schematics model that converts and validates compound fields on first access.
+
+    Fields are read as usual, ``model.books``, and the converted value is kept for subsequent reads. An invalid field
+    raises a ``DataError`` when it's read, call :py:meth:`validate_all` for the guarantee a fully validated model
+    gives. Anything other than reading or setting a field - ``to_primitive()``, comparison, iteration... - validates
+    the whole model first and is then handled by the real model.
+    """
+
+    __slots__ = ('_compiled_model', '_values', '_pending', '_model')
+
+    def __init__(self, compiled_model: CompiledModel, raw_data: dict, compiled: bool=False):
+        """
+        :param compiled_model: The compiled model class.
+        :type compiled_model: CompiledModel
+        :param raw_data: The decoded data.
+        :type raw_data: dict
+        :param compiled: Use the compiled converter for each field before falling back to schematics.
+        :type compiled: bool
+        :raises Exception: If the top level of ``raw_data`` isn't valid, the caller should hand ``raw_data`` to
+                           schematics to find out why.
+        """
+        values = {}
+        pending = {}
+        for name, convert, field, value in compiled_model.iter_values(raw_data):
+            if not compiled:
+                convert = None
+
+            if value is None:
+                if field.required:
+                    raise Fallback()
+            elif isinstance(field, CompoundType):
+                pending[name] = (field, convert, value)
+                continue
+            else:
+                value = convert_field(compiled_model.context, name, field, convert, value)
+
+            values[name] = value
+
+        object.__setattr__(self, '_compiled_model', compiled_model)
+        object.__setattr__(self, '_values', values)
+        object.__setattr__(self, '_pending', pending)
+        object.__setattr__(self, '_model', None)
+
+    def _load(self, name: str):
+        """
+        Convert and validate the pending field ``name``, keeping the result.
+
+        Several threads may load the same field at once, the value kept first is returned to all of them.
+        """
+        pending = self._pending.get(name)
+        if pending is None:
+            # Loaded by another thread, which stores the value before removing it from pending
+            return self._values[name]
+        value = self._values.setdefault(name, convert_field(self._compiled_model.context, name, *pending))
+        self._pending.pop(name, None)
+        return value
+
+    def validate_all(self) -> Model:
+        """
+        Convert and validate every pending field, returning the fully validated instance of the model.
+
+        Fields already read keep their value, so they're the same objects the model holds.
+
+        :return: An instance of the model class.
+        :rtype: schematics.Model
+        :raises DataError: Listing every invalid field.
+        """
+        if self._model is None:
+            errors = {}
+            for name in list(self._pending):
+                try:
+                    self._load(name)
+                except DataError as exc_info:
+                    errors.update(exc_info.errors)
+            if errors:
+                raise DataError(errors)
+            model = self._compiled_model.model_cls(trusted_data=self._values, init=False)
+            if self._model is None:
+                object.__setattr__(self, '_model', model)
+        return self._model
+
+    def __getattr__(self, name: str):
+        if name in LazyModel.__slots__:
+            # Not yet initialised, for instance while being copied
+            raise AttributeError(name)
+        if self._model is not None:
+            return getattr(self._model, name)
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        if name in self._pending or name in self._values:
+            return self._load(name)
+        return getattr(self.validate_all(), name)
+
+    def __setattr__(self, name: str, value):
+        if self._model is None and (name in self._values or name in self._pending):
+            self._values[name] = value
+            self._pending.pop(name, None)
+        else:
+            setattr(self.validate_all(), name, value)
+
+    def __getitem__(self, name: str):
+        if self._model is None and (name in self._values or name in self._pending):
+            return getattr(self, name)
+        return self.validate_all()[name]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyModel):
+            other = other.validate_all()
+        return self.validate_all() == other
+
+    __hash__ = None
+
+    def __iter__(self):
+        return iter(self.validate_all())
+
+    def __len__(self) -> int:
+        return len(self.validate_all())
+
+    def __contains__(self, name) -> bool:
+        return name in self.validate_all()
+
+    def __repr__(self):
+        return '<LazyModel %s instance>' % self._compiled_model.model_cls.__name__
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.loader
+    ~~~~~~~~~~~~~~~~
+
+    Automatically batch many small calls into one call to a bulk API.
+
+    Calls made at about the same time are collected, for at most ``window`` seconds or until ``max_batch_size``
+    calls have been collected, and made as a single call to a bulk API. The items of its response are then handed back
+    to the individual callers, in the manner of Facebook's DataLoader.
+"""
+import asyncio
+import threading
+from typing import Callable, Hashable, Union
+
+from schematics import Model
+from schematics.types import ListType, ModelType
+
+from eater.errors import EaterUnexpectedResponseError
+
+__all__ = ['BatchLoader']
+
+
+class Batch:
+    """
+    The calls collected for a single call to the bulk API.
+    """
+
+    __slots__ = ('keys', 'request_models', 'full', 'done', 'task', 'results', 'error')
+
+    def __init__(self):
+        #: The index of each key in ``request_models``.
+        self.keys = {}
+        self.request_models = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.task = None
+        self.results = None
+        self.error = None
+
+
+class BatchLoader:
+    """
+    Collect concurrent calls to an API and make them as a single call to ``batch_cls``, a bulk version of the API.
+
+    The kwargs ``batch_cls`` is created with are built by ``batch_kwargs`` from the request models of the calls. Each
+    caller then receives the item of the ``items_field`` of the validated bulk response whose ``response_key`` equals
+    the ``request_key`` of its request model. Calls with the same ``request_key`` share an item, and if the bulk call
+    fails every caller receives its exception.
+
+    Subclass and override :py:meth:`.BatchLoader.get_batch_kwargs` or :py:meth:`.BatchLoader.split` for bulk APIs
+    that don't fit this mould.
+    """
+
+    def __init__(self, batch_cls: type, batch_kwargs: Callable[[list], dict], request_key: Callable[[Model], Hashable],
+                 response_key: Callable[[Model], Hashable], items_field: str=None, max_batch_size: int=100,
+                 window: float=0.005):
+        """
+        :param batch_cls: The bulk API, a subclass of :py:class:`eater.HTTPEater` or, to batch the calls of an
+                          :py:class:`eater.AsyncHTTPEater`, a subclass of :py:class:`eater.AsyncHTTPEater`.
+        :type batch_cls: type
+        :param batch_kwargs: A callable receiving the list of request models and returning the kwargs ``batch_cls`` is
+                             created with, for instance ``lambda models: {'ids': [model.id for model in models]}``.
+        :type batch_kwargs: Callable
+        :param request_key: A callable returning the key of a request model, for instance
+                            ``lambda model: model.id``.
+        :type request_key: Callable
+        :param response_key: A callable returning the key of an item of the bulk response.
+        :type response_key: Callable
+        :param items_field: The name of the ``ListType(ModelType(...))`` field of ``batch_cls.response_cls`` holding the
+                            items, if ``None`` it must have exactly one such field.
+        :type items_field: str|None
+        :param max_batch_size: The maximum number of calls in a batch, once reached the batch is called immediately.
+        :type max_batch_size: int
+        :param window: The maximum number of seconds the first call of a batch waits for others to join it.
+        :type window: float
+        """
+        self.batch_cls = batch_cls
+        self.batch_kwargs = batch_kwargs
+        self.request_key = request_key
+        self.response_key = response_key
+        self.items_field = items_field
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._lock = threading.Lock()
+        self._batch = None
+        self._abatches = {}
+        #: The number of calls made to ``batch_cls``.
+        self.batches = 0
+        #: The number of calls batched.
+        self.loaded = 0
+
+    def get_batch_kwargs(self, request_models: list) -> dict:
+        """
+        Build the kwargs ``batch_cls`` is created with.
+
+        :param request_models: The distinct request models of the batch.
+        :type request_models: list
+        :return: A dict of kwargs.
+        :rtype: dict
+        """
+        return self.batch_kwargs(request_models)
+
+    def split(self, response: Model, request_models: list) -> list:
+        """
+        Split the response of ``batch_cls`` into the results of the individual calls.
+
+        :param response: The validated response model of ``batch_cls``.
+        :type response: schematics.Model
+        :param request_models: The distinct request models of the batch.
+        :type request_models: list
+        :return: A list of the item for each of ``request_models``, ``None`` for those without one.
+        :rtype: list
+        """
+        items = {self.response_key(item): item for item in response[get_items_field(type(response), self.items_field)]}
+        return [items.get(self.request_key(request_model)) for request_model in request_models]
+
+    def load(self, request_model: Model) -> Model:
+        """
+        Add a call to the current batch and wait for its result.
+
+        The first call of a batch waits up to ``window`` seconds for other calls to join it (or for ``max_batch_size``
+        calls to join it) and then makes the call to ``batch_cls``, in its own thread.
+
+        :param request_model: The request model of the call.
+        :type request_model: schematics.Model
+        :return: The item of the bulk response for ``request_model``.
+        :rtype: schematics.Model
+        :raises EaterUnexpectedResponseError: If the bulk response has no item for ``request_model``.
+        """
+        key = self.request_key(request_model)
+        with self._lock:
+            leader = self._batch is None
+            if leader:
+                self._batch = Batch()
+            batch = self._batch
+            index = self.add(batch, key, request_model)
+            if len(batch.request_models) >= self.max_batch_size:
+                self._batch = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._batch is batch:
+                    self._batch = None
+            try:
+                batch.results = self.call(batch.request_models)
+            except BaseException as exc_info:  # pylint: disable=broad-except
+                batch.error = exc_info
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+
+        return self.get_result(batch, index, request_model)
+
+    async def aload(self, request_model: Model) -> Model:
+        """
+        Identical to :py:meth:`.BatchLoader.load` except that calls are batched per event loop and ``batch_cls``, an
+        :py:class:`eater.AsyncHTTPEater`, is awaited.
+
+        The call to ``batch_cls`` is shared, cancelling a caller doesn't cancel it.
+        """
+        loop = asyncio.get_running_loop()
+        key = self.request_key(request_model)
+        batch = self._abatches.get(loop)
+        if batch is None:
+            batch = self._abatches[loop] = Batch()
+            batch.full = asyncio.Event()
+            batch.task = asyncio.ensure_future(self.acall_batch(loop, batch))
+        index = self.add(batch, key, request_model)
+        if len(batch.request_models) >= self.max_batch_size:
+            del self._abatches[loop]
+            batch.full.set()
+
+        await asyncio.shield(batch.task)
+        return self.get_result(batch, index, request_model)
+
+    def add(self, batch: Batch, key: Hashable, request_model: Model) -> int:
+        """
+        Add ``request_model`` to ``batch``, unless a request model with the same key already has been.
+
+        :return: The index of the result for ``request_model``.
+        :rtype: int
+        """
+        self.loaded += 1
+        index = batch.keys.get(key)
+        if index is None:
+            index = batch.keys[key] = len(batch.request_models)
+            batch.request_models.append(request_model)
+        return index
+
+    def call(self, request_models: list) -> list:
+        """
+        Call ``batch_cls`` with ``request_models`` and split its response.
+        """
+        self.batches += 1
+        return self.split(self.batch_cls(**self.get_batch_kwargs(request_models))(), request_models)
+
+    async def acall(self, request_models: list) -> list:
+        """
+        Identical to :py:meth:`.BatchLoader.call` except that ``batch_cls`` is awaited.
+        """
+        self.batches += 1
+        return self.split(await self.batch_cls(**self.get_batch_kwargs(request_models))(), request_models)
+
+    async def acall_batch(self, loop: asyncio.AbstractEventLoop, batch: Batch):
+        """
+        Wait for ``batch`` to fill up or the window to pass, then call ``batch_cls``.
+        """
+        try:
+            await asyncio.wait_for(batch.full.wait(), self.window)
+        except asyncio.TimeoutError:
+            pass
+        if self._abatches.get(loop) is batch:
+            del self._abatches[loop]
+        try:
+            batch.results = await self.acall(batch.request_models)
+        except Exception as exc_info:  # pylint: disable=broad-except
+            batch.error = exc_info
+
+    def get_result(self, batch: Batch, index: int, request_model: Model) -> Model:
+        """
+        Retrieve the result of the call with ``request_model`` from ``batch``, once it's done.
+        """
+        if batch.error is not None:
+            raise batch.error
+        result = batch.results[index]
+        if result is None:
+            raise EaterUnexpectedResponseError("The response of %s has no item for %s." % (
+                self.batch_cls.__name__, request_model.to_primitive()
+            ))
+        return result
+
+
+def get_items_field(model_cls: type, name: Union[str, None]) -> str:
+    """
+    Find the name of the ``ListType(ModelType(...))`` field of ``model_cls`` holding the items of a bulk response.
+
+    :param model_cls: The response model class of the bulk API.
+    :type model_cls: type
+    :param name: The name of the field, if ``None`` ``model_cls`` must have exactly one such field.
+    :type name: str|None
+    :return: The name of the field.
+    :rtype: str
+    """
+    if name is not None:
+        return name
+    fields = [
+        field_name for field_name, field in model_cls.fields.items()
+        if isinstance(field, ListType) and isinstance(field.field, ModelType)
+    ]
+    if len(fields) != 1:
+        raise TypeError("Class %s must define exactly one ListType(ModelType(...)) field to be batched, set "
+                        "items_field to choose one." % model_cls.__name__)
+    return fields[0]
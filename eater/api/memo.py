@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.memo
+    ~~~~~~~~~~~~~~
+
+    Memoize validated response models by the content of the response body.
+
+    Polling endpoints often return byte-identical bodies call after call. Rather than decoding and validating the same
+    body again the model built from it last time is returned.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Hashable, Union
+
+import requests
+from schematics import Model
+
+from eater.api.codecs import parse_media_type
+from eater.api.offload import dump, is_restorable, restore
+from eater.api.validation import ValidationPolicy
+
+__all__ = ['ModelMemo']
+
+
+class ModelMemo:
+    """
+    A thread safe, size bounded LRU memo of validated response models, keyed by a hash of the response body.
+
+    Entries are also keyed by the response class, validation policy and media type, so eaters can share a memo. Unless
+    ``copy`` is ``True`` the same model instance is returned to every caller and should be treated as read only.
+    """
+
+    def __init__(self, maxsize: int=128, copy: bool=False):
+        """
+        :param maxsize: The maximum number of entries, once reached the least recently used entry is evicted.
+        :type maxsize: int
+        :param copy: Return a copy of the memoized model, rebuilt from its native data without validating it again.
+                     Only instances of models whose compound fields are ``ModelType``, ``ListType`` or ``DictType``
+                     are memoized.
+        :type copy: bool
+        """
+        self.maxsize = maxsize
+        self.copy = copy
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        #: The number of models returned from the memo.
+        self.hits = 0
+        #: The number of lookups that found no entry.
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_key(self, model_cls: type, validation: ValidationPolicy,  # pylint: disable=no-self-use
+                response: requests.Response) -> Hashable:
+        """
+        Build the key of the model of ``model_cls`` built from ``response``.
+
+        :param model_cls: The response model class.
+        :type model_cls: type
+        :param validation: The validation policy the model is built with.
+        :type validation: ValidationPolicy
+        :param response: The response.
+        :type response: requests.Response
+        :return: A hashable key.
+        :rtype: Hashable
+        """
+        return (
+            model_cls,
+            validation,
+            parse_media_type(response.headers.get('content-type', '')),
+            hashlib.blake2b(response.content, digest_size=16).digest(),
+        )
+
+    def get(self, key: Hashable) -> Union[Model, None]:
+        """
+        Retrieve the model memoized for ``key``.
+
+        :return: The model, or a copy of it, or ``None``.
+        :rtype: schematics.Model|None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        if self.copy:
+            return restore(key[0], entry)
+        return entry
+
+    def store(self, key: Hashable, model: Model):
+        """
+        Memoize ``model`` for ``key``.
+        """
+        if self.copy:
+            if not isinstance(model, Model) or not is_restorable(type(model)):
+                return
+            entry = dump(model)
+        else:
+            entry = model
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove every entry.
+        """
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.offload
+    ~~~~~~~~~~~~~~~~~
+
+    Decode and validate huge responses in a process pool, so they don't hold the GIL in the calling process.
+
+    The body of the response is copied once into shared memory rather than pickled to the worker. The worker decodes
+    and validates it and sends back either the native data of the model or the errors of the ``DataError``, because
+    neither schematics models nor ``DataError`` can be pickled. The model is then rebuilt from the already validated
+    data without converting or validating it again.
+
+    Shared memory requires Python 3.8, it's imported where it's used so the rest of eater still runs on Python 3.7.
+"""
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from schematics import Model
+from schematics.exceptions import DataError
+from schematics.types import BaseType, DictType, ListType, ModelType
+from schematics.types.compound import CompoundType
+
+from eater.api.codecs import Codec
+from eater.api.compiled import get_schema
+from eater.api.validation import ValidationPolicy, get_validation_policy
+
+__all__ = ['ProcessOffload']
+
+#: The validation policies that can be applied in a worker process, other policies keep state in the calling process.
+POLICIES = ('full', 'types-only')
+
+
+class ProcessOffload:
+    """
+    Decode and validate response bodies of at least ``threshold`` bytes in a pool of ``max_workers`` processes.
+
+    Only the ``'full'`` and ``'types-only'`` validation policies are offloaded, and only response models whose
+    compound fields are ``ModelType``, ``ListType`` or ``DictType`` - anything else is handled in the calling process
+    as usual. Response models must be importable by the worker processes, so they can't be defined in a function.
+    """
+
+    def __init__(self, threshold: int=1024 * 1024, max_workers: int=None, mp_context=None):
+        """
+        :param threshold: The size, in bytes, of the smallest response body to offload.
+        :type threshold: int
+        :param max_workers: The number of worker processes, ``None`` for the number of CPUs.
+        :type max_workers: int|None
+        :param mp_context: The multiprocessing context used to start worker processes, ``None`` for the default.
+        :raises RuntimeError: On Python 3.7, which has no shared memory.
+        """
+        if sys.version_info < (3, 8):
+            raise RuntimeError("ProcessOffload requires Python 3.8 or later, for multiprocessing.shared_memory.")
+        self.threshold = threshold
+        self.max_workers = max_workers
+        self.mp_context = mp_context
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """
+        The process pool, started on first use.
+        """
+        from multiprocessing import resource_tracker  # pylint: disable=import-outside-toplevel
+
+        with self._lock:
+            if self._executor is None:
+                # Workers share the calling process' resource tracker, which only forgets shared memory blocks once
+                # they're unlinked by the calling process
+                resource_tracker.ensure_running()
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context)
+            return self._executor
+
+    def accepts(self, content: bytes, model_cls: type, validation: ValidationPolicy) -> bool:
+        """
+        Decide whether the response body ``content`` is offloaded.
+
+        :param content: The response body.
+        :type content: bytes
+        :param model_cls: The schematics model class.
+        :type model_cls: type
+        :param validation: The validation policy of the eater.
+        :type validation: ValidationPolicy
+        :rtype: bool
+        """
+        return len(content) >= self.threshold and validation.name in POLICIES and is_restorable(model_cls)
+
+    def build(self, model_cls: type, content: bytes, codec: Codec, validation: ValidationPolicy,
+              compiled: bool=False) -> Model:
+        """
+        Decode ``content`` with ``codec`` and create an instance of ``model_cls`` from it in a worker process.
+
+        :param model_cls: The schematics model class.
+        :type model_cls: type
+        :param content: The response body.
+        :type content: bytes
+        :param codec: The codec to decode ``content`` with, it must be picklable.
+        :type codec: Codec
+        :param validation: The validation policy, ``'full'`` or ``'types-only'``.
+        :type validation: ValidationPolicy
+        :param compiled: Use a compiled version of ``model_cls``, see :py:mod:`eater.api.compiled`.
+        :type compiled: bool
+        :return: An instance of ``model_cls``.
+        :rtype: schematics.Model
+        :raises ValueError: If ``content`` can't be decoded.
+        :raises DataError: If the decoded data is invalid.
+        """
+        from multiprocessing.shared_memory import SharedMemory  # pylint: disable=import-outside-toplevel
+
+        size = len(content)
+        memory = SharedMemory(create=True, size=max(size, 1))
+        try:
+            memory.buf[:size] = content
+            valid, result = self.executor.submit(
+                decode_and_build, memory.name, size, codec, model_cls, validation.name, compiled
+            ).result()
+        finally:
+            memory.close()
+            memory.unlink()
+
+        if not valid:
+            raise DataError(result)
+        return restore(model_cls, result)
+
+    def shutdown(self, wait: bool=True):
+        """
+        Stop the worker processes, they're started again if the pool is used afterwards.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+def decode_and_build(name: str, size: int, codec: Codec, model_cls: type, policy: str, compiled: bool) -> tuple:
+    """
+    Decode and validate the response body held in the shared memory block ``name``, in a worker process.
+
+    :return: A tuple of ``(True, data)``, the native data of the model as returned by :py:func:`dump`, or
+             ``(False, errors)``, the errors of the ``DataError`` as primitives.
+    :rtype: tuple
+    """
+    from multiprocessing.shared_memory import SharedMemory  # pylint: disable=import-outside-toplevel
+
+    memory = SharedMemory(name=name)
+    try:
+        content = memory.buf[:size]
+        try:
+            try:
+                raw_data = codec.loads(content)
+            except TypeError:
+                # The codec doesn't accept a buffer
+                raw_data = codec.loads(bytes(content))
+        finally:
+            content.release()
+    finally:
+        memory.close()
+
+    try:
+        model = get_validation_policy(policy).build(model_cls, raw_data, compiled)
+    except DataError as exc_info:
+        return False, exc_info.to_primitive()
+    return True, dump(model)
+
+
+def iter_fields(model_cls: type):
+    """
+    Yield the name and field of every field of ``model_cls``.
+    """
+    for name, field in get_schema(model_cls)[0].items():
+        if isinstance(field, BaseType):
+            yield name, field
+
+
+#: Whether each model class can be rebuilt by :py:func:`restore`.
+_restorable = {}
+
+
+def is_restorable(model_cls: type) -> bool:
+    """
+    Check that every compound field of ``model_cls``, and of the models it holds, can be rebuilt by :py:func:`restore`.
+    """
+    result = _restorable.get(model_cls)
+    if result is None:
+        # Recursive models are assumed to be restorable while they're checked
+        _restorable[model_cls] = True
+        result = _restorable[model_cls] = all(is_field_restorable(field) for _, field in iter_fields(model_cls))
+    return result
+
+
+def is_field_restorable(field: BaseType) -> bool:
+    if isinstance(field, ModelType):
+        return is_restorable(field.model_class)
+    if isinstance(field, (ListType, DictType)):
+        return is_field_restorable(field.field)
+    return not isinstance(field, CompoundType)
+
+
+def dump(model: Model) -> dict:
+    """
+    Convert ``model`` to a dict of native values keyed by field name, with nested models converted too.
+    """
+    return {name: dump_value(field, model[name]) for name, field in iter_fields(type(model))}
+
+
+def dump_value(field: BaseType, value) -> Any:
+    if value is None:
+        return None
+    if isinstance(field, ModelType):
+        return dump(value)
+    if isinstance(field, ListType):
+        return [dump_value(field.field, item) for item in value]
+    if isinstance(field, DictType):
+        return {key: dump_value(field.field, item) for key, item in value.items()}
+    return value
+
+
+def restore(model_cls: type, data: dict) -> Model:
+    """
+    Rebuild an instance of ``model_cls`` from ``data``, as returned by :py:func:`dump`, without converting or
+    validating it.
+    """
+    return model_cls(
+        trusted_data={name: restore_value(field, data.get(name)) for name, field in iter_fields(model_cls)},
+        lazy=True
+    )
+
+
+def restore_value(field: BaseType, value) -> Any:
+    if value is None:
+        return None
+    if isinstance(field, ModelType):
+        return restore(field.model_class, value)
+    if isinstance(field, ListType):
+        return [restore_value(field.field, item) for item in value]
+    if isinstance(field, DictType):
+        return {key: restore_value(field.field, item) for key, item in value.items()}
+    return value
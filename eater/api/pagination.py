@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.pagination
+    ~~~~~~~~~~~~~~~~~~~~
+
+    Iterate over paginated APIs, fetching the next page in the background while the current one is consumed.
+"""
+import copy
+import queue
+import threading
+from collections import namedtuple
+from typing import Iterator, Union
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from schematics import Model
+
+from eater.api.http import HTTPEater
+from eater.api.streaming import get_stream_field
+from eater.api.timing import NULL_PHASE, get_listeners, time_call
+
+__all__ = [
+    'Page', 'Pagination', 'PageNumberPagination', 'OffsetPagination', 'CursorPagination', 'LinkHeaderPagination',
+    'PaginatedHTTPEater'
+]
+
+#: A single page of a paginated API. ``number`` counts pages from zero, ``url`` is the URL the page was retrieved
+#: from, ``response`` is the ``requests.Response``, ``model`` the response model and ``items`` the items of the page.
+Page = namedtuple('Page', ('number', 'url', 'response', 'model', 'items'))
+
+
+def set_query_params(url: str, **params) -> str:
+    """
+    Return ``url`` with the query string parameters ``params`` added or replaced.
+    """
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if name not in params]
+    query.extend((name, str(value)) for name, value in params.items())
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def get_query_param(url: str, name: str, default: str=None) -> str:
+    """
+    Retrieve the (first) value of the query string parameter ``name`` of ``url``.
+    """
+    for param, value in parse_qsl(urlsplit(url).query, keep_blank_values=True):
+        if param == name:
+            return value
+    return default
+
+
+class Pagination:
+    """
+    Base pagination strategy - decide the URL of each page.
+    """
+
+    def get_first_url(self, url: str) -> str:  # pylint: disable=no-self-use
+        """
+        Retrieve the URL of the first page.
+
+        :param url: The URL of the eater.
+        :type url: str
+        :return: The URL of the first page.
+        :rtype: str
+        """
+        return url
+
+    def get_next_url(self, page: Page) -> Union[str, None]:
+        """
+        Retrieve the URL of the page after ``page``.
+
+        :param page: The page just retrieved.
+        :type page: Page
+        :return: The URL of the next page or ``None`` if ``page`` is the last.
+        :rtype: str|None
+        """
+        raise NotImplementedError()
+
+
+class PageNumberPagination(Pagination):
+    """
+    Pages are numbered by the query string parameter ``param``, starting from ``start``.
+
+    The last page is the first to be empty or, if ``size`` is supplied, to have fewer than ``size`` items.
+    """
+
+    def __init__(self, param: str='page', start: int=1, size: int=None, size_param: str=None):
+        """
+        :param param: The query string parameter holding the page number.
+        :type param: str
+        :param start: The number of the first page.
+        :type start: int
+        :param size: The number of items on every page but the last.
+        :type size: int|None
+        :param size_param: The query string parameter used to request ``size`` items per page.
+        :type size_param: str|None
+        """
+        self.param = param
+        self.start = start
+        self.size = size
+        self.size_param = size_param
+
+    def get_first_url(self, url: str) -> str:
+        params = {self.param: self.start}
+        if self.size_param is not None and self.size is not None:
+            params[self.size_param] = self.size
+        return set_query_params(url, **params)
+
+    def get_next_url(self, page: Page) -> Union[str, None]:
+        if not page.items or (self.size is not None and len(page.items) < self.size):
+            return None
+        return set_query_params(page.url, **{self.param: self.start + page.number + 1})
+
+
+class OffsetPagination(Pagination):
+    """
+    Pages are selected with ``offset`` and ``limit`` query string parameters.
+
+    The last page is the first to have fewer than ``limit`` items.
+    """
+
+    def __init__(self, limit: int=100, offset_param: str='offset', limit_param: str='limit'):
+        """
+        :param limit: The number of items requested per page.
+        :type limit: int
+        :param offset_param: The query string parameter holding the index of the first item of the page.
+        :type offset_param: str
+        :param limit_param: The query string parameter holding the number of items requested.
+        :type limit_param: str
+        """
+        self.limit = limit
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+
+    def get_first_url(self, url: str) -> str:
+        return set_query_params(url, **{self.offset_param: 0, self.limit_param: self.limit})
+
+    def get_next_url(self, page: Page) -> Union[str, None]:
+        if len(page.items) < self.limit:
+            return None
+        offset = int(get_query_param(page.url, self.offset_param, 0)) + len(page.items)
+        return set_query_params(page.url, **{self.offset_param: offset})
+
+
+class CursorPagination(Pagination):
+    """
+    Each page holds an opaque cursor, in the field ``field`` of the response model, which is supplied as the query
+    string parameter ``param`` to retrieve the next page. The last page has no cursor.
+    """
+
+    def __init__(self, field: str='next_cursor', param: str='cursor'):
+        """
+        :param field: The name of the field of ``response_cls`` holding the cursor, nested fields are separated by
+                      dots, for instance ``'meta.next'``.
+        :type field: str
+        :param param: The query string parameter the cursor is supplied as.
+        :type param: str
+        """
+        self.field = field
+        self.param = param
+
+    def get_next_url(self, page: Page) -> Union[str, None]:
+        cursor = page.model
+        for name in self.field.split('.'):
+            cursor = getattr(cursor, name, None)
+        if not cursor:
+            return None
+        return set_query_params(page.url, **{self.param: cursor})
+
+
+class LinkHeaderPagination(Pagination):
+    """
+    Each page links to the next with a ``Link`` header (`RFC 8288`_), as used by GitHub amongst others. The last page
+    has no such link.
+
+    .. _RFC 8288: https://tools.ietf.org/html/rfc8288
+    """
+
+    def __init__(self, rel: str='next'):
+        """
+        :param rel: The relation of the link to the next page.
+        :type rel: str
+        """
+        self.rel = rel
+
+    def get_next_url(self, page: Page) -> Union[str, None]:
+        url = page.response.links.get(self.rel, {}).get('url')
+        if not url:
+            return None
+        return urljoin(page.url, url)
+
+
+class PaginatedHTTPEater(HTTPEater):
+    """
+    An :py:class:`eater.HTTPEater` for paginated APIs.
+
+    Iterating over an instance yields the items of every page, see :py:meth:`.PaginatedHTTPEater.items`. While the
+    items of one page are consumed the following ``prefetch`` pages are retrieved in a background thread. Calling an
+    instance retrieves a single page as usual.
+
+    Pages are retrieved with ``circuit_breaker`` and ``retry`` but never from ``cache`` or coalesced with
+    ``single_flight``.
+    """
+
+    #: The :py:class:`Pagination` strategy deciding the URL of each page.
+    pagination = PageNumberPagination()  # type: Pagination
+
+    #: The name of the ``ListType(ModelType(...))`` field of ``response_cls`` holding the items of each page, if
+    #: ``None`` ``response_cls`` must have exactly one such field.
+    items_field = None
+
+    #: The number of pages to retrieve ahead of the page being consumed, ``0`` to only retrieve a page once it's
+    #: needed.
+    prefetch = 1
+
+    #: The maximum number of pages to retrieve, ``None`` for no limit.
+    max_pages = None
+
+    def __iter__(self) -> Iterator[Model]:
+        return self.items()
+
+    def items(self, **kwargs) -> Iterator[Model]:
+        """
+        Yield the items of every page.
+
+        :param kwargs: Supplied to :py:meth:`.HTTPEater.get_request_kwargs` as when calling the eater.
+        :return: A generator of item models.
+        :rtype: Iterator[Model]
+        """
+        for page in self.pages(**kwargs):
+            yield from page.items
+
+    def pages(self, **kwargs) -> Iterator[Page]:
+        """
+        Yield every :py:data:`Page`, retrieving the following ``prefetch`` pages in a background thread.
+
+        :param kwargs: Supplied to :py:meth:`.HTTPEater.get_request_kwargs` as when calling the eater.
+        :return: A generator of pages.
+        :rtype: Iterator[Page]
+        """
+        kwargs = self.prepare_request_kwargs(**kwargs)
+        if self.prefetch < 1:
+            yield from self.iter_pages(kwargs)
+            return
+
+        pages = queue.Queue()
+        # The page being consumed and those retrieved ahead of it
+        slots = threading.Semaphore(self.prefetch + 1)
+        stopped = threading.Event()
+
+        def produce():
+            try:
+                remaining = self.iter_pages(kwargs)
+                while not stopped.is_set():
+                    if not slots.acquire(timeout=0.1):
+                        continue
+                    page = next(remaining, None)
+                    pages.put((page, None))
+                    if page is None:
+                        return
+            except BaseException as exc_info:  # pylint: disable=broad-except
+                pages.put((None, exc_info))
+
+        producer = threading.Thread(target=produce, name='%s-prefetch' % type(self).__name__, daemon=True)
+        producer.start()
+        try:
+            while True:
+                page, error = pages.get()
+                if error is not None:
+                    raise error
+                if page is None:
+                    return
+                yield page
+                slots.release()
+        finally:
+            # Stop the producer if the consumer stopped early
+            stopped.set()
+
+    def iter_pages(self, kwargs: dict) -> Iterator[Page]:
+        """
+        Retrieve each page in turn.
+
+        :param kwargs: The kwargs to be supplied to requests, as returned by :py:meth:`.HTTPEater.prepare_request_kwargs`.
+        :type kwargs: dict
+        :return: A generator of pages.
+        :rtype: Iterator[Page]
+        """
+        url = self.pagination.get_first_url(self.url)
+        number = 0
+        while url is not None and (self.max_pages is None or number < self.max_pages):
+            page = self.fetch_page(number, url, kwargs)
+            yield page
+            url = self.pagination.get_next_url(page)
+            number += 1
+
+    def fetch_page(self, number: int, url: str, kwargs: dict) -> Page:
+        """
+        Retrieve the page at ``url``.
+
+        :param number: The number of the page, counting from zero.
+        :type number: int
+        :param url: The URL of the page.
+        :type url: str
+        :param kwargs: The kwargs to be supplied to requests.
+        :type kwargs: dict
+        :return: The page.
+        :rtype: Page
+        """
+        # Pages may be retrieved in another thread, so each is retrieved by a copy of the eater with its own url
+        eater = copy.copy(self)
+        eater.url = url
+
+        listeners = get_listeners(type(self))
+        with time_call(listeners, eater) if listeners else NULL_PHASE:
+            response = eater.dispatch(kwargs)
+            with eater.translate_errors():
+                model = eater.create_response_model(response, eater.request_model)
+
+        return Page(number, url, response, model, self.get_items(model))
+
+    def get_items(self, model: Model) -> list:
+        """
+        Retrieve the items of the page ``model``.
+
+        :param model: The response model of a page.
+        :type model: Model
+        :return: The items of the page.
+        :rtype: list
+        """
+        name, _ = get_stream_field(self.response_cls, self.items_field)
+        for field_name, field in self.response_cls.fields.items():
+            if (field.serialized_name or field_name) == name:
+                return getattr(model, field_name) or []
+        return []
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.ratelimit
+    ~~~~~~~~~~~~~~~~~~~
+
+    Stay within an upstream's quota with a token bucket shared by every eater talking to it.
+
+    Buckets adapt to the upstream - a ``Retry-After`` header on a ``429`` or ``503`` response pauses the bucket, and
+    ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset`` (or ``RateLimit-Remaining`` / ``RateLimit-Reset``) headers
+    limit the tokens available and pause the bucket once the quota is exhausted.
+"""
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable, Hashable, Union
+
+import requests
+
+from eater.api.endpoint import PerEndpoint
+from eater.api.retry import parse_retry_after
+from eater.api.timing import record
+from eater.errors import EaterRateLimitError
+
+__all__ = ['TokenBucket', 'RateLimiter', 'get_rate_limiter']
+
+#: The number of seconds in each named period.
+PERIODS = {
+    'second': 1,
+    'minute': 60,
+    'hour': 60 * 60,
+    'day': 24 * 60 * 60,
+}
+
+#: ``X-RateLimit-Reset`` values larger than this are a Unix timestamp rather than a number of seconds.
+EPOCH_THRESHOLD = 10 ** 9
+
+
+class TokenBucket:
+    """
+    A thread safe token bucket, holding at most ``burst`` tokens and refilled at ``rate`` tokens a second.
+
+    Tokens are reserved rather than waited for, so concurrent callers are spaced out in the order they arrived.
+    """
+
+    def __init__(self, rate: float, burst: int=1):
+        """
+        :param rate: The number of tokens added per second.
+        :type rate: float
+        :param burst: The maximum number of tokens held, the number of requests that can be made at once.
+        :type burst: int
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        #: When tokens were last added, in the future while the bucket is paused.
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self, tokens: int=1, max_wait: float=None) -> Union[float, None]:
+        """
+        Reserve ``tokens``, returning how long the caller must wait before using them.
+
+        :param tokens: The number of tokens to reserve.
+        :type tokens: int
+        :param max_wait: If the wait would be longer than this many seconds nothing is reserved.
+        :type max_wait: float|None
+        :return: The number of seconds to wait, or ``None`` if it would be longer than ``max_wait``.
+        :rtype: float|None
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(self.updated - now, 0.0) + max(tokens - self.tokens, 0.0) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            self.tokens -= tokens
+            return wait
+
+    def pause(self, seconds: float):
+        """
+        Stop adding tokens for ``seconds``, after which a single token is available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens = min(self.tokens, 1.0)
+            self.updated = max(self.updated, now + seconds)
+
+    def limit(self, remaining: int):
+        """
+        Limit the tokens available now to ``remaining``, as reported by the upstream.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, float(remaining))
+
+
+class RateLimiter(PerEndpoint):
+    """
+    Limit requests to ``rate`` per ``period``, with a separate :py:class:`TokenBucket` per host or eater class.
+
+    Calls wait until a token is available. If ``max_wait`` is supplied and the wait would be longer,
+    :py:class:`eater.errors.EaterRateLimitError` is raised instead.
+    """
+
+    def __init__(self, rate: float, period: Union[str, float]='second', burst: int=1, per: str='host',
+                 max_wait: float=None, adapt: bool=True):
+        """
+        :param rate: The number of requests allowed per ``period``.
+        :type rate: float
+        :param period: ``'second'``, ``'minute'``, ``'hour'``, ``'day'`` or a number of seconds.
+        :type period: str|float
+        :param burst: The number of requests that can be made at once, after a quiet spell.
+        :type burst: int
+        :param per: ``'host'`` to keep a bucket per scheme and host or ``'class'`` per eater class.
+        :type per: str
+        :param max_wait: The maximum number of seconds a call waits for a token, ``None`` to wait indefinitely.
+        :type max_wait: float|None
+        :param adapt: Adapt to ``Retry-After`` and rate limit headers in responses.
+        :type adapt: bool
+        """
+        super().__init__(per)
+        try:
+            seconds = PERIODS[period] if isinstance(period, str) else float(period)
+        except KeyError as exc_info:
+            raise ValueError("Unknown period '%s', expected one of %s or a number of seconds." % (
+                period, ', '.join(PERIODS)
+            )) from exc_info
+
+        self.rate = rate
+        self.period = period
+        self.burst = burst
+        self.max_wait = max_wait
+        self.adapt = adapt
+        #: The number of tokens added per second.
+        self.tokens_per_second = rate / seconds
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def get_bucket(self, key: Hashable) -> TokenBucket:
+        """
+        Retrieve the bucket for ``key``, creating it if necessary.
+        """
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self.tokens_per_second, self.burst)
+            return bucket
+
+    def reserve(self, key: Hashable) -> float:
+        """
+        Reserve a token from the bucket for ``key``.
+
+        :return: The number of seconds to wait before making the call.
+        :rtype: float
+        :raises EaterRateLimitError: If the wait would be longer than ``max_wait``.
+        """
+        wait = self.get_bucket(key).reserve(max_wait=self.max_wait)
+        if wait is None:
+            raise EaterRateLimitError("Rate limit for %s would be exceeded for longer than %ss." % (
+                self.describe(key), self.max_wait
+            ))
+        record('throttle', wait)
+        return wait
+
+    def update(self, key: Hashable, response: requests.Response):
+        """
+        Adapt the bucket for ``key`` to the headers of ``response``.
+        """
+        if not self.adapt:
+            return
+
+        headers = response.headers
+        bucket = self.get_bucket(key)
+
+        if response.status_code in (429, 503):
+            retry_after = parse_retry_after(headers.get('retry-after'))
+            if retry_after is not None:
+                bucket.pause(retry_after)
+                return
+
+        remaining = parse_number(headers.get('x-ratelimit-remaining', headers.get('ratelimit-remaining')))
+        if remaining is None:
+            return
+
+        if remaining < 1:
+            reset = parse_number(headers.get('x-ratelimit-reset', headers.get('ratelimit-reset')))
+            if reset is not None:
+                bucket.pause(reset - time.time() if reset > EPOCH_THRESHOLD else reset)
+                return
+        bucket.limit(remaining)
+
+    def call(self, key: Hashable, send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Call ``send`` once a token is available from the bucket for ``key``.
+
+        :param key: The key of the bucket, see :py:meth:`.RateLimiter.get_key`.
+        :type key: Hashable
+        :param send: A callable that makes the request and returns the response.
+        :type send: Callable
+        :return: The response.
+        :rtype: requests.Response
+        :raises EaterRateLimitError: If the wait would be longer than ``max_wait``.
+        """
+        wait = self.reserve(key)
+        if wait > 0:
+            time.sleep(wait)
+        response = send()
+        self.update(key, response)
+        return response
+
+    async def acall(self, key: Hashable, send: Callable[[], Awaitable[requests.Response]]) -> requests.Response:
+        """
+        Identical to :py:meth:`.RateLimiter.call` except that ``send`` returns an awaitable.
+        """
+        wait = self.reserve(key)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        response = await send()
+        self.update(key, response)
+        return response
+
+
+def parse_number(value: str=None) -> Union[float, None]:
+    """
+    Parse the numeric value of a rate limit header.
+    """
+    if not value:
+        return None
+    try:
+        return float(value.split(',')[0].strip())
+    except ValueError:
+        return None
+
+
+#: Rate limiters created from tuples, so that every eater declaring the same limit shares its buckets.
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(rate_limit: Union[tuple, RateLimiter, None]) -> Union[RateLimiter, None]:
+    """
+    Resolve ``rate_limit``.
+
+    :param rate_limit: ``None``, an instance of :py:class:`RateLimiter` or a tuple of its arguments, for instance
+                       ``(100, 'second')`` or ``(100, 'second', 20)`` to allow bursts of 20 requests.
+    :type rate_limit: tuple|RateLimiter|None
+    :return: The rate limiter, the same instance for equal tuples.
+    :rtype: RateLimiter|None
+    """
+    if rate_limit is None or isinstance(rate_limit, RateLimiter):
+        return rate_limit
+    with _limiters_lock:
+        limiter = _limiters.get(rate_limit)
+        if limiter is None:
+            limiter = _limiters[rate_limit] = RateLimiter(*rate_limit)
+        return limiter
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.replay
+    ~~~~~~~~~~~~~~~~
+
+    Record real upstream traffic to disk and replay it, at full speed and without a network, for load tests and CI.
+
+    Responses are appended to a data file and their offsets to an index file (``<path>.idx``), keyed by a hash of the
+    method, URL and body of the request. Replaying memory maps the data file, so serving a response costs little
+    more than building a ``requests.Response``.
+
+    Recording and replaying happen in the requests transport adapter, beneath everything eater does for a call, by
+    setting ``session_registry`` to a :py:class:`ReplayRegistry`;
+
+    .. code-block:: python
+
+        HTTPEater.session_registry = ReplayRegistry('books.replay', mode='record')
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Union
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from eater.api.session import SessionRegistry
+from eater.api.transport import build_response
+from eater.errors import EaterReplayError
+
+__all__ = ['ReplayStore', 'RecordingAdapter', 'ReplayAdapter', 'ReplayRegistry']
+
+#: The header of each record - the status code and the lengths of the metadata and the body.
+RECORD = struct.Struct('!HII')
+
+#: Headers describing the body as it was sent, which no longer apply once requests has decoded it.
+STRIPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+
+
+class ReplayStore:
+    """
+    An append-only store of responses, keyed by request.
+
+    A request recorded more than once is replayed with the response recorded last. Responses are replayed from the
+    store as it was when it was opened, call :py:meth:`.ReplayStore.load` to replay responses recorded since. Only a
+    single process should record to a store at a time.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: The path of the data file, the index is kept alongside it in ``<path>.idx``.
+        :type path: str
+        """
+        self.path = path
+        self.index_path = path + '.idx'
+        self._lock = threading.Lock()
+        #: The offset of the latest record of each key.
+        self._index = {}
+        #: Parsed records, keyed by offset.
+        self._records = {}
+        self._data = None
+        self._data_file = None
+        self._index_file = None
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    @staticmethod
+    def get_key(request: requests.PreparedRequest) -> str:
+        """
+        Build the key of ``request`` from its method, URL and body.
+
+        :param request: The request.
+        :type request: requests.PreparedRequest
+        :return: A hex digest.
+        :rtype: str
+        """
+        body = request.body
+        if body is None:
+            body = b''
+        elif isinstance(body, str):
+            body = body.encode('utf-8')
+        elif not isinstance(body, (bytes, bytearray)):
+            raise EaterReplayError("Streamed request bodies can't be recorded or replayed.")
+        digest = hashlib.sha256('{} {}\n'.format(request.method.upper(), request.url).encode('utf-8'))
+        digest.update(body)
+        return digest.hexdigest()
+
+    def load(self):
+        """
+        Read the index and memory map the data file, if they exist.
+        """
+        with self._lock:
+            self._index = {}
+            self._records = {}
+            if self._data is not None:
+                self._data.close()
+                self._data = None
+
+            if not os.path.exists(self.index_path):
+                return
+
+            with open(self.index_path, 'r', encoding='utf-8') as index_file:
+                for line in index_file:
+                    try:
+                        key, offset = line.split()
+                        self._index[key] = int(offset)
+                    except ValueError:
+                        # A partially written line, from a recording that was interrupted
+                        continue
+
+            if self._index:
+                with open(self.path, 'rb') as data_file:
+                    self._data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get(self, key: str) -> Union[tuple, None]:
+        """
+        Retrieve the response recorded for ``key``.
+
+        :param key: The key of the request, see :py:meth:`.ReplayStore.get_key`.
+        :type key: str
+        :return: A tuple of ``(status_code, reason, url, headers, body)`` or ``None`` if nothing was recorded.
+        :rtype: tuple|None
+        """
+        offset = self._index.get(key)
+        if offset is None:
+            return None
+
+        record = self._records.get(offset)
+        if record is None:
+            status_code, meta_length, body_length = RECORD.unpack_from(self._data, offset)
+            start = offset + RECORD.size
+            meta = json.loads(self._data[start:start + meta_length].decode('utf-8'))
+            start += meta_length
+            record = self._records[offset] = (
+                status_code, meta['reason'], meta['url'], meta['headers'], start, start + body_length
+            )
+
+        status_code, reason, url, headers, start, end = record
+        return status_code, reason, url, headers, self._data[start:end]
+
+    def record(self, key: str, response: requests.Response):
+        """
+        Append ``response`` to the store as the response to the request ``key``.
+
+        :param key: The key of the request, see :py:meth:`.ReplayStore.get_key`.
+        :type key: str
+        :param response: The response, its body is read if it hasn't been already.
+        :type response: requests.Response
+        """
+        body = response.content or b''
+        meta = json.dumps({
+            'reason': response.reason,
+            'url': response.url,
+            'headers': [
+                [name, value] for name, value in response.headers.items() if name.lower() not in STRIPPED_HEADERS
+            ] + [['Content-Length', str(len(body))]],
+        }).encode('utf-8')
+
+        with self._lock:
+            if self._data_file is None:
+                # Kept open while recording, they're closed by close()
+                self._data_file = open(self.path, 'ab')  # pylint: disable=consider-using-with
+                self._index_file = open(self.index_path, 'a', encoding='utf-8')  # pylint: disable=consider-using-with
+            offset = self._data_file.seek(0, os.SEEK_END)
+            self._data_file.write(RECORD.pack(response.status_code, len(meta), len(body)))
+            self._data_file.write(meta)
+            self._data_file.write(body)
+            self._data_file.flush()
+            # The index is only written once the record is complete
+            self._index_file.write('%s %d\n' % (key, offset))
+            self._index_file.flush()
+
+    def close(self):
+        """
+        Close the files of the store, nothing is replayed until it's loaded again.
+        """
+        with self._lock:
+            for handle in (self._data, self._data_file, self._index_file):
+                if handle is not None:
+                    handle.close()
+            self._data = self._data_file = self._index_file = None
+            self._index = {}
+            self._records = {}
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    A transport adapter that sends requests with ``adapter`` and records every response in ``store``.
+    """
+
+    def __init__(self, store: ReplayStore, adapter: BaseAdapter=None):
+        """
+        :param store: The store to record responses in.
+        :type store: ReplayStore
+        :param adapter: The adapter that sends requests, a ``requests.adapters.HTTPAdapter`` by default.
+        :type adapter: requests.adapters.BaseAdapter|None
+        """
+        super().__init__()
+        self.store = store
+        self.adapter = adapter or HTTPAdapter()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:  # pylint: disable=arguments-differ
+        response = self.adapter.send(request, **kwargs)
+        self.store.record(self.store.get_key(request), response)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    A transport adapter that serves every request from ``store``, without touching the network.
+
+    :py:class:`eater.errors.EaterReplayError` is raised for requests that weren't recorded.
+    """
+
+    def __init__(self, store: ReplayStore):
+        """
+        :param store: The store to replay responses from.
+        :type store: ReplayStore
+        """
+        super().__init__()
+        self.store = store
+
+    def send(self, request: requests.PreparedRequest, stream: bool=False,  # pylint: disable=too-many-arguments,unused-argument
+             timeout=None, verify=True, cert=None, proxies=None) -> requests.Response:
+        """
+        Replay the response to ``request``.
+
+        The remaining arguments are those of ``BaseAdapter.send``, none of them apply to a recorded response, whose
+        body is always held in memory.
+        """
+        recorded = self.store.get(self.store.get_key(request))
+        if recorded is None:
+            raise EaterReplayError("No response to '%s %s' was recorded in '%s'." % (
+                request.method, request.url, self.store.path
+            ))
+
+        status_code, reason, url, headers, body = recorded
+        response = build_response(request, status_code, CaseInsensitiveDict(headers), body, reason=reason, url=url)
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+class ReplayRegistry(SessionRegistry):
+    """
+    A session registry whose sessions record responses to, or replay them from, a :py:class:`ReplayStore`.
+    """
+
+    def __init__(self, path: str, mode: str='replay'):
+        """
+        :param path: The path of the store, see :py:class:`ReplayStore`.
+        :type path: str
+        :param mode: ``'record'`` to make real requests and record their responses or ``'replay'`` to replay them.
+        :type mode: str
+        """
+        if mode not in ('record', 'replay'):
+            raise ValueError("mode must be 'record' or 'replay', not '%s'." % mode)
+        super().__init__()
+        self.mode = mode
+        self.store = ReplayStore(path)
+
+    def create_session(self, auth: tuple=None, headers: dict=None, pool_connections: int=10,
+                       pool_maxsize: int=10) -> requests.Session:
+        session = super().create_session(auth=auth, headers=headers, pool_connections=pool_connections,
+                                         pool_maxsize=pool_maxsize)
+        if self.mode == 'record':
+            adapter = RecordingAdapter(self.store, session.get_adapter('https://'))
+        else:
+            adapter = ReplayAdapter(self.store)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
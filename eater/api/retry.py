@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.retry
+    ~~~~~~~~~~~~~~~
+
+    Retry failed requests with exponential backoff, bounded by a retry budget.
+"""
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Iterable, Union
+
+import requests
+
+from eater.errors import EaterConnectError, EaterTimeoutError
+
+__all__ = ['RetryBudget', 'RetryPolicy', 'budget', 'parse_retry_after']
+
+
+class RetryBudget:
+    """
+    A thread safe budget limiting retries to a proportion of requests.
+
+    Within any ``window`` seconds at most ``minimum + ratio * requests`` retries are allowed, so that when an upstream
+    is struggling retries can't multiply the load on it.
+    """
+
+    def __init__(self, ratio: float=0.2, minimum: int=10, window: float=10):
+        """
+        :param ratio: The number of retries allowed per request.
+        :type ratio: float
+        :param minimum: The number of retries allowed within ``window`` regardless of the number of requests.
+        :type minimum: int
+        :param window: The number of seconds requests and retries are counted over.
+        :type window: float
+        """
+        self.ratio = ratio
+        self.minimum = minimum
+        self.window = window
+        self._lock = threading.Lock()
+        # A [second, requests, retries] bucket for every second within window
+        self._buckets = deque()
+        self._requests = 0
+        self._retries = 0
+
+    def _bucket(self) -> list:
+        now = int(time.monotonic())
+        buckets = self._buckets
+        while buckets and buckets[0][0] <= now - self.window:
+            _, requests_, retries = buckets.popleft()
+            self._requests -= requests_
+            self._retries -= retries
+        if not buckets or buckets[-1][0] != now:
+            buckets.append([now, 0, 0])
+        return buckets[-1]
+
+    def deposit(self):
+        """
+        Record a request.
+        """
+        with self._lock:
+            self._bucket()[1] += 1
+            self._requests += 1
+
+    def withdraw(self) -> bool:
+        """
+        Record a retry if the budget allows it.
+
+        :return: ``True`` if the retry may be made.
+        :rtype: bool
+        """
+        with self._lock:
+            bucket = self._bucket()
+            if self._retries >= self.minimum + self.ratio * self._requests:
+                return False
+            bucket[2] += 1
+            self._retries += 1
+            return True
+
+
+#: The process wide retry budget shared by every :py:class:`RetryPolicy` that isn't given its own.
+budget = RetryBudget()  # pylint: disable=invalid-name
+
+
+class RetryPolicy:
+    """
+    Retry requests that fail with a retryable exception or status code.
+
+    The delay before each retry grows exponentially from ``backoff`` up to ``max_backoff``, with full jitter. A
+    ``Retry-After`` header extends the delay, or stops retrying if it's longer than ``max_backoff``.
+    """
+
+    def __init__(self, attempts: int=3, backoff: float=0.1, max_backoff: float=10, jitter: bool=True,
+                 statuses: Iterable[int]=(429, 502, 503, 504),
+                 exceptions: tuple=(EaterConnectError, EaterTimeoutError),
+                 methods: Iterable[str]=('get', 'head', 'options', 'put', 'delete'),
+                 retry_budget: Union[RetryBudget, None]=budget):
+        """
+        :param attempts: The maximum number of attempts, including the first.
+        :type attempts: int
+        :param backoff: The delay in seconds before the first retry, doubled for every subsequent retry.
+        :type backoff: float
+        :param max_backoff: The maximum delay in seconds before a retry.
+        :type max_backoff: float
+        :param jitter: Wait a random delay between zero and the backoff, to avoid many clients retrying in lockstep.
+        :type jitter: bool
+        :param statuses: The HTTP status codes that are retried.
+        :type statuses: Iterable[int]
+        :param exceptions: The exceptions that are retried.
+        :type exceptions: tuple
+        :param methods: The HTTP methods that are retried, these should be idempotent so ``POST`` isn't by default.
+        :type methods: Iterable[str]
+        :param retry_budget: The budget retries are withdrawn from, ``None`` for no budget.
+        :type retry_budget: RetryBudget|None
+        """
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.exceptions = exceptions
+        self.methods = frozenset(method.lower() for method in methods)
+        self.retry_budget = retry_budget
+
+    def get_delay(self, attempt: int, response: requests.Response=None) -> Union[float, None]:
+        """
+        Calculate the delay before retrying ``attempt``.
+
+        :param attempt: The number of the attempt that failed, starting at 1.
+        :type attempt: int
+        :param response: The response if the attempt failed with a retryable status code.
+        :type response: requests.Response|None
+        :return: The delay in seconds, or ``None`` if the request shouldn't be retried.
+        :rtype: float|None
+        """
+        if attempt >= self.attempts:
+            return None
+
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get('retry-after'))
+            if retry_after is not None:
+                if retry_after > self.max_backoff:
+                    return None
+                delay = max(delay, retry_after)
+
+        if self.retry_budget is not None and not self.retry_budget.withdraw():
+            return None
+        return delay
+
+    def call(self, send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Call ``send`` until it returns a response with a status code that isn't retryable, or attempts are exhausted.
+
+        :param send: A callable that makes the request and returns the response.
+        :type send: Callable
+        :return: The last response.
+        :rtype: requests.Response
+        :raises: The last exception if the last attempt failed with one.
+        """
+        if self.retry_budget is not None:
+            self.retry_budget.deposit()
+
+        attempt = 1
+        while True:
+            try:
+                response = send()
+            except self.exceptions:
+                delay = self.get_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in self.statuses:
+                    return response
+                delay = self.get_delay(attempt, response)
+                if delay is None:
+                    return response
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, send: Callable[[], Awaitable[requests.Response]]) -> requests.Response:
+        """
+        Identical to :py:meth:`.RetryPolicy.call` except that ``send`` returns an awaitable.
+        """
+        if self.retry_budget is not None:
+            self.retry_budget.deposit()
+
+        attempt = 1
+        while True:
+            try:
+                response = await send()
+            except self.exceptions:
+                delay = self.get_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in self.statuses:
+                    return response
+                delay = self.get_delay(attempt, response)
+                if delay is None:
+                    return response
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def parse_retry_after(value: str=None) -> Union[float, None]:
+    """
+    Parse a ``Retry-After`` header, either a number of seconds or a HTTP date.
+
+    :param value: The value of the header.
+    :type value: str|None
+    :return: The number of seconds to wait, or ``None`` if ``value`` is missing or invalid.
+    :rtype: float|None
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError, IndexError):
+        return None
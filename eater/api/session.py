@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.session
+    ~~~~~~~~~~~~~~~~~
+
+    A process wide registry of pooled requests sessions.
+"""
+import threading
+from collections import OrderedDict
+from typing import Hashable, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class SessionRegistry:
+    """
+    A thread safe registry of ``requests.Session`` instances.
+
+    Sessions are keyed by scheme, host, auth, headers and pool size so that many short lived eater instances talking
+    to the same endpoint share a single connection pool and reuse keep-alive connections.
+
+    At most ``max_sessions`` sessions are kept, once reached the least recently used session is forgotten (it's closed
+    once the eaters still using it are garbage collected).
+    """
+
+    def __init__(self, max_sessions: int=100):
+        """
+        :param max_sessions: The maximum number of sessions to keep.
+        :type max_sessions: int
+        """
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get_session(self, url: str, auth: tuple=None, headers: dict=None, pool_connections: int=10,
+                    pool_maxsize: int=10) -> requests.Session:
+        """
+        Retrieve the pooled session for ``url``, creating it if necessary.
+
+        :param url: The URL the session will be used to talk to, only the scheme and host are used.
+        :type url: str
+        :param auth: The ``auth`` to set on the session.
+        :type auth: tuple|None
+        :param headers: Headers to set on the session.
+        :type headers: dict|None
+        :param pool_connections: The number of connection pools to cache.
+        :type pool_connections: int
+        :param pool_maxsize: The maximum number of connections to keep in each pool.
+        :type pool_maxsize: int
+        :return: A shared instance of ``requests.Session``, or a new one if ``auth`` can't be keyed.
+        :rtype: requests.Session
+        """
+        key = self.get_key(url, auth=auth, headers=headers, pool_connections=pool_connections,
+                           pool_maxsize=pool_maxsize)
+        if key is None:
+            return self.create_session(auth=auth, headers=headers, pool_connections=pool_connections,
+                                       pool_maxsize=pool_maxsize)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self.create_session(auth=auth, headers=headers, pool_connections=pool_connections,
+                                              pool_maxsize=pool_maxsize)
+                self._sessions[key] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(key)
+            return session
+
+    def get_key(self, url: str, auth: tuple=None, headers: dict=None, pool_connections: int=10,  # pylint: disable=no-self-use
+                pool_maxsize: int=10) -> Hashable:
+        """
+        Build the registry key for the supplied session parameters.
+
+        :return: A hashable key, or ``None`` if ``auth`` can't be keyed by its value and mustn't be pooled.
+        :rtype: tuple|None
+        """
+        auth_key = get_auth_key(auth)
+        if auth_key is None and auth is not None:
+            return None
+        parts = urlsplit(url)
+        return (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            auth_key,
+            tuple(sorted((str(name).lower(), value) for name, value in (headers or {}).items())),
+            pool_connections,
+            pool_maxsize,
+        )
+
+    def create_session(self, auth: tuple=None, headers: dict=None, pool_connections: int=10,  # pylint: disable=no-self-use
+                       pool_maxsize: int=10) -> requests.Session:
+        """
+        Create a new ``requests.Session`` with pooled adapters mounted.
+
+        :return: An instance of ``requests.Session``
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        if auth:
+            session.auth = auth
+
+        if headers:
+            session.headers.update(headers)
+
+        return session
+
+    def close(self, url: str=None):
+        """
+        Close and forget pooled sessions.
+
+        :param url: If supplied only sessions for the scheme and host of ``url`` are closed, otherwise all sessions are
+                    closed.
+        :type url: str|None
+        """
+        for session in self.pop(url):
+            session.close()
+
+    def pop(self, url: str=None) -> list:
+        """
+        Forget pooled sessions and return them, without closing them.
+
+        :param url: If supplied only sessions for the scheme and host of ``url`` are returned, otherwise all sessions
+                    are returned.
+        :type url: str|None
+        :return: A list of sessions that are no longer in the registry.
+        :rtype: list
+        """
+        with self._lock:
+            if url is None:
+                keys = list(self._sessions)
+            else:
+                parts = urlsplit(url)
+                keys = [
+                    key for key in self._sessions
+                    if key[:2] == (parts.scheme.lower(), parts.netloc.lower())
+                ]
+            return [self._sessions.pop(key) for key in keys]
+
+    def reset(self):
+        """
+        Forget all pooled sessions without closing them.
+
+        Useful in a forked child process, where the parent still owns the underlying sockets.
+        """
+        with self._lock:
+            self._sessions = OrderedDict()
+
+
+#: Types whose values are safe to key a session by.
+PLAIN_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+def get_auth_key(auth) -> Union[Hashable, None]:
+    """
+    Build a key for ``auth`` that's equal for equal credentials.
+
+    Tuples of plain values are keyed as they are and objects such as ``requests.auth.HTTPBasicAuth`` by their class
+    and attributes, provided those are plain values too. Anything else, for instance an auth object holding a lock or
+    other per-instance state, can't be keyed by its value.
+
+    :return: A hashable key, or ``None`` if ``auth`` can't be keyed by its value.
+    :rtype: tuple|None
+    """
+    if isinstance(auth, tuple) and all(isinstance(value, PLAIN_TYPES) for value in auth):
+        return auth
+    try:
+        attributes = vars(auth)
+    except TypeError:
+        return None
+    if not all(isinstance(value, PLAIN_TYPES) for value in attributes.values()):
+        return None
+    return (type(auth), tuple(sorted(attributes.items())))
+
+
+#: The process wide session registry used by :py:class:`eater.HTTPEater`.
+registry = SessionRegistry()  # pylint: disable=invalid-name
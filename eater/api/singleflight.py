@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.singleflight
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Coalesce identical concurrent calls into a single call.
+"""
+import asyncio
+import threading
+from typing import Awaitable, Callable, Hashable, Iterable
+
+__all__ = ['SingleFlight']
+
+
+class Flight:
+    """
+    A call in progress, shared by the caller making it and any callers waiting on it.
+    """
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key, only the first caller makes the call and every other caller receives
+    its result (or exception) once it completes.
+
+    Nothing is cached, as soon as a call completes the next call with the same key is made again.
+    """
+
+    def __init__(self, methods: Iterable[str]=('get', 'head', 'options')):
+        """
+        :param methods: The HTTP methods whose requests are coalesced, these should be idempotent.
+        :type methods: Iterable[str]
+        """
+        self.methods = frozenset(method.lower() for method in methods)
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._tasks = {}
+        #: The number of calls made.
+        self.calls = 0
+        #: The number of callers that received the result of another caller's call.
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._flights) + len(self._tasks)
+
+    def do(self, key: Hashable, func: Callable):
+        """
+        Call ``func`` unless a call with the same ``key`` is already in progress, in which case wait for it.
+
+        :param key: Identifies the call.
+        :type key: Hashable
+        :param func: A callable taking no arguments.
+        :type func: Callable
+        :return: The result of ``func``.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = Flight()
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func()
+            return flight.result
+        except BaseException as exc_info:
+            flight.error = exc_info
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def ado(self, key: Hashable, func: Callable[[], Awaitable]):
+        """
+        Await ``func()`` unless a call with the same ``key`` is already in progress on the running event loop, in which
+        case await that.
+
+        Cancelling a caller doesn't cancel the shared call.
+
+        :param key: Identifies the call.
+        :type key: Hashable
+        :param func: A callable taking no arguments and returning an awaitable.
+        :type func: Callable
+        :return: The result of ``func()``.
+        """
+        key = (asyncio.get_running_loop(), key)
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self.calls += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
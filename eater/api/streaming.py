@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.streaming
+    ~~~~~~~~~~~~~~~~~~~
+
+    Incrementally parse large JSON arrays and NDJSON bodies, and read bodies as files.
+"""
+import io
+import json
+import re
+from typing import Callable, Iterable, Iterator, Union
+
+from schematics import Model
+from schematics.exceptions import DataError
+from schematics.types import ListType, ModelType
+
+#: Structural characters of interest outside of a JSON string.
+STRUCTURAL_RE = re.compile(rb'[\[\]{},:"]')
+
+#: Characters of interest inside a JSON string.
+STRING_RE = re.compile(rb'["\\]')
+
+
+class JSONArrayParser:
+    """
+    Incrementally parse a JSON document, collecting each element of an array as soon as it is complete.
+
+    Bytes are supplied with :py:meth:`.JSONArrayParser.feed`, which returns the elements completed by those bytes.
+    Only the bytes of the element currently being parsed are held in memory.
+    """
+
+    def __init__(self, field: str=None, loads: Callable=json.loads):
+        """
+        :param field: If the document is an object, the key of the array within it. Ignored if the document is
+                      itself an array.
+        :type field: str|None
+        :param loads: The function used to decode each element.
+        :type loads: Callable
+        """
+        self.field = field
+        self.loads = loads
+        #: Set once the end of the array has been parsed.
+        self.done = False
+        self._buf = bytearray()
+        self._state = (0, 0, False, 0, False, None, None, None, 0)
+
+    def feed(self, chunk: bytes) -> list:  # pylint: disable=too-many-branches,too-many-statements
+        """
+        Parse ``chunk``, returning a list of the decoded elements it completed.
+
+        :param chunk: The next bytes of the document.
+        :type chunk: bytes
+        :return: A list of decoded elements.
+        :rtype: list
+        """
+        items = []
+        if self.done:
+            return items
+
+        buf, field, loads = self._buf, self.field, self.loads
+        pos, depth, in_string, string_start, expect_key, key, value_key, target, item_start = self._state
+        buf += chunk
+
+        while True:
+            if in_string:
+                match = STRING_RE.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                if match.group() == b'\\':
+                    if match.end() >= len(buf):
+                        # The escaped character hasn't arrived yet
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                in_string = False
+                pos = match.end()
+                if expect_key and depth == 1:
+                    key = json.loads(b'"' + bytes(buf[string_start:match.start()]) + b'"')
+                    expect_key = False
+                continue
+
+            match = STRUCTURAL_RE.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+
+            char = match.group()
+            pos = match.end()
+
+            if char == b'"':
+                in_string = True
+                string_start = pos
+
+            elif char in b'[{':
+                depth += 1
+                if target is None and char == b'[' and (depth == 1 or (depth == 2 and value_key == field)):
+                    target = depth
+                    item_start = pos
+                elif depth == 1 and char == b'{':
+                    expect_key = True
+
+            elif char in b']}':
+                if depth == target:
+                    item = bytes(buf[item_start:match.start()])
+                    if item.strip():
+                        items.append(loads(item))
+                    self.done = True
+                    self._buf = bytearray()
+                    return items
+                depth -= 1
+
+            elif char == b',':
+                if depth == target:
+                    items.append(loads(bytes(buf[item_start:match.start()])))
+                    item_start = pos
+                elif depth == 1:
+                    expect_key = True
+                    value_key = None
+
+            elif depth == 1:
+                value_key = key
+
+        # Discard everything that has already been parsed
+        if target is not None:
+            keep = item_start
+        elif in_string:
+            keep = string_start
+        else:
+            keep = pos
+        del buf[:keep]
+
+        self._state = (
+            pos - keep, depth, in_string, string_start - keep, expect_key, key, value_key, target, item_start - keep
+        )
+        return items
+
+
+class ChunkReader(io.RawIOBase):
+    """
+    A read only file over an iterable of ``bytes``, for instance ``response.iter_content(chunk_size)``.
+
+    Only the chunk being read is held, so codecs that decode incrementally from a file never hold the whole body.
+    Reading everything returns a ``bytearray``, collected without the extra copy ``io.RawIOBase.readall`` makes.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        """
+        :param chunks: An iterable of ``bytes``.
+        :type chunks: Iterable[bytes]
+        """
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._chunk = b''
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int=-1) -> Union[bytes, bytearray]:
+        """
+        Read ``size`` bytes, fewer only once the end has been reached, or everything that's left if ``size`` is
+        negative.
+        """
+        if size is None or size < 0:
+            return self.readall()
+
+        parts = []
+        while size > 0:
+            if self._pos >= len(self._chunk):
+                self._chunk = next(self._chunks, None)
+                self._pos = 0
+                if self._chunk is None:
+                    self._chunk = b''
+                    break
+            part = self._chunk[self._pos:self._pos + size]
+            self._pos += len(part)
+            size -= len(part)
+            parts.append(part)
+        return parts[0] if len(parts) == 1 else b''.join(parts)
+
+    def readall(self) -> bytearray:
+        data = bytearray(self._chunk[self._pos:])
+        self._chunk = b''
+        self._pos = 0
+        for chunk in self._chunks:
+            data += chunk
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def iter_json_array(chunks: Iterable[bytes], field: str=None, loads: Callable=json.loads) -> Iterator:
+    """
+    Incrementally parse a JSON document, yielding each element of an array as it is completed.
+
+    :param chunks: An iterable of ``bytes``, for instance ``response.iter_content(chunk_size)``.
+    :type chunks: Iterable[bytes]
+    :param field: If the document is an object, the key of the array within it. Ignored if the document is itself
+                  an array.
+    :type field: str|None
+    :param loads: The function used to decode each element.
+    :type loads: Callable
+    :return: A generator of decoded elements.
+    :rtype: Iterator
+    """
+    parser = JSONArrayParser(field, loads)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+
+
+def iter_ndjson(lines: Iterable[bytes], loads: Callable=json.loads) -> Iterator:
+    """
+    Parse newline delimited JSON, yielding each decoded line.
+
+    :param lines: An iterable of lines, for instance ``response.iter_lines()``.
+    :type lines: Iterable[bytes]
+    :param loads: The function used to decode each line.
+    :type loads: Callable
+    :return: A generator of decoded lines.
+    :rtype: Iterator
+    """
+    for line in lines:
+        if line.strip():
+            yield loads(line)
+
+
+def get_stream_field(response_cls: type, name: str=None) -> tuple:
+    """
+    Find the ``ListType(ModelType(...))`` field of ``response_cls`` that is streamed.
+
+    :param response_cls: A schematics model class.
+    :type response_cls: type
+    :param name: The name of the field. If ``None`` ``response_cls`` must have exactly one such field.
+    :type name: str|None
+    :return: A tuple of the serialized name of the field and the model class of its items.
+    :rtype: tuple
+    """
+    fields = {
+        field_name: field for field_name, field in response_cls.fields.items()
+        if isinstance(field, ListType) and isinstance(field.field, ModelType)
+    }
+
+    if name is None:
+        if len(fields) != 1:
+            raise TypeError("Class %s must define exactly one ListType(ModelType(...)) field to be streamed, "
+                            "set stream_field to choose one." % response_cls.__name__)
+        name = next(iter(fields))
+
+    elif name not in fields:
+        raise TypeError("Field '%s' of class %s is not a ListType(ModelType(...))." % (name, response_cls.__name__))
+
+    field = fields[name]
+    return field.serialized_name or name, field.field.model_class
+
+
+def validate_items(items: Iterable[Union[dict, list]], build: Callable[[dict], Model], field: str=None,
+                   start: int=0) -> Iterator[Model]:
+    """
+    Validate each item of ``items`` by calling ``build``, yielding the models.
+
+    A ``DataError`` raised by an item is re-raised keyed by the item's index (and ``field`` if supplied), as it would
+    be if the whole response was validated at once.
+    """
+    for index, item in enumerate(items, start):
+        try:
+            yield build(item)
+        except DataError as exc_info:
+            errors = {index: exc_info.errors}
+            raise DataError({field: errors} if field else errors) from exc_info
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.timing
+    ~~~~~~~~~~~~~~~~
+
+    Measure how long each phase of an eater call takes.
+
+    Listeners are callables that receive a :py:class:`CallTiming` once each call completes. They're either registered
+    globally with :py:func:`add_listener` or set as ``timing_listeners`` on an eater class. When there are no listeners
+    nothing is measured.
+"""
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Callable, Union
+
+import requests
+
+__all__ = ['CallTiming', 'add_listener', 'remove_listener']
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+#: Globally registered listeners.
+_listeners = []
+
+#: The timing of the call in progress in the current thread or task.
+current = ContextVar('current', default=None)  # pylint: disable=invalid-name
+
+#: Returned by :py:func:`phase` when no call is being timed.
+NULL_PHASE = nullcontext()
+
+
+class CallTiming:
+    """
+    The timing of a single eater call.
+
+    ``phases`` maps the name of each phase to the number of seconds spent in it, phases that happen more than once
+    (for instance when a request is retried) are summed. The phases are;
+
+    - ``prepare`` - building the request kwargs, including ``request_model.to_primitive()``.
+    - ``throttle`` - waiting for the rate limit, see :py:mod:`eater.api.ratelimit`.
+    - ``ttfb`` - time to first byte, from sending the request (including acquiring a connection) until the response
+      headers have been received.
+    - ``download`` - receiving the response body.
+    - ``decode`` - decoding the response body.
+    - ``validate`` - building and validating the response model.
+    - ``offload`` - decoding and validating the response in a process pool, instead of ``decode`` and ``validate``,
+      see :py:mod:`eater.api.offload`.
+    - ``total`` - the whole call.
+    """
+
+    __slots__ = ('eater', 'method', 'url', 'status', 'request_bytes', 'response_bytes', 'phases', 'error')
+
+    def __init__(self, eater: str, method: str=None, url: str=None):
+        #: The name of the eater class.
+        self.eater = eater
+        self.method = method
+        self.url = url
+        #: The HTTP status of the (last) response, if any.
+        self.status = None
+        #: The size of the (last) request body.
+        self.request_bytes = 0
+        #: The size of the (last) response body.
+        self.response_bytes = 0
+        self.phases = {}
+        #: The exception raised by the call, if any.
+        self.error = None
+
+    def __repr__(self):
+        return '<CallTiming %s %s %s %s>' % (
+            self.eater,
+            (self.method or '').upper(),
+            self.url,
+            ' '.join('%s=%.2fms' % (name, seconds * 1000) for name, seconds in self.phases.items()),
+        )
+
+    def add(self, name: str, seconds: float):
+        """
+        Add ``seconds`` to the phase ``name``.
+        """
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_response(self, response: requests.Response):
+        """
+        Record the status and sizes of ``response``.
+        """
+        self.status = response.status_code
+        body = response.request.body if response.request is not None else None
+        self.request_bytes = len(body) if body is not None and not hasattr(body, 'read') else 0
+        if response._content_consumed and response._content:  # pylint: disable=protected-access
+            self.response_bytes = len(response.content)
+
+
+class Phase:
+    """
+    A context manager adding the time spent within it to a phase of a :py:class:`CallTiming`.
+    """
+
+    __slots__ = ('timing', 'name', 'start')
+
+    def __init__(self, timing: CallTiming, name: str):
+        self.timing = timing
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timing.add(self.name, time.perf_counter() - self.start)
+
+
+def add_listener(listener: Callable[[CallTiming], None]):
+    """
+    Register ``listener`` to receive the :py:class:`CallTiming` of every call made by every eater.
+
+    :param listener: A callable accepting a :py:class:`CallTiming`.
+    :type listener: Callable
+    """
+    _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[CallTiming], None]):
+    """
+    Unregister a ``listener`` registered with :py:func:`add_listener`.
+    """
+    _listeners.remove(listener)
+
+
+def get_listeners(eater_cls: type) -> list:
+    """
+    Retrieve the listeners for ``eater_cls``, those registered globally followed by its ``timing_listeners``.
+    """
+    if not _listeners and not eater_cls.timing_listeners:
+        return []
+    return _listeners + list(eater_cls.timing_listeners)
+
+
+def phase(name: str) -> Union[Phase, nullcontext]:
+    """
+    Create a context manager that measures the phase ``name`` of the call in progress, if it's being timed.
+    """
+    timing = current.get()
+    if timing is None:
+        return NULL_PHASE
+    return Phase(timing, name)
+
+
+def record(name: str, seconds: float):
+    """
+    Add ``seconds`` to the phase ``name`` of the call in progress, if it's being timed.
+    """
+    timing = current.get()
+    if timing is not None:
+        timing.add(name, seconds)
+
+
+def record_response(response: requests.Response, seconds: float):
+    """
+    Record ``response``, received ``seconds`` after the request was sent, for the call in progress if it's being
+    timed.
+
+    ``response.elapsed`` is used as the time to first byte, the remainder as the time spent downloading the body.
+    """
+    timing = current.get()
+    if timing is not None:
+        ttfb = response.elapsed.total_seconds() if response.elapsed else seconds
+        timing.add('ttfb', ttfb)
+        timing.add('download', max(seconds - ttfb, 0.0))
+        timing.add_response(response)
+
+
+@contextmanager
+def time_call(listeners: list, eater: object):
+    """
+    Time the call made by ``eater`` within the context, notifying ``listeners`` once it completes.
+    """
+    timing = CallTiming(type(eater).__name__, eater.method, eater.url)
+    token = current.set(timing)
+    start = time.perf_counter()
+    try:
+        yield timing
+    except BaseException as exc_info:
+        timing.error = exc_info
+        raise
+    finally:
+        timing.add('total', time.perf_counter() - start)
+        # The url and method may have been changed by get_request_kwargs
+        timing.method, timing.url = eater.method, eater.url
+        current.reset(token)
+        for listener in listeners:
+            try:
+                listener(timing)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Timing listener %r failed.", listener)
@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.transport
+    ~~~~~~~~~~~~~~~~~~~
+
+    Pluggable transports that send the requests of an eater.
+
+    By default requests are sent with requests itself, which costs a fair amount per call in hooks, cookie jars,
+    redirect handling and merging settings from the environment. :py:class:`Urllib3Transport` sends them straight
+    through a urllib3 ``PoolManager`` instead (``pip install eater[urllib3]``), :py:class:`HTTPXTransport` multiplexes them over HTTP/2 with httpx_
+    (``pip install eater[http2]``) and :py:class:`MemoryTransport` serves them from handlers registered in memory, for
+    tests.
+
+    Every transport returns a ``requests.Response`` and raises requests exceptions, so the rest of eater (and your
+    subclasses) can't tell them apart.
+
+    .. _httpx: https://www.python-httpx.org
+"""
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from json import dumps
+from typing import Callable, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.sessions import merge_setting
+from requests.structures import CaseInsensitiveDict
+from requests.utils import DEFAULT_CA_BUNDLE_PATH, get_encoding_from_headers
+
+from eater.errors import EaterTransportError
+
+__all__ = ['Transport', 'RequestsTransport', 'Urllib3Transport', 'HTTPXTransport', 'MemoryTransport']
+
+
+class Transport:
+    """
+    Base transport - send a request and return the response.
+
+    Transports receive the eater's requests session so that its headers and auth apply, other than
+    :py:class:`RequestsTransport` they ignore the rest of it - cookies, proxies and hooks. They can't send requests
+    through adapters mounted on the session either, so rather than silently bypass one (for instance the adapters of
+    :py:class:`eater.api.replay.ReplayRegistry`) they raise :py:class:`eater.errors.EaterTransportError`, as they do
+    for the per request kwargs in :py:data:`UNSUPPORTED_KWARGS`.
+    """
+
+    def send(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request.
+
+        :param session: The eater's session.
+        :type session: requests.Session
+        :param method: The HTTP method.
+        :type method: str
+        :param url: The URL.
+        :type url: str
+        :param kwargs: The kwargs supplied to requests, as returned by
+                       :py:meth:`eater.HTTPEater.prepare_request_kwargs`.
+        :type kwargs: dict
+        :return: The response, with its body read unless ``stream`` is ``True``.
+        :rtype: requests.Response
+        :raises requests.RequestException: If the request fails.
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """
+        Release any connections held by the transport.
+        """
+
+
+class RequestsTransport(Transport):
+    """
+    Send requests with the eater's requests session.
+    """
+
+    def send(self, session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+        return getattr(session, method.lower())(url, **kwargs)
+
+
+class Urllib3Transport(Transport):
+    """
+    Send requests through a urllib3 ``PoolManager``, bypassing the per call overhead of requests.
+
+    Requests are still prepared by requests, so ``params``, ``data``, ``files``, ``headers`` and ``auth`` behave as
+    usual, but ``cookies``, ``proxies``, ``verify`` and ``cert`` can't be supplied per request - TLS is configured
+    when the transport is created. Requires urllib3 1.26 or later (``pip install eater[urllib3]``), older versions of
+    requests bundle their own copy rather than installing it.
+    """
+
+    def __init__(self, pool_connections: int=10, pool_maxsize: int=10, verify: Union[bool, str]=True,
+                 cert: Union[str, tuple]=None, max_redirects: int=30):
+        """
+        :param pool_connections: The number of connection pools to cache.
+        :type pool_connections: int
+        :param pool_maxsize: The maximum number of connections to keep in each pool.
+        :type pool_maxsize: int
+        :param verify: Verify TLS certificates, either ``True``, ``False`` or the path of a CA bundle.
+        :type verify: bool|str
+        :param cert: The path of a client certificate, or a tuple of the paths of the certificate and key.
+        :type cert: str|tuple|None
+        :param max_redirects: The maximum number of redirects followed.
+        :type max_redirects: int
+        """
+        import urllib3  # pylint: disable=import-outside-toplevel
+        self.urllib3 = urllib3
+        cert_file, key_file = cert if isinstance(cert, tuple) else (cert, None)
+        self.max_redirects = max_redirects
+        self.pool_manager = urllib3.PoolManager(
+            num_pools=pool_connections,
+            maxsize=pool_maxsize,
+            cert_reqs='CERT_REQUIRED' if verify else 'CERT_NONE',
+            ca_certs=verify if isinstance(verify, str) else DEFAULT_CA_BUNDLE_PATH,
+            cert_file=cert_file,
+            key_file=key_file,
+        )
+
+    def send(self, session: requests.Session, method: str, url: str, *,  # pylint: disable=arguments-differ
+             timeout: Union[float, tuple]=None, allow_redirects: bool=None, stream: bool=False,
+             **kwargs) -> requests.Response:
+        request = prepare_request(session, method, url, **kwargs)
+        if allow_redirects is None:
+            allow_redirects = request.method != 'HEAD'
+        if isinstance(timeout, tuple):
+            timeout = self.urllib3.Timeout(connect=timeout[0], read=timeout[1])
+        else:
+            timeout = self.urllib3.Timeout(connect=timeout, read=timeout)
+
+        with translate_urllib3_errors(self.urllib3, request):
+            start = time.perf_counter()
+            raw = self.pool_manager.urlopen(
+                request.method,
+                request.url,
+                body=request.body,
+                headers=request.headers,
+                redirect=allow_redirects,
+                retries=self.urllib3.Retry(total=None, connect=0, read=False, status=0, other=0,
+                                      redirect=self.max_redirects if allow_redirects else False),
+                timeout=timeout,
+                preload_content=False,
+                decode_content=True,
+            )
+            elapsed = time.perf_counter() - start
+
+            body = None
+            if not stream:
+                try:
+                    body = raw.read()
+                finally:
+                    raw.release_conn()
+
+        return build_response(request, raw.status, CaseInsensitiveDict(raw.headers), body, reason=raw.reason,
+                              url=raw.url or request.url, raw=raw, elapsed=elapsed)
+
+    def close(self):
+        self.pool_manager.clear()
+
+
+class HTTPXTransport(Transport):
+    """
+    Send requests with an httpx client, over HTTP/2 by default.
+
+    Concurrent requests to the same host are multiplexed over a single connection, so eaters called from many threads
+    (for instance with :py:meth:`eater.HTTPEater.map`) don't need a connection each. Requires httpx with HTTP/2 support
+    (``pip install eater[http2]``). As with :py:class:`Urllib3Transport` ``cookies``, ``proxies``, ``verify`` and
+    ``cert`` can't be supplied per request.
+    """
+
+    def __init__(self, http2: bool=True, verify: Union[bool, str]=True, cert: Union[str, tuple]=None,
+                 **client_kwargs):
+        """
+        :param http2: Negotiate HTTP/2 with servers that support it, otherwise HTTP/1.1 is used.
+        :type http2: bool
+        :param verify: Verify TLS certificates, either ``True``, ``False`` or the path of a CA bundle.
+        :type verify: bool|str
+        :param cert: The path of a client certificate, or a tuple of the paths of the certificate and key.
+        :type cert: str|tuple|None
+        :param client_kwargs: Any other kwargs to supply when creating the ``httpx.Client``, for instance ``limits``.
+        :type client_kwargs: dict
+        """
+        import httpx  # pylint: disable=import-outside-toplevel
+        self.httpx = httpx
+        self.client = httpx.Client(http2=http2, verify=verify, cert=cert, **client_kwargs)
+
+    def send(self, session: requests.Session, method: str, url: str, *,  # pylint: disable=arguments-differ
+             timeout: Union[float, tuple]=None, allow_redirects: bool=None, stream: bool=False,
+             **kwargs) -> requests.Response:
+        request = prepare_request(session, method, url, **kwargs)
+        if allow_redirects is None:
+            allow_redirects = request.method != 'HEAD'
+        if isinstance(timeout, tuple):
+            timeout = self.httpx.Timeout(None, connect=timeout[0], read=timeout[1])
+
+        with translate_httpx_errors(self.httpx, request):
+            start = time.perf_counter()
+            raw = self.client.send(
+                self.client.build_request(request.method, request.url, content=request.body,
+                                          headers=list(request.headers.items()), timeout=timeout),
+                stream=True,
+                follow_redirects=allow_redirects,
+            )
+            elapsed = time.perf_counter() - start
+
+            body = None
+            if not stream:
+                try:
+                    body = raw.read()
+                finally:
+                    raw.close()
+
+        return build_response(request, raw.status_code, CaseInsensitiveDict(raw.headers.items()), body,
+                              reason=raw.reason_phrase, url=str(raw.url), raw=HTTPXStream(self.httpx, request, raw),
+                              elapsed=elapsed)
+
+    def close(self):
+        self.client.close()
+
+
+class HTTPXStream:
+    """
+    Expose the body of a streamed httpx response the way ``requests.Response.iter_content`` reads it.
+    """
+
+    def __init__(self, httpx, request: requests.PreparedRequest, response):
+        self.httpx = httpx
+        self.request = request
+        self.response = response
+
+    def stream(self, chunk_size: int, decode_content: bool=True):  # pylint: disable=unused-argument
+        with translate_httpx_errors(self.httpx, self.request):
+            yield from self.response.iter_bytes(chunk_size)
+
+    def close(self):
+        self.response.close()
+
+
+class MemoryTransport(Transport):
+    """
+    Serve requests from handlers registered in memory, without a network.
+
+    Intended for tests - unlike mocking requests, responses are served concurrently and the transport can be set on a
+    single eater class. Requests for which no handler was registered raise ``requests.ConnectionError``, which the
+    eater raises as :py:class:`eater.errors.EaterConnectError`.
+
+    .. code-block:: python
+
+        transport = MemoryTransport()
+        transport.add('GET', 'https://example.com/books/1/', json={'id': 1, 'title': 'Dune'})
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers = {}
+        #: The prepared requests received, in order.
+        self.requests = []
+
+    def add(self, method: str, url: str, handler: Callable[[requests.PreparedRequest], tuple]=None, *,
+            status_code: int=200, json: object=None, body: Union[bytes, str]=b'', headers: dict=None):
+        """
+        Register the response to ``method`` requests for ``url``.
+
+        A URL without a query string matches requests with any query string, unless a handler was registered for the
+        query string itself.
+
+        :param method: The HTTP method.
+        :type method: str
+        :param url: The URL.
+        :type url: str
+        :param handler: A callable receiving the ``requests.PreparedRequest`` and returning a tuple of
+                        ``(status_code, headers, body)``, rather than the same response every time.
+        :type handler: Callable|None
+        :param status_code: The status code of the response.
+        :type status_code: int
+        :param json: An object to encode as a JSON body, with a ``Content-Type`` of ``application/json``.
+        :type json: object
+        :param body: The body of the response.
+        :type body: bytes|str
+        :param headers: The headers of the response.
+        :type headers: dict|None
+        """
+        if handler is None:
+            headers = CaseInsensitiveDict(headers or {})
+            if json is not None:
+                body = dumps(json)
+                headers.setdefault('Content-Type', 'application/json')
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            response = (status_code, headers, body)
+            handler = lambda request: response  # pylint: disable=unnecessary-lambda-assignment
+
+        key = method.upper(), requests.Request(method, url).prepare().url
+        with self._lock:
+            self._handlers[key] = handler
+
+    def send(self, session: requests.Session, method: str, url: str, *,  # pylint: disable=arguments-differ
+             timeout: Union[float, tuple]=None, allow_redirects: bool=None, stream: bool=False,  # pylint: disable=unused-argument
+             **kwargs) -> requests.Response:
+        request = prepare_request(session, method, url, **kwargs)
+        with self._lock:
+            self.requests.append(request)
+            handler = self._handlers.get((request.method, request.url))
+            if handler is None:
+                handler = self._handlers.get((request.method, urlsplit(request.url)._replace(query='').geturl()))
+
+        if handler is None:
+            raise requests.ConnectionError("No response to '%s %s' was added to the transport." % (
+                request.method, request.url
+            ), request=request)
+
+        status_code, headers, body = handler(request)
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        return build_response(request, status_code, CaseInsensitiveDict(headers or {}), body)
+
+
+#: The kwargs requests accepts per request that only :py:class:`RequestsTransport` supports.
+UNSUPPORTED_KWARGS = frozenset(('cookies', 'proxies', 'verify', 'cert', 'hooks'))
+
+
+def prepare_request(session: requests.Session, method: str, url: str, params: dict=None,
+                    data: Union[bytes, str, dict]=None, headers: dict=None, json: object=None,  # pylint: disable=redefined-outer-name
+                    auth: object=None, files: dict=None, **kwargs) -> requests.PreparedRequest:
+    """
+    Prepare a request the way ``session`` would, merging in its headers, params and auth but nothing else.
+
+    :return: The prepared request.
+    :rtype: requests.PreparedRequest
+    :raises EaterTransportError: If ``kwargs`` contains any of :py:data:`UNSUPPORTED_KWARGS`, or an adapter other
+                                 than requests' own is mounted on ``session``.
+    """
+    unknown = set(kwargs) - UNSUPPORTED_KWARGS
+    if unknown:
+        raise TypeError("Unexpected request kwargs %s." % ', '.join(sorted(unknown)))
+    unsupported = sorted(name for name, value in kwargs.items() if value is not None)
+    if unsupported:
+        raise EaterTransportError("Request kwargs %s are only supported by RequestsTransport, configure them when "
+                                  "creating the transport instead." % ', '.join(unsupported))
+    for prefix, adapter in session.adapters.items():
+        if type(adapter) is not HTTPAdapter:  # pylint: disable=unidiomatic-typecheck
+            raise EaterTransportError("%s is mounted on '%s' of the session but only RequestsTransport sends requests "
+                                      "through mounted adapters." % (type(adapter).__name__, prefix))
+
+    request = requests.PreparedRequest()
+    request.prepare(
+        method=method.upper(),
+        url=url,
+        headers=merge_setting(headers, session.headers, dict_class=CaseInsensitiveDict),
+        files=files,
+        data=data or {},
+        json=json,
+        params=merge_setting(params, session.params),
+        auth=auth or session.auth,
+    )
+    return request
+
+
+def build_response(request: requests.PreparedRequest, status_code: int, headers: CaseInsensitiveDict,
+                   body: Union[bytes, None], reason: str=None, url: str=None, raw: object=None,
+                   elapsed: float=0.0) -> requests.Response:
+    """
+    Build a ``requests.Response``.
+
+    :param request: The request the response is to.
+    :type request: requests.PreparedRequest
+    :param status_code: The status code.
+    :type status_code: int
+    :param headers: The headers.
+    :type headers: requests.structures.CaseInsensitiveDict
+    :param body: The body, or ``None`` if it's yet to be read from ``raw``.
+    :type body: bytes|None
+    :param reason: The reason phrase.
+    :type reason: str|None
+    :param url: The final URL, after any redirects, if not that of ``request``.
+    :type url: str|None
+    :param raw: The object the body is read from, if it hasn't been already.
+    :type raw: object
+    :param elapsed: The number of seconds until the headers were received.
+    :type elapsed: float
+    :return: The response.
+    :rtype: requests.Response
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = reason
+    response.url = url or request.url
+    response.headers = headers
+    response.encoding = get_encoding_from_headers(headers)
+    response.request = request
+    response.raw = raw
+    response.elapsed = timedelta(seconds=elapsed)
+    if body is not None:
+        response._content = body  # pylint: disable=protected-access
+        response._content_consumed = True  # pylint: disable=protected-access
+    return response
+
+
+@contextmanager
+def translate_urllib3_errors(urllib3, request: requests.PreparedRequest):
+    """
+    Translate exceptions raised by urllib3 into the exceptions requests would raise.
+    """
+    try:
+        yield
+    except urllib3.exceptions.MaxRetryError as exc_info:
+        # NewConnectionError is a ConnectTimeoutError, for backwards compatibility
+        if isinstance(exc_info.reason, urllib3.exceptions.ConnectTimeoutError) and \
+                not isinstance(exc_info.reason, urllib3.exceptions.NewConnectionError):
+            raise requests.ConnectTimeout(exc_info, request=request) from exc_info
+        if isinstance(exc_info.reason, urllib3.exceptions.ResponseError):
+            raise requests.TooManyRedirects(exc_info, request=request) from exc_info
+        raise requests.ConnectionError(exc_info, request=request) from exc_info
+    except urllib3.exceptions.TimeoutError as exc_info:
+        raise requests.ReadTimeout(exc_info, request=request) from exc_info
+    except urllib3.exceptions.HTTPError as exc_info:
+        raise requests.ConnectionError(exc_info, request=request) from exc_info
+
+
+@contextmanager
+def translate_httpx_errors(httpx, request: requests.PreparedRequest):
+    """
+    Translate exceptions raised by httpx into the exceptions requests would raise.
+    """
+    try:
+        yield
+    except httpx.ConnectTimeout as exc_info:
+        raise requests.ConnectTimeout(exc_info, request=request) from exc_info
+    except httpx.TimeoutException as exc_info:
+        raise requests.ReadTimeout(exc_info, request=request) from exc_info
+    except httpx.TooManyRedirects as exc_info:
+        raise requests.TooManyRedirects(exc_info, request=request) from exc_info
+    except httpx.HTTPError as exc_info:
+        raise requests.ConnectionError(exc_info, request=request) from exc_info
+
+
+#: The transport used by :py:class:`eater.HTTPEater` by default.
+requests_transport = RequestsTransport()  # pylint: disable=invalid-name
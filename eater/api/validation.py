@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.api.validation
+    ~~~~~~~~~~~~~~~~~~~~
+
+    Policies that decide how thoroughly responses are validated.
+"""
+import threading
+from typing import Union
+
+from schematics import Model
+from schematics.exceptions import DataError, ValidationError
+from schematics.types import ListType, ModelType
+
+from eater.api.compiled import compile_model
+from eater.api.lazy import build_lazy
+
+__all__ = [
+    'ValidationPolicy', 'FullValidation', 'TypesOnlyValidation', 'SampledValidation', 'LazyValidation',
+    'get_validation_policy'
+]
+
+
+class ValidationPolicy:
+    """
+    Base validation policy - build a model from decoded data.
+    """
+
+    #: The name of the policy, as used for ``HTTPEater.validation``.
+    name = None
+
+    def build(self, model_cls: type, raw_data: dict, compiled: bool=False) -> Model:
+        """
+        Create an instance of ``model_cls`` from ``raw_data``.
+
+        :param model_cls: The schematics model class.
+        :type model_cls: type
+        :param raw_data: The decoded data.
+        :type raw_data: dict
+        :param compiled: Use a compiled version of ``model_cls``, see :py:mod:`eater.api.compiled`.
+        :type compiled: bool
+        :return: An instance of ``model_cls``.
+        :rtype: schematics.Model
+        :raises DataError: If ``raw_data`` is invalid.
+        """
+        raise NotImplementedError()
+
+
+class FullValidation(ValidationPolicy):
+    """
+    Convert and fully validate every response.
+    """
+
+    name = 'full'
+
+    def build(self, model_cls: type, raw_data: dict, compiled: bool=False) -> Model:
+        if compiled:
+            return compile_model(model_cls)(raw_data)
+        return model_cls(raw_data=raw_data, validate=True, partial=False)
+
+
+class TypesOnlyValidation(ValidationPolicy):
+    """
+    Only convert responses to their native types - required fields and unexpected fields are still checked, however
+    validators (``min_length``, ``min_value``, ``choices``, custom validators etc..) aren't run.
+    """
+
+    name = 'types-only'
+
+    def build(self, model_cls: type, raw_data: dict, compiled: bool=False) -> Model:
+        if compiled:
+            return compile_model(model_cls, validate=False)(raw_data)
+        return model_cls(raw_data=raw_data, partial=False)
+
+
+class SampledValidation(ValidationPolicy):
+    """
+    Fully validate a sample of responses, converting the rest to their native types.
+
+    The sample is either every ``rate`` th response, the first ``items`` items of every ``ListType(ModelType(...))``
+    field in a response or both, see :py:func:`validate_sample`. Violations found in the sample are counted and, unless
+    ``raise_errors`` is ``False``, raised.
+    """
+
+    name = 'sampled'
+
+    def __init__(self, rate: int=10, items: int=None, raise_errors: bool=True):
+        """
+        :param rate: Fully validate one in every ``rate`` responses, ``None`` to never fully validate a response.
+        :type rate: int|None
+        :param items: Fully validate the first ``items`` items of every list of models in every other response.
+        :type items: int|None
+        :param raise_errors: Raise a ``DataError`` when a violation is found, otherwise it's only counted.
+        :type raise_errors: bool
+        """
+        self.rate = rate
+        self.items = items
+        self.raise_errors = raise_errors
+        self._lock = threading.Lock()
+        #: The number of responses built.
+        self.count = 0
+        #: The number of responses that were (fully or partially) validated.
+        self.sampled = 0
+        #: The number of sampled responses that were invalid.
+        self.violations = 0
+
+    def build(self, model_cls: type, raw_data: dict, compiled: bool=False) -> Model:
+        with self._lock:
+            self.count += 1
+            full = self.rate is not None and self.count % self.rate == 1 % self.rate
+
+        if full or self.items is not None:
+            with self._lock:
+                self.sampled += 1
+            try:
+                if full:
+                    return FullValidation().build(model_cls, raw_data, compiled)
+                validate_sample(model_cls, raw_data, self.items, compiled)
+            except DataError:
+                with self._lock:
+                    self.violations += 1
+                if self.raise_errors:
+                    raise
+
+        return TypesOnlyValidation().build(model_cls, raw_data, compiled)
+
+
+class LazyValidation(ValidationPolicy):
+    """
+    Validate the top level of every response immediately, converting and validating compound fields (``ModelType``,
+    ``ListType``...) the first time they're accessed - see :py:class:`eater.api.lazy.LazyModel`.
+
+    Responses are returned as a :py:class:`eater.api.lazy.LazyModel` rather than an instance of the model class, call
+    its ``validate_all()`` method for the real, fully validated, model.
+    """
+
+    name = 'lazy'
+
+    def build(self, model_cls: type, raw_data: dict, compiled: bool=False) -> Model:
+        return build_lazy(model_cls, raw_data, compiled)
+
+
+def validate_sample(model_cls: type, raw_data, size: int, compiled: bool=False):
+    """
+    Fully validate ``raw_data`` as ``model_cls``, except that only the first ``size`` items of each
+    ``ListType(ModelType(...))`` field are validated, each on its own with the item model and in turn sampled.
+
+    The size limits of a list are only checked if it has no more than ``size`` items, as the rest of a longer list
+    isn't validated. Required fields are left to the build that follows the sample.
+
+    :raises DataError: If the sample is invalid.
+    """
+    if not isinstance(raw_data, dict):
+        return
+    nested = {
+        field.serialized_name or name: field for name, field in model_cls.fields.items()
+        if isinstance(field, ModelType) or (isinstance(field, ListType) and isinstance(field.field, ModelType))
+    }
+    if not nested:
+        FullValidation().build(model_cls, raw_data, compiled)
+        return
+
+    model_cls(raw_data={key: value for key, value in raw_data.items() if key not in nested}, validate=True,
+              partial=True)
+
+    for key, field in nested.items():
+        value = raw_data.get(key)
+        try:
+            if isinstance(field, ModelType):
+                validate_sample(field.model_class, value, size, compiled)
+            elif isinstance(value, list):
+                if len(value) <= size:
+                    field.check_length(value, None)
+                for index, item in enumerate(value[:size]):
+                    try:
+                        validate_sample(field.model_class, item, size, compiled)
+                    except DataError as exc_info:
+                        raise DataError({index: exc_info.errors}) from exc_info
+        except (DataError, ValidationError) as exc_info:
+            raise DataError({key: getattr(exc_info, 'errors', exc_info)}) from exc_info
+
+
+#: Policies that can be referred to by name.
+POLICIES = {
+    policy.name: policy for policy in (FullValidation(), TypesOnlyValidation(), SampledValidation(), LazyValidation())
+}
+
+
+def get_validation_policy(policy: Union[str, ValidationPolicy]) -> ValidationPolicy:
+    """
+    Resolve ``policy``, either the name of a policy or a policy instance.
+
+    Note that the ``'sampled'`` policy is shared by every eater referring to it by name, use an instance of
+    :py:class:`SampledValidation` to count violations separately.
+
+    :param policy: ``'full'``, ``'types-only'``, ``'sampled'``, ``'lazy'`` or an instance of
+                   :py:class:`ValidationPolicy`.
+    :type policy: str|ValidationPolicy
+    :return: An instance of :py:class:`ValidationPolicy`.
+    :rtype: ValidationPolicy
+    """
+    if isinstance(policy, ValidationPolicy):
+        return policy
+    try:
+        return POLICIES[policy]
+    except KeyError as exc_info:
+        raise ValueError(
+            "Unknown validation policy '%s', expected one of %s." % (policy, ', '.join(sorted(POLICIES)))
+        ) from exc_info
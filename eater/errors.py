@@ -11,7 +11,11 @@ __all__ = [
     'EaterTimeoutError',
     'EaterConnectError',
     'EaterUnexpectedError',
-    'EaterUnexpectedResponseError'
+    'EaterUnexpectedResponseError',
+    'EaterCircuitOpenError',
+    'EaterRateLimitError',
+    'EaterReplayError',
+    'EaterTransportError',
 ]
 
 
@@ -43,3 +47,27 @@ class EaterUnexpectedResponseError(EaterUnexpectedError):
     """
     Raised when a response from an API is unexpected.
     """
+
+
+class EaterCircuitOpenError(EaterError):
+    """
+    Raised, without making a request, when the circuit for an API is open.
+    """
+
+
+class EaterRateLimitError(EaterError):
+    """
+    Raised, without making a request, when the rate limit for an API wouldn't allow it within ``max_wait``.
+    """
+
+
+class EaterReplayError(EaterError):
+    """
+    Raised when a request can't be replayed, for instance because no response to it was recorded.
+    """
+
+
+class EaterTransportError(EaterError):
+    """
+    Raised, without making a request, when a transport can't send a request the way requests would.
+    """
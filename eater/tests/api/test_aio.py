@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.aio
+    ~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.aio`
+"""
+import asyncio
+import json
+import socket
+import ssl
+import threading
+
+import certifi
+import pytest
+from schematics import Model
+from schematics.exceptions import DataError
+from schematics.types import StringType, IntType, ListType, ModelType
+
+aiohttp = pytest.importorskip('aiohttp')  # pylint: disable=invalid-name
+from aiohttp import web  # pylint: disable=wrong-import-position
+from aiohttp.test_utils import TestServer  # pylint: disable=wrong-import-position
+
+from eater import AsyncHTTPEater, gather, EaterTimeoutError, EaterConnectError, EaterUnexpectedError  # pylint: disable=wrong-import-position
+from eater.api.aio import AsyncSessionRegistry  # pylint: disable=wrong-import-position
+from eater.api.offload import ProcessOffload  # pylint: disable=wrong-import-position
+
+
+class Person(Model):
+    pk = IntType()  # pylint: disable=invalid-name
+    name = StringType(min_length=4)
+
+
+class UpdatePersonResponse(Model):
+    status = StringType()
+    person = ModelType(Person)
+
+
+def json_response(data, status=200):
+    return web.Response(body=json.dumps(data).encode(), status=status, headers={'Content-Type': 'application/json'})
+
+
+class PersonListResponse(Model):
+    people = ListType(ModelType(Person))
+
+
+async def list_people(request):  # pylint: disable=unused-argument
+    return json_response({'people': [{'pk': pk, 'name': 'John'} for pk in range(100)]})
+
+
+async def list_people_ndjson(request):  # pylint: disable=unused-argument
+    body = ''.join(json.dumps({'pk': pk, 'name': 'John'}) + '\n' for pk in range(100))
+    return web.Response(body=body.encode(), headers={'Content-Type': 'application/x-ndjson'})
+
+
+async def get_person(request):
+    return json_response({'pk': int(request.match_info['pk']), 'name': request.query.get('name', 'John')})
+
+
+async def update_person(request):
+    person = await request.json()
+    return json_response({'status': 'success', 'person': person})
+
+
+async def slow(request):  # pylint: disable=unused-argument
+    await asyncio.sleep(1)
+    return json_response({})
+
+
+async def not_found(request):  # pylint: disable=unused-argument
+    return json_response({}, status=404)
+
+
+def run(test):
+    """
+    Run ``test``, a coroutine function, with a local aiohttp server, supplying the server's base URL.
+    """
+    async def runner():
+        app = web.Application()
+        app.router.add_get('/person/{pk}/', get_person)
+        app.router.add_post('/person/{pk}/', update_person)
+        app.router.add_get('/people/', list_people)
+        app.router.add_get('/people.ndjson', list_people_ndjson)
+        app.router.add_get('/slow/', slow)
+        app.router.add_get('/missing/', not_found)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            return await test('http://%s:%s' % (server.host, server.port))
+        finally:
+            await AsyncHTTPEater.session_registry.close()
+            await server.close()
+    return asyncio.run(runner())
+
+
+def test_get_request():
+    async def test(base_url):
+        class GetPersonAPI(AsyncHTTPEater):
+            request_cls = Person
+            response_cls = Person
+            url = base_url + '/person/{request_model.pk}/'
+
+        response = await GetPersonAPI(pk=1)()
+        assert response == Person({'pk': 1, 'name': 'John'})
+
+    run(test)
+
+
+def test_post_request():
+    async def test(base_url):
+        class UpdatePersonAPI(AsyncHTTPEater):
+            request_cls = Person
+            response_cls = UpdatePersonResponse
+            method = 'post'
+            url = base_url + '/person/{request_model.pk}/'
+
+        expected_request = Person(dict(pk=1, name='John'))
+        response = await UpdatePersonAPI(expected_request)()
+        assert response == UpdatePersonResponse(dict(status='success', person=expected_request))
+
+    run(test)
+
+
+def test_get_request_kwargs():
+    async def test(base_url):
+        class GetPersonAPI(AsyncHTTPEater):
+            request_cls = Person
+            response_cls = Person
+            url = base_url + '/person/{request_model.pk}/'
+
+            def get_request_kwargs(self, request_model, **kwargs):
+                kwargs['params'] = {'name': 'Jane'}
+                return kwargs
+
+        response = await GetPersonAPI(pk=1)()
+        assert response.name == 'Jane'
+
+    run(test)
+
+
+def test_aiohttp_kwargs():
+    class UploadAPI(AsyncHTTPEater):
+        request_cls = Model
+        response_cls = Model
+        method = 'post'
+        url = 'https://example.com/upload/'
+
+    api = UploadAPI()
+    kwargs = api.get_aiohttp_kwargs(
+        verify=False, proxies={'http': 'http://plain:3128', 'https': 'http://secure:3128'},
+        data={'name': 'Dune'}, files={'cover': ('cover.png', b'PNG', 'image/png')}
+    )
+    assert kwargs['ssl'] is False
+    assert kwargs['proxy'] == 'http://secure:3128'
+    assert isinstance(kwargs['data'], aiohttp.FormData)
+    assert [field[0]['name'] for field in kwargs['data']._fields] == ['name', 'cover']  # pylint: disable=protected-access
+
+    assert api.get_aiohttp_kwargs(verify=certifi.where())['ssl'].verify_mode == ssl.CERT_REQUIRED
+    assert 'ssl' not in api.get_aiohttp_kwargs(verify=True)
+
+    with pytest.raises(TypeError):
+        api.get_aiohttp_kwargs(hooks={'response': []})
+
+
+def test_offload():
+    timings = []
+    threads = []
+    offload = ProcessOffload(threshold=0, max_workers=1)
+
+    async def test(base_url):
+        class PersonListAPI(AsyncHTTPEater):
+            response_cls = PersonListResponse
+            url = base_url + '/people/'
+            timing_listeners = [timings.append]
+
+            def process_response(self, *args, **kwargs):
+                threads.append(threading.current_thread())
+                return super().process_response(*args, **kwargs)
+
+        PersonListAPI.offload = offload
+        response = await PersonListAPI()()
+        assert len(response.people) == 100
+
+    try:
+        run(test)
+    finally:
+        offload.shutdown()
+    assert threads[0] is not threading.main_thread()
+    assert 'offload' in timings[0].phases
+
+
+def test_call():
+    async def test(base_url):
+        class GetPersonAPI(AsyncHTTPEater):
+            request_cls = Person
+            response_cls = Person
+            url = base_url + '/person/{request_model.pk}/'
+
+        api = GetPersonAPI()
+        responses = await asyncio.gather(*(api.call(pk=pk) for pk in range(10)))
+        assert [response.pk for response in responses] == list(range(10))
+        assert api.request_model.pk is None
+
+    run(test)
+
+
+def test_data_error_raised():
+    async def test(base_url):
+        class GetPersonAPI(AsyncHTTPEater):
+            request_cls = Person
+            response_cls = Person
+            url = base_url + '/person/{request_model.pk}/'
+
+            def get_request_kwargs(self, request_model, **kwargs):
+                kwargs['params'] = {'name': 'Jo'}
+                return kwargs
+
+        with pytest.raises(DataError):
+            await GetPersonAPI(pk=1)()
+
+    run(test)
+
+
+def test_status_code_gte_400():
+    async def test(base_url):
+        class MissingAPI(AsyncHTTPEater):
+            response_cls = Model
+            url = base_url + '/missing/'
+
+        with pytest.raises(EaterUnexpectedError):
+            await MissingAPI()()
+
+    run(test)
+
+
+def test_timeout():
+    async def test(base_url):
+        class SlowAPI(AsyncHTTPEater):
+            response_cls = Model
+            url = base_url + '/slow/'
+
+        with pytest.raises(EaterTimeoutError):
+            await SlowAPI()(timeout=0.05)
+
+    run(test)
+
+
+def test_connect_error():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    async def test(base_url):  # pylint: disable=unused-argument
+        class UnreachableAPI(AsyncHTTPEater):
+            response_cls = Model
+            url = 'http://127.0.0.1:%s/' % port
+
+        with pytest.raises(EaterConnectError):
+            await UnreachableAPI()()
+
+    run(test)
+
+
+def test_instances_share_session():
+    async def test(base_url):
+        class GetPersonAPI(AsyncHTTPEater):
+            request_cls = Person
+            response_cls = Person
+            url = base_url + '/person/{request_model.pk}/'
+            session_registry = AsyncSessionRegistry()
+
+        responses = await asyncio.gather(*[GetPersonAPI(pk=pk)() for pk in range(10)])
+        assert [response.pk for response in responses] == list(range(10))
+        assert len(GetPersonAPI.session_registry) == 1
+        await GetPersonAPI.session_registry.close()
+
+    run(test)
+
+
+def test_pool_sessions_false():
+    async def test(base_url):
+        class GetPersonAPI(AsyncHTTPEater):
+            request_cls = Person
+            response_cls = Person
+            url = base_url + '/person/{request_model.pk}/'
+            session_registry = AsyncSessionRegistry()
+            pool_sessions = False
+
+        response = await GetPersonAPI(pk=1)()
+        assert response.pk == 1
+        assert len(GetPersonAPI.session_registry) == 0
+
+    run(test)
+
+
+def test_map():
+    async def test(base_url):
+        class GetPersonAPI(AsyncHTTPEater):
+            request_cls = Person
+            response_cls = Person
+            url = base_url + '/person/{request_model.pk}/'
+
+        results = [result async for result in GetPersonAPI.map(({'pk': pk} for pk in range(20)), concurrency=4)]
+        assert [result.response.pk for result in results] == list(range(20))
+
+        results = [
+            result async for result in GetPersonAPI.map(({'pk': pk} for pk in range(20)), concurrency=4, ordered=False)
+        ]
+        assert sorted(result.response.pk for result in results) == list(range(20))
+
+    run(test)
+
+
+def test_gather():
+    async def test(base_url):
+        class GetPersonAPI(AsyncHTTPEater):
+            request_cls = Person
+            response_cls = Person
+            url = base_url + '/person/{request_model.pk}/'
+
+            def get_request_kwargs(self, request_model, **kwargs):
+                if request_model.pk == 1:
+                    kwargs['params'] = {'name': 'Jo'}
+                return kwargs
+
+        results = await gather(GetPersonAPI, [{'pk': pk} for pk in range(3)], concurrency=2)
+        assert results[0].response.pk == 0
+        assert isinstance(results[1].error, DataError)
+        assert results[2].response.pk == 2
+
+    run(test)
+
+
+def test_stream():
+    async def test(base_url):
+        class PersonListAPI(AsyncHTTPEater):
+            response_cls = PersonListResponse
+            url = base_url + '/people/'
+            stream_chunk_size = 64
+
+        people = [person async for person in PersonListAPI().stream()]
+        assert [person.pk for person in people] == list(range(100))
+
+        class PersonListNDJSONAPI(PersonListAPI):
+            url = base_url + '/people.ndjson'
+
+        people = [person async for person in PersonListNDJSONAPI().stream()]
+        assert [person.pk for person in people] == list(range(100))
+
+    run(test)
+
+
+def test_timing_listeners():
+    timings = []
+
+    async def test(base_url):
+        class GetPersonAPI(AsyncHTTPEater):
+            request_cls = Person
+            response_cls = Person
+            url = base_url + '/person/{request_model.pk}/'
+            timing_listeners = [timings.append]
+
+        await GetPersonAPI(pk=1)()
+
+    run(test)
+    assert len(timings) == 1
+    assert timings[0].status == 200
+    assert timings[0].response_bytes > 0
+    assert set(timings[0].phases) == {'prepare', 'ttfb', 'download', 'decode', 'validate', 'total'}
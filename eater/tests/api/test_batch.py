@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.batch
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.batch`
+"""
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.exceptions import DataError
+from schematics.types import StringType, IntType
+
+from eater import HTTPEater, EaterTimeoutError, EaterUnexpectedError
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+
+class Book(Model):
+    id = IntType(required=True)  # pylint: disable=invalid-name
+    title = StringType(required=True, min_length=3)
+
+
+class GetBookAPI(HTTPEater):
+    request_cls = Book
+    response_cls = Book
+    url = 'http://example.com/books/{request_model.id}/'
+
+
+def mock_books(mock, count):
+    for pk in range(count):
+        mock.get('http://example.com/books/%s/' % pk, json={'id': pk, 'title': 'Book %s' % pk}, headers=JSON_HEADERS)
+
+
+def test_map_ordered():
+    with requests_mock.Mocker() as mock:
+        mock_books(mock, 50)
+        results = list(GetBookAPI.map(({'id': pk} for pk in range(50)), concurrency=5))
+
+    assert [result.index for result in results] == list(range(50))
+    assert [result.response.id for result in results] == list(range(50))
+    assert all(result.error is None for result in results)
+    assert results[0].request == Book({'id': 0})
+
+
+def test_map_request_models():
+    with requests_mock.Mocker() as mock:
+        mock_books(mock, 3)
+        results = list(GetBookAPI.map([Book({'id': pk}) for pk in range(3)]))
+
+    assert [result.response.title for result in results] == ['Book 0', 'Book 1', 'Book 2']
+
+
+def test_map_unordered():
+    with requests_mock.Mocker() as mock:
+        mock_books(mock, 20)
+        results = list(GetBookAPI.map(({'id': pk} for pk in range(20)), concurrency=4, ordered=False))
+
+    assert sorted(result.index for result in results) == list(range(20))
+    assert all(result.response.id == result.index for result in results)
+
+
+def test_map_captures_errors():
+    with requests_mock.Mocker() as mock:
+        mock_books(mock, 3)
+        mock.get('http://example.com/books/1/', json={'id': 1, 'title': 'No'}, headers=JSON_HEADERS)
+        mock.get('http://example.com/books/2/', status_code=500)
+        mock.get('http://example.com/books/3/', exc=requests.ConnectTimeout)
+        results = list(GetBookAPI.map({'id': pk} for pk in range(4)))
+
+    assert results[0].response.id == 0
+    assert isinstance(results[1].error, DataError)
+    assert isinstance(results[2].error, EaterUnexpectedError)
+    assert isinstance(results[3].error, EaterTimeoutError)
+    assert all(result.response is None for result in results[1:])
+
+
+def test_map_concurrency_limit():
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def respond(request, context):  # pylint: disable=unused-argument
+        with lock:
+            in_flight.append(1)
+            peak.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.pop()
+        return {'id': 1, 'title': 'Book'}
+
+    with requests_mock.Mocker() as mock:
+        mock.get('http://example.com/books/1/', json=respond, headers=JSON_HEADERS)
+        results = list(GetBookAPI.map(({'id': 1} for _ in range(30)), concurrency=3))
+
+    assert len(results) == 30
+    assert max(peak) <= 3
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.cache
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.cache`
+"""
+from unittest import mock
+
+import pytest
+from requests.auth import HTTPDigestAuth
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.exceptions import DataError
+from schematics.types import IntType, StringType
+
+from eater import HTTPEater
+from eater.api.cache import ResponseCache, parse_cache_control
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+
+class BookRequest(Model):
+    id = IntType(required=True)  # pylint: disable=invalid-name
+
+
+class Book(Model):
+    title = StringType(required=True)
+
+
+def create_api(cache: ResponseCache, method: str='get'):
+    class GetBookAPI(HTTPEater):  # pylint: disable=redefined-outer-name
+        url = 'http://example.com/books/{request_model.id}/'
+        request_cls = BookRequest
+        response_cls = Book
+
+    GetBookAPI.cache = cache
+    GetBookAPI.method = method
+    return GetBookAPI
+
+
+def test_parse_cache_control():
+    assert parse_cache_control(None) == {}
+    assert parse_cache_control('Public, max-age=60, no-cache="Set-Cookie",,') == {
+        'public': True, 'max-age': 60, 'no-cache': 'Set-Cookie'
+    }
+
+
+def test_fresh_hit():
+    api_cls = create_api(ResponseCache())
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get('http://example.com/books/1/', json={'title': 'Dune'}, headers=JSON_HEADERS)
+        mocker.get('http://example.com/books/2/', json={'title': 'Emma'}, headers=JSON_HEADERS)
+
+        first = api_cls(id=1)()
+        assert api_cls(id=1)() is first
+        assert api_cls(id=2)().title == 'Emma'
+        assert mocker.call_count == 2
+
+    assert (api_cls.cache.hits, api_cls.cache.misses) == (1, 2)
+
+
+def test_methods():
+    api_cls = create_api(ResponseCache(), method='post')
+
+    with requests_mock.Mocker() as mocker:
+        mocker.post('http://example.com/books/1/', json={'title': 'Dune'}, headers=JSON_HEADERS)
+        api_cls(id=1)()
+        api_cls(id=1)()
+        assert mocker.call_count == 2
+
+    api_cls.cache = ResponseCache(methods=['POST'])
+    with requests_mock.Mocker() as mocker:
+        mocker.post('http://example.com/books/1/', json={'title': 'Dune'}, headers=JSON_HEADERS)
+        api_cls(id=1)()
+        api_cls(id=1)()
+        assert mocker.call_count == 1
+
+
+def test_lru_eviction():
+    api_cls = create_api(ResponseCache(maxsize=2))
+
+    with requests_mock.Mocker() as mocker:
+        for pk in range(1, 4):
+            mocker.get('http://example.com/books/%s/' % pk, json={'title': 'Book'}, headers=JSON_HEADERS)
+
+        api_cls(id=1)()
+        api_cls(id=2)()
+        api_cls(id=1)()
+        api_cls(id=3)()  # Evicts 2, the least recently used
+        assert mocker.call_count == 3
+
+        api_cls(id=1)()
+        api_cls(id=2)()
+        assert mocker.call_count == 4
+
+
+def test_ttl_and_max_age():
+    api_cls = create_api(ResponseCache(ttl=10))
+
+    with requests_mock.Mocker() as mocker, mock.patch('eater.api.cache.time.monotonic') as monotonic:
+        mocker.get('http://example.com/books/1/', json={'title': 'Dune'}, headers=JSON_HEADERS)
+        mocker.get('http://example.com/books/2/', json={'title': 'Emma'},
+                   headers=dict(JSON_HEADERS, **{'Cache-Control': 'max-age=100'}))
+
+        monotonic.return_value = 0
+        api_cls(id=1)()
+        api_cls(id=2)()
+
+        monotonic.return_value = 50
+        api_cls(id=1)()
+        api_cls(id=2)()
+        assert mocker.call_count == 3
+
+
+def test_no_store():
+    api_cls = create_api(ResponseCache())
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get('http://example.com/books/1/', json={'title': 'Dune'},
+                   headers=dict(JSON_HEADERS, **{'Cache-Control': 'no-store'}))
+        api_cls(id=1)()
+        api_cls(id=1)()
+        assert mocker.call_count == 2
+        assert not api_cls.cache
+
+
+def test_etag_revalidation():
+    api_cls = create_api(ResponseCache())
+    headers = dict(JSON_HEADERS, **{'Cache-Control': 'no-cache', 'ETag': '"v1"'})
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get('http://example.com/books/1/', [
+            {'json': {'title': 'Dune'}, 'headers': headers},
+            {'status_code': 304, 'headers': {'Cache-Control': 'max-age=60'}},
+            {'json': {'title': 'Never'}, 'headers': JSON_HEADERS},
+        ])
+
+        first = api_cls(id=1)()
+        assert 'If-None-Match' not in mocker.last_request.headers
+
+        with mock.patch.object(api_cls, 'create_response_model') as create_response_model:
+            assert api_cls(id=1)() is first
+            assert not create_response_model.called
+        assert mocker.last_request.headers['If-None-Match'] == '"v1"'
+
+        # Now fresh for max-age
+        assert api_cls(id=1)() is first
+        assert mocker.call_count == 2
+
+    assert api_cls.cache.revalidated == 1
+
+
+def test_last_modified_revalidation():
+    api_cls = create_api(ResponseCache(ttl=0))
+    last_modified = 'Wed, 21 Oct 2015 07:28:00 GMT'
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get('http://example.com/books/1/', [
+            {'json': {'title': 'Dune'}, 'headers': dict(JSON_HEADERS, **{'Last-Modified': last_modified})},
+            {'json': {'title': 'Dune Messiah'}, 'headers': JSON_HEADERS},
+        ])
+
+        api_cls(id=1)()
+        assert api_cls(id=1)().title == 'Dune Messiah'
+        assert mocker.last_request.headers['If-Modified-Since'] == last_modified
+
+        # The new response had no validators and has expired
+        api_cls(id=1)()
+        assert 'If-Modified-Since' not in mocker.last_request.headers
+        assert mocker.call_count == 3
+
+
+def test_keyed_by_auth_headers_and_params():
+    class MeAPI(HTTPEater):
+        url = 'http://example.com/me/'
+        response_cls = Book
+        cache = ResponseCache()
+
+    def me(request, context):  # pylint: disable=unused-argument
+        return {'title': '%s %s' % (request.headers.get('Authorization'), request.qs.get('x', ['-'])[0])}
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(MeAPI.url, json=me, headers=JSON_HEADERS)
+
+        assert MeAPI(_requests={'headers': {'Authorization': 'alice'}})().title == 'alice -'
+        assert MeAPI(_requests={'headers': {'Authorization': 'bob'}})().title == 'bob -'
+        assert MeAPI()(headers={'Authorization': 'carol'}).title == 'carol -'
+        assert MeAPI()(headers={'Authorization': 'carol'}, params={'x': 1}).title == 'carol 1'
+        assert mocker.call_count == 4
+
+        # Identical requests are still cached, whatever the case of the header names
+        assert MeAPI(_requests={'headers': {'authorization': 'alice'}})().title == 'alice -'
+        assert MeAPI()(headers={'Authorization': 'carol'}, params={'x': 1}, timeout=5).title == 'carol 1'
+        assert mocker.call_count == 4
+
+        # Auth that can't be keyed by its value isn't cached
+        MeAPI(_requests={'auth': HTTPDigestAuth('dave', 'pw')})()
+        MeAPI(_requests={'auth': HTTPDigestAuth('dave', 'pw')})()
+        assert mocker.call_count == 6
+
+
+def test_keyed_by_validation():
+    class Code(Model):
+        code = StringType(min_length=3)
+
+    class CodeAPI(HTTPEater):
+        url = 'http://example.com/code/'
+        response_cls = Code
+        cache = ResponseCache()
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(CodeAPI.url, json={'code': 'x'}, headers=JSON_HEADERS)
+
+        assert CodeAPI(_validation='types-only')().code == 'x'
+        with pytest.raises(DataError):
+            CodeAPI(_validation='full')()
+        assert mocker.call_count == 2
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.circuit
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.circuit`
+"""
+import time
+from unittest import mock
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.types import StringType
+
+from eater import HTTPEater, EaterCircuitOpenError, EaterConnectError, EaterError, EaterUnexpectedError
+from eater.api.circuit import CircuitBreaker
+from eater.api.retry import RetryPolicy
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+OK = {'json': {'title': 'Dune'}, 'headers': JSON_HEADERS}
+
+
+class Book(Model):
+    title = StringType()
+
+
+def create_api(breaker: CircuitBreaker, address: str='http://example.com/book/'):
+    class GetBookAPI(HTTPEater):
+        url = address
+        response_cls = Book
+        circuit_breaker = breaker
+
+    return GetBookAPI
+
+
+def call(api_cls):
+    try:
+        return type(api_cls()())
+    except EaterError as exc_info:
+        return type(exc_info)
+
+
+def test_error_hierarchy():
+    assert issubclass(EaterCircuitOpenError, EaterError)
+
+
+def test_opens_on_failure_rate():
+    breaker = CircuitBreaker(failure_threshold=0.5, minimum_calls=4, window=4)
+    api_cls = create_api(breaker)
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(api_cls.url, [OK, {'status_code': 503}, OK, {'exc': requests.ConnectionError}, OK])
+        assert [call(api_cls) for _ in range(4)] == [Book, EaterUnexpectedError, Book, EaterConnectError]
+        assert breaker.get_state(api_cls) == 'open'
+
+        # Fails fast without a request
+        assert call(api_cls) is EaterCircuitOpenError
+        assert mocker.call_count == 4
+
+
+def test_below_threshold_stays_closed():
+    breaker = CircuitBreaker(failure_threshold=0.6, minimum_calls=4, window=4)
+    api_cls = create_api(breaker)
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(api_cls.url, [{'status_code': 503}, {'status_code': 503}, {'status_code': 404}, OK, OK, OK])
+        # Not enough calls yet
+        for _ in range(2):
+            call(api_cls)
+        assert breaker.get_state(api_cls) == 'closed'
+
+        # Client errors aren't failures
+        for _ in range(4):
+            call(api_cls)
+        assert breaker.get_state(api_cls) == 'closed'
+
+
+def test_half_open():
+    breaker = CircuitBreaker(minimum_calls=1, reset_timeout=10)
+    api_cls = create_api(breaker)
+    now = time.monotonic()
+
+    with requests_mock.Mocker() as mocker, mock.patch('eater.api.circuit.time.monotonic') as monotonic:
+        mocker.get(api_cls.url, [{'status_code': 503}, {'status_code': 503}, OK, OK])
+        monotonic.return_value = now
+
+        call(api_cls)
+        assert breaker.get_state(api_cls) == 'open'
+
+        # The probe fails, so the circuit reopens
+        monotonic.return_value = now + 10
+        assert call(api_cls) is EaterUnexpectedError
+        assert breaker.get_state(api_cls) == 'open'
+        assert call(api_cls) is EaterCircuitOpenError
+
+        # The probe succeeds, so the circuit closes
+        monotonic.return_value = now + 20
+        assert call(api_cls) is Book
+        assert breaker.get_state(api_cls) == 'closed'
+        assert call(api_cls) is Book
+        assert mocker.call_count == 4
+
+
+def test_half_open_calls_limited():
+    breaker = CircuitBreaker(minimum_calls=1, reset_timeout=0, half_open_calls=1)
+    key = 'key'
+    breaker.get_circuit(key).trip()
+
+    circuit = breaker.acquire(key)
+    assert circuit.state == 'half-open'
+    with pytest.raises(EaterCircuitOpenError):
+        breaker.acquire(key)
+    breaker.release(circuit)
+
+    # A cancelled probe releases its slot without closing the circuit
+    with pytest.raises(KeyboardInterrupt):
+        breaker.call(key, mock.Mock(side_effect=KeyboardInterrupt))
+    assert breaker.acquire(key).state == 'half-open'
+
+
+def test_per_class_and_host():
+    breaker = CircuitBreaker(minimum_calls=1)
+    first, second = create_api(breaker), create_api(breaker)
+    other = create_api(breaker, address='http://example.org/book/')
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(first.url, status_code=503)
+        mocker.get(other.url, **OK)
+        call(first)
+        assert call(first) is EaterCircuitOpenError
+        assert call(second) is EaterUnexpectedError
+
+    breaker = CircuitBreaker(minimum_calls=1, per='host')
+    first.circuit_breaker = second.circuit_breaker = other.circuit_breaker = breaker
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(first.url, status_code=503)
+        mocker.get(other.url, **OK)
+        call(first)
+        assert call(second) is EaterCircuitOpenError
+        assert call(other) is Book
+        assert breaker.get_state(('http', 'example.com')) == 'open'
+
+    with pytest.raises(ValueError):
+        CircuitBreaker(per='method')
+
+
+@mock.patch('eater.api.retry.time.sleep')
+def test_retries_stop_when_open(sleep):  # pylint: disable=unused-argument
+    api_cls = create_api(CircuitBreaker(minimum_calls=2))
+    api_cls.retry = RetryPolicy(attempts=5, retry_budget=None)
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(api_cls.url, status_code=503)
+        assert call(api_cls) is EaterCircuitOpenError
+        assert mocker.call_count == 2
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.codecs
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.codecs`
+"""
+import io
+from unittest import mock as unittest_mock
+
+import msgpack
+import pytest
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.types import IntType, StringType
+
+from eater import HTTPEater, EaterUnexpectedResponseError
+from eater.api import codecs
+from eater.api.codecs import (
+    CBORCodec, Codec, JSONCodec, MsgpackCodec, OrjsonCodec, format_accept, get_codec, get_media_codec,
+    parse_media_type, register_media_codec, set_default_codec
+)
+from eater.api.streaming import ChunkReader
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+
+class Book(Model):
+    id = IntType()  # pylint: disable=invalid-name
+    title = StringType()
+
+
+class UpdateBookAPI(HTTPEater):
+    url = 'http://example.com/books/{request_model.id}/'
+    method = 'post'
+    request_cls = Book
+    response_cls = Book
+
+
+class RecordingCodec(JSONCodec):
+    def __init__(self):
+        self.calls = []
+
+    def loads(self, data):
+        self.calls.append('loads')
+        return super().loads(data)
+
+    def dumps(self, obj):
+        self.calls.append('dumps')
+        return super().dumps(obj)
+
+
+@pytest.fixture
+def default_codec():
+    previous = codecs._default  # pylint: disable=protected-access
+    yield
+    codecs._default = previous  # pylint: disable=protected-access
+
+
+@pytest.fixture
+def media_codecs():
+    with unittest_mock.patch.dict(codecs._media_codecs):  # pylint: disable=protected-access
+        yield
+
+
+def test_json_codec():
+    codec = JSONCodec()
+    assert codec.loads(b'{"title": "Dune"}') == {'title': 'Dune'}
+    assert codec.dumps({'title': 'Dune'}) == b'{"title": "Dune"}'
+    with pytest.raises(ValueError):
+        codec.loads(b'{"title": ')
+    with pytest.raises(ValueError):
+        codec.dumps(float('nan'))
+
+
+def test_orjson_codec():
+    codec = OrjsonCodec()
+    assert codec.loads(b'{"title": "Dune"}') == {'title': 'Dune'}
+    assert codec.dumps({'title': 'Dune'}) == b'{"title":"Dune"}'
+    with pytest.raises(ValueError):
+        codec.loads(b'{"title": ')
+
+
+def test_orjson_codec_fallback():
+    codec = OrjsonCodec()
+    # Integers larger than 64 bits aren't supported by orjson
+    assert codec.loads(b'{"pages": 100000000000000000000}') == {'pages': 100000000000000000000}
+    assert codec.dumps({'pages': 100000000000000000000}) == b'{"pages": 100000000000000000000}'
+
+
+def test_get_codec():
+    assert type(get_codec('json')) is JSONCodec  # pylint: disable=unidiomatic-typecheck
+    assert type(get_codec('orjson')) is OrjsonCodec  # pylint: disable=unidiomatic-typecheck
+    assert type(get_codec('auto')) is OrjsonCodec  # pylint: disable=unidiomatic-typecheck
+
+    codec = RecordingCodec()
+    assert get_codec(codec) is codec
+
+    with pytest.raises(ValueError):
+        get_codec('yaml')
+
+
+def test_default_codec_stdlib(default_codec):  # pylint: disable=redefined-outer-name,unused-argument
+    codecs._default = None  # pylint: disable=protected-access
+    # orjson is installed but only used when asked for
+    assert type(get_codec()) is JSONCodec  # pylint: disable=unidiomatic-typecheck
+    assert type(UpdateBookAPI(id=1).json_codec) is JSONCodec  # pylint: disable=unidiomatic-typecheck
+
+
+def test_set_default_codec(default_codec):  # pylint: disable=redefined-outer-name,unused-argument
+    codec = RecordingCodec()
+    set_default_codec(codec)
+    assert get_codec() is codec
+    assert UpdateBookAPI(id=1).json_codec is codec
+
+    class JSONBookAPI(UpdateBookAPI):
+        json_codec = 'json'
+
+    assert type(JSONBookAPI(id=1).json_codec) is JSONCodec  # pylint: disable=unidiomatic-typecheck
+
+
+def test_request_encoded_with_codec():
+    codec = RecordingCodec()
+
+    class RecordingBookAPI(UpdateBookAPI):
+        json_codec = codec
+
+    with requests_mock.Mocker() as mock:
+        mock.post('http://example.com/books/1/', json={'id': 1, 'title': 'Dune'}, headers=JSON_HEADERS)
+        book = RecordingBookAPI(id=1, title='Dune')()
+
+        request = mock.request_history[0]
+        assert request.headers['Content-Type'] == 'application/json'
+        assert request.json() == {'id': 1, 'title': 'Dune'}
+
+    assert book.title == 'Dune'
+    assert codec.calls == ['dumps', 'loads']
+
+
+def test_request_content_type_preserved():
+    class VendorBookAPI(UpdateBookAPI):
+        def get_request_kwargs(self, request_model: Book, **kwargs) -> dict:
+            kwargs = super().get_request_kwargs(request_model, **kwargs)
+            kwargs['headers'] = {'content-type': 'application/vnd.books+json'}
+            return kwargs
+
+    with requests_mock.Mocker() as mock:
+        mock.post('http://example.com/books/1/', json={'id': 1}, headers=JSON_HEADERS)
+        VendorBookAPI(id=1)()
+        assert mock.request_history[0].headers['Content-Type'] == 'application/vnd.books+json'
+
+
+def test_invalid_json_response():
+    with requests_mock.Mocker() as mock:
+        mock.post('http://example.com/books/1/', text='{"id": ', headers=JSON_HEADERS)
+        with pytest.raises(EaterUnexpectedResponseError):
+            UpdateBookAPI(id=1)()
+
+
+def test_parse_media_type():
+    assert parse_media_type('Application/JSON; charset=utf-8') == 'application/json'
+    assert parse_media_type('application/msgpack') == 'application/msgpack'
+    assert parse_media_type('') == ''
+
+
+def test_format_accept():
+    assert format_accept(('application/json',)) == 'application/json'
+    assert format_accept(('application/msgpack', 'application/cbor', 'application/json')) == \
+        'application/msgpack, application/cbor;q=0.9, application/json;q=0.8'
+
+
+@pytest.mark.parametrize('codec_cls', [MsgpackCodec, CBORCodec])
+def test_binary_codecs(codec_cls):
+    codec = codec_cls()
+    data = {'id': 1, 'title': 'Dune', 'tags': ['sci-fi', None], 'rating': 4.5}
+    assert codec.loads(codec.dumps(data)) == data
+    with pytest.raises(ValueError):
+        codec.loads(b'\xc1')
+
+
+@pytest.mark.parametrize('codec_cls', [JSONCodec, MsgpackCodec, CBORCodec])
+def test_load(codec_cls):
+    codec = codec_cls()
+    data = {'id': 1, 'title': 'Dune', 'tags': ['sci-fi', None], 'rating': 4.5}
+    encoded = codec.dumps(data)
+    assert codec.load(ChunkReader(encoded[i:i + 3] for i in range(0, len(encoded), 3))) == data
+    with pytest.raises(ValueError):
+        codec.load(io.BytesIO(encoded[:-2]))
+
+
+def test_get_media_codec():
+    assert isinstance(get_media_codec('application/msgpack'), MsgpackCodec)
+    assert isinstance(get_media_codec('application/x-msgpack'), MsgpackCodec)
+    assert isinstance(get_media_codec('application/vnd.books+msgpack'), MsgpackCodec)
+    assert isinstance(get_media_codec('application/cbor'), CBORCodec)
+    assert get_media_codec('text/plain') is None
+
+
+def test_json_content_type_parameters():
+    with requests_mock.Mocker() as mock:
+        mock.post('http://example.com/books/1/', json={'id': 1, 'title': 'Dune'},
+                  headers={'Content-Type': 'application/json; charset=utf-8'})
+        assert UpdateBookAPI(id=1)().title == 'Dune'
+
+        mock.post('http://example.com/books/1/', json={'id': 1, 'title': 'Emma'},
+                  headers={'Content-Type': 'application/vnd.books+json'})
+        assert UpdateBookAPI(id=1)().title == 'Emma'
+
+
+def test_msgpack():
+    class MsgpackBookAPI(UpdateBookAPI):
+        request_content_type = 'application/msgpack'
+        accept = ('application/msgpack', 'application/json')
+
+    with requests_mock.Mocker() as mock:
+        mock.post('http://example.com/books/1/', content=msgpack.packb({'id': 1, 'title': 'Dune'}),
+                  headers={'Content-Type': 'application/msgpack'})
+        assert MsgpackBookAPI(id=1, title='Dune')().title == 'Dune'
+
+        request = mock.request_history[0]
+        assert request.headers['Content-Type'] == 'application/msgpack'
+        assert request.headers['Accept'] == 'application/msgpack, application/json;q=0.9'
+        assert msgpack.unpackb(request.body) == {'id': 1, 'title': 'Dune'}
+
+
+def test_register_media_codec(media_codecs):  # pylint: disable=redefined-outer-name,unused-argument
+    class LinesCodec(Codec):
+        name = 'lines'
+        media_types = ('text/x-book',)
+
+        def loads(self, data):
+            book_id, title = data.decode().splitlines()
+            return {'id': book_id, 'title': title}
+
+        def dumps(self, obj):
+            return ('%(id)s\n%(title)s' % obj).encode()
+
+    register_media_codec('text/x-book', LinesCodec())
+
+    class LinesBookAPI(UpdateBookAPI):
+        request_content_type = 'text/x-book'
+
+    with requests_mock.Mocker() as mock:
+        mock.post('http://example.com/books/1/', text='1\nDune', headers={'Content-Type': 'text/x-book'})
+        assert LinesBookAPI(id=1, title='Dune')().title == 'Dune'
+        assert mock.request_history[0].body == b'1\nDune'
+
+
+def test_unsupported_content_type():
+    class XMLBookAPI(UpdateBookAPI):
+        request_content_type = 'application/xml'
+
+    with pytest.raises(NotImplementedError):
+        XMLBookAPI(id=1)()
+
+
+def test_invalid_msgpack_response():
+    with requests_mock.Mocker() as mock:
+        mock.post('http://example.com/books/1/', content=b'\xc1', headers={'Content-Type': 'application/msgpack'})
+        with pytest.raises(EaterUnexpectedResponseError):
+            UpdateBookAPI(id=1)()
+
+
+def test_codec_not_installed(media_codecs):  # pylint: disable=redefined-outer-name,unused-argument
+    class MissingCodec(MsgpackCodec):
+        extra = 'missing'
+
+        def __init__(self):  # pylint: disable=super-init-not-called
+            import eater_missing_module  # pylint: disable=import-outside-toplevel,import-error,unused-import
+
+    register_media_codec('application/x-missing', MissingCodec)
+
+    with requests_mock.Mocker() as mock:
+        mock.post('http://example.com/books/1/', content=b'', headers={'Content-Type': 'application/x-missing'})
+        with pytest.raises(NotImplementedError, match=r'eater_missing_module.*eater\[missing\]'):
+            UpdateBookAPI(id=1)()
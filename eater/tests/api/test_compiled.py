@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.compiled
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.compiled`
+"""
+from unittest import mock
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.exceptions import DataError, ValidationError
+from schematics.types import (
+    BooleanType, DateTimeType, DictType, FloatType, IntType, ListType, ModelType, StringType
+)
+
+from eater import HTTPEater
+from eater.api.compiled import compile_model
+
+
+def must_be_upper(value):
+    if value != value.upper():
+        raise ValidationError('Must be upper case.')
+
+
+class Author(Model):
+    name = StringType(required=True, min_length=2)
+    age = IntType(min_value=0, max_value=150)
+
+
+class Book(Model):
+    title = StringType(required=True, min_length=3, serialized_name='Title')
+    isbn = StringType(regex=r'^\d+$')
+    code = StringType(validators=[must_be_upper])
+    genre = StringType(choices=['fiction', 'non-fiction'])
+    price = FloatType()
+    in_print = BooleanType(default=True)
+    published = DateTimeType()
+    tags = ListType(StringType(), max_size=3)
+    author = ModelType(Author)
+    authors = ListType(ModelType(Author))
+    editions = DictType(ModelType(Author))
+
+
+class Category(Model):
+    name = StringType()
+    children = ListType(ModelType('Category'))
+
+
+class Checked(Model):
+    name = StringType()
+
+    def validate_name(self, data, value):  # pylint: disable=no-self-use,unused-argument
+        if value == 'bad':
+            raise ValidationError('Bad name.')
+        return value
+
+
+def reference(model_cls, raw_data):
+    return model_cls(raw_data=raw_data, validate=True, partial=False)
+
+
+def outcome(func, model_cls, raw_data):
+    try:
+        return func(model_cls, raw_data).to_primitive()
+    except DataError as exc_info:
+        return exc_info.to_primitive()
+
+
+VALID = [
+    {'Title': 'Dune'},
+    {'title': 'Dune', 'isbn': '123', 'code': 'ABC', 'genre': 'fiction', 'price': 9.5, 'in_print': False},
+    {'Title': 'Dune', 'price': 9, 'published': '2016-12-09T07:17:38', 'tags': ['a', 'b']},
+    {'Title': 'Dune', 'author': {'name': 'Frank', 'age': 65}, 'authors': [{'name': 'Frank'}, None]},
+    {'Title': 'Dune', 'editions': {'first': {'name': 'Frank'}}, 'author': None},
+]
+
+INVALID = [
+    {},
+    {'Title': 'Du'},
+    {'Title': 'Dune', 'rogue': True},
+    {'Title': 'Dune', 'isbn': 'abc'},
+    {'Title': 'Dune', 'code': 'abc'},
+    {'Title': 'Dune', 'genre': 'poetry'},
+    {'Title': 'Dune', 'price': 'cheap'},
+    {'Title': 'Dune', 'tags': ['a', 'b', 'c', 'd']},
+    {'Title': 'Dune', 'author': {'name': 'F'}},
+    {'Title': 'Dune', 'author': {'name': 'Frank', 'age': -1}},
+    {'Title': 'Dune', 'authors': [{'name': 'Frank'}, {'age': 200}]},
+    {'Title': 'Dune', 'authors': 'Frank'},
+    {'Title': 'Dune', 'editions': {'first': {'name': 'F'}}},
+]
+
+
+@pytest.mark.parametrize('raw_data', VALID)
+def test_valid(raw_data):
+    compiled = compile_model(Book)
+    assert compiled.fields is not None
+    assert compiled(raw_data) == reference(Book, raw_data)
+    # The compiled path was taken, rather than falling back to schematics
+    assert compiled.build(raw_data) == reference(Book, raw_data)
+    assert outcome(lambda cls, data: compile_model(cls)(data), Book, raw_data) == outcome(reference, Book, raw_data)
+
+
+@pytest.mark.parametrize('raw_data', INVALID)
+def test_invalid_raises_same_errors(raw_data):
+    with pytest.raises(DataError):
+        compile_model(Book)(raw_data)
+    assert outcome(lambda cls, data: compile_model(cls)(data), Book, raw_data) == outcome(reference, Book, raw_data)
+
+
+def test_cached_per_class():
+    assert compile_model(Book) is compile_model(Book)
+    assert compile_model(Author) is not compile_model(Book)
+
+
+def test_recursive_model():
+    raw_data = {'name': 'root', 'children': [{'name': 'child', 'children': [{'name': 'grandchild'}]}]}
+    model = compile_model(Category)(raw_data)
+    assert model == reference(Category, raw_data)
+    assert model.children[0].children[0].name == 'grandchild'
+
+
+def test_model_validators_left_to_schematics():
+    compiled = compile_model(Checked)
+    assert compiled.fields is None
+    assert compiled({'name': 'good'}).name == 'good'
+    with pytest.raises(DataError):
+        compiled({'name': 'bad'})
+
+
+def test_opt_in():
+    class AuthorAPI(HTTPEater):
+        url = 'http://example.com/author/'
+        response_cls = Author
+
+    class CompiledAuthorAPI(AuthorAPI):
+        compiled_validation = True
+
+    headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+    with requests_mock.Mocker() as mocker, \
+            mock.patch('eater.api.validation.compile_model', wraps=compile_model) as compile_spy:
+        mocker.get(AuthorAPI.url, json={'name': 'Frank Herbert', 'age': 65}, headers=headers)
+        assert AuthorAPI()().name == 'Frank Herbert'
+        assert not compile_spy.called
+        assert CompiledAuthorAPI()().name == 'Frank Herbert'
+        compile_spy.assert_called_once_with(Author)
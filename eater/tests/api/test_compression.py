@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.compression
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.compression`
+"""
+import gzip
+import io
+import json
+import zlib
+
+import cbor2
+import pytest
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.types import IntType, ListType, StringType
+
+from eater import HTTPEater, EaterConnectError, EaterUnexpectedResponseError
+from eater.api.compression import ENCODINGS, compress, register_encoding
+
+
+class Book(Model):
+    id = IntType()  # pylint: disable=invalid-name
+    title = StringType()
+    tags = ListType(StringType())
+
+
+class UpdateBookAPI(HTTPEater):
+    url = 'http://example.com/books/1/'
+    method = 'post'
+    request_cls = Book
+    response_cls = Book
+    request_encoding = 'gzip'
+    request_compression_threshold = 100
+
+
+class StreamedBookAPI(HTTPEater):
+    url = 'http://example.com/books/1/'
+    response_cls = Book
+    stream_decoding = True
+    stream_chunk_size = 16
+
+
+BOOK = {'id': 1, 'title': 'Dune', 'tags': ['sci-fi'] * 50}
+
+
+def echo(request, context):
+    """
+    Respond with the decompressed request body.
+    """
+    context.headers['Content-Type'] = 'application/json'
+    if request.headers.get('Content-Encoding') == 'gzip':
+        return gzip.decompress(request.body)
+    return request.body
+
+
+def test_compress():
+    data = json.dumps(BOOK).encode()
+    assert gzip.decompress(compress(data, 'gzip')) == data
+    assert compress(data, 'gzip') == compress(data, 'GZIP')
+    assert zlib.decompress(compress(data, 'deflate', 9)) == data
+    assert len(compress(data, 'deflate')) < len(data)
+    with pytest.raises(ValueError):
+        compress(data, 'compress')
+
+
+def test_compress_brotli():
+    brotli = pytest.importorskip('brotli')
+    data = json.dumps(BOOK).encode()
+    assert brotli.decompress(compress(data, 'br')) == data
+
+
+def test_register_encoding(monkeypatch):
+    # Removed again once the test completes
+    monkeypatch.setitem(ENCODINGS, 'reversed', None)
+    register_encoding('Reversed', lambda data, level: data[::-1])
+    assert compress(b'abc', 'reversed') == b'cba'
+
+
+def test_request_compressed():
+    with requests_mock.Mocker() as mock:
+        mock.post(UpdateBookAPI.url, content=echo)
+
+        assert UpdateBookAPI(**BOOK)().tags == BOOK['tags']
+        request = mock.request_history[-1]
+        assert request.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(request.body)) == BOOK
+
+        # Too small to be worth compressing
+        assert UpdateBookAPI(id=1, title='Dune')().title == 'Dune'
+        assert 'Content-Encoding' not in mock.request_history[-1].headers
+
+
+def test_request_content_encoding_preserved():
+    class IdentityAPI(UpdateBookAPI):
+        def get_request_kwargs(self, request_model, **kwargs):
+            return dict(super().get_request_kwargs(request_model, **kwargs), headers={'Content-Encoding': 'identity'})
+
+    with requests_mock.Mocker() as mock:
+        mock.post(UpdateBookAPI.url, content=echo)
+        assert IdentityAPI(**BOOK)().id == 1
+        assert json.loads(mock.request_history[-1].body) == BOOK
+
+
+@pytest.mark.parametrize('content_type,dumps', [
+    ('application/json', lambda data: json.dumps(data).encode()),
+    ('application/cbor', cbor2.dumps),
+])
+def test_stream_decoding(content_type, dumps):
+    with requests_mock.Mocker() as mock:
+        mock.get(StreamedBookAPI.url, body=io.BytesIO(gzip.compress(dumps(BOOK))), headers=CaseInsensitiveDict({
+            'Content-Type': content_type,
+            'Content-Encoding': 'gzip',
+        }))
+        assert StreamedBookAPI()().tags == BOOK['tags']
+        assert mock.request_history[-1].stream
+
+
+def test_stream_decoding_errors():
+    def fail(request, context):  # pylint: disable=unused-argument
+        context.headers['Content-Type'] = 'application/json'
+        return FailingBody(b'{"id": 1, "title": "Du')
+
+    with requests_mock.Mocker() as mock:
+        mock.get(StreamedBookAPI.url, body=io.BytesIO(b'{"id": 1, "title": "Du'), headers={
+            'Content-Type': 'application/json'
+        })
+        with pytest.raises(EaterUnexpectedResponseError):
+            StreamedBookAPI()()
+
+        mock.get(StreamedBookAPI.url, body=fail)
+        with pytest.raises(EaterConnectError):
+            StreamedBookAPI()()
+
+
+class FailingBody(io.BytesIO):
+    """
+    A body that's cut off by the connection dropping.
+    """
+
+    def read(self, *args, **kwargs):
+        data = super().read(*args, **kwargs)
+        if not data:
+            raise ConnectionResetError()
+        return data
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.endpoint
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.endpoint`
+"""
+import pytest
+
+from eater.api.circuit import CircuitBreaker
+from eater.api.endpoint import PerEndpoint
+from eater.api.ratelimit import RateLimiter
+
+
+def test_get_key():
+    assert PerEndpoint('class').get_key(PerEndpoint, 'https://example.com/books/') is PerEndpoint
+    assert PerEndpoint('host').get_key(PerEndpoint, 'https://example.com/books/') == ('https', 'example.com')
+
+    with pytest.raises(ValueError):
+        PerEndpoint('url')
+
+
+def test_describe():
+    assert PerEndpoint.describe(PerEndpoint) == 'PerEndpoint'
+    assert PerEndpoint.describe(('https', 'example.com')) == "'https://example.com'"
+
+
+def test_shared():
+    assert CircuitBreaker(per='host').get_key(None, 'http://example.com/') == \
+        RateLimiter(10, per='host').get_key(None, 'http://example.com/')
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.hedge
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.hedge`
+"""
+import asyncio
+import io
+import threading
+import time
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.types import IntType, StringType
+
+from eater import HTTPEater, EaterConnectError, EaterUnexpectedError
+from eater.api.circuit import CircuitBreaker
+from eater.api.hedge import HedgePolicy, Timers
+from eater.api.ratelimit import RateLimiter
+from eater.api.retry import RetryBudget
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+URL = 'http://example.com/books/1/'
+
+
+class Book(Model):
+    id = IntType()  # pylint: disable=invalid-name
+    title = StringType()
+
+
+class GetBookAPI(HTTPEater):
+    url = URL
+    response_cls = Book
+
+
+def create_api(policy: HedgePolicy, **attrs) -> type:
+    return type('HedgedBookAPI', (GetBookAPI,), dict({'hedge': policy}, **attrs))
+
+
+def create_session(adapter: requests_mock.Adapter) -> requests.Session:
+    """
+    Create a session that sends requests with ``adapter`` - unlike ``requests_mock.Mocker``, an adapter doesn't send
+    requests one at a time.
+    """
+    session = requests.Session()
+    session.mount('http://', adapter)
+    return session
+
+
+def slow_first(release: threading.Event, first: dict, second: dict):
+    """
+    Create a requests_mock callback whose first request waits for ``release``.
+    """
+    calls = []
+
+    def respond(request, context):  # pylint: disable=unused-argument
+        calls.append(request)
+        if len(calls) == 1:
+            release.wait(5)
+            context.status_code = first.get('status_code', 200)
+            return first['json']
+        context.status_code = second.get('status_code', 200)
+        return second['json']
+
+    return respond
+
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_hedged(release):  # pylint: disable=redefined-outer-name
+    policy = HedgePolicy(delay=0.05)
+    adapter = requests_mock.Adapter()
+    adapter.register_uri('GET', URL, headers=JSON_HEADERS, json=slow_first(
+        release, {'json': {}, 'status_code': 503}, {'json': {'id': 1, 'title': 'Fast'}}
+    ))
+
+    threading.Timer(0.2, release.set).start()
+    assert create_api(policy)(_requests={'session': create_session(adapter)})().title == 'Fast'
+    assert adapter.call_count == 2
+    assert (policy.hedged, policy.won) == (1, 1)
+
+
+def test_slow_success_wins(release):  # pylint: disable=redefined-outer-name
+    policy = HedgePolicy(delay=0.05)
+    adapter = requests_mock.Adapter()
+    adapter.register_uri('GET', URL, headers=JSON_HEADERS, json=slow_first(
+        release, {'json': {'id': 1, 'title': 'Slow'}}, {'json': {'id': 1, 'title': 'Fast'}}
+    ))
+
+    # The first request is sent on the calling thread, which can't be interrupted
+    threading.Timer(0.2, release.set).start()
+    assert create_api(policy)(_requests={'session': create_session(adapter)})().title == 'Slow'
+    assert adapter.call_count == 2
+    assert (policy.hedged, policy.won) == (1, 0)
+
+
+def test_not_hedged_when_fast():
+    policy = HedgePolicy(delay=1)
+
+    with requests_mock.Mocker() as mock:
+        mock.get(URL, headers=JSON_HEADERS, json={'id': 1, 'title': 'Dune'})
+        assert create_api(policy)()().title == 'Dune'
+        assert mock.call_count == 1
+
+    assert policy.hedged == 0
+
+
+def test_error_before_delay_not_hedged():
+    policy = HedgePolicy(delay=1)
+
+    with requests_mock.Mocker() as mock:
+        mock.get(URL, exc=requests.ConnectionError)
+        with pytest.raises(EaterConnectError):
+            create_api(policy)()()
+        assert mock.call_count == 1
+
+
+def test_server_error_loses(release):  # pylint: disable=redefined-outer-name
+    policy = HedgePolicy(delay=0.05)
+    adapter = requests_mock.Adapter()
+    adapter.register_uri('GET', URL, headers=JSON_HEADERS, json=slow_first(
+        release, {'json': {'id': 1, 'title': 'Slow'}}, {'json': {}, 'status_code': 503}
+    ))
+
+    threading.Timer(0.2, release.set).start()
+    assert create_api(policy)(_requests={'session': create_session(adapter)})().title == 'Slow'
+    assert adapter.call_count == 2
+    assert (policy.hedged, policy.won) == (1, 0)
+
+
+def test_budget(release):  # pylint: disable=redefined-outer-name
+    policy = HedgePolicy(delay=0.05, hedge_budget=RetryBudget(ratio=0, minimum=0))
+    adapter = requests_mock.Adapter()
+    adapter.register_uri('GET', URL, headers=JSON_HEADERS, json=slow_first(
+        release, {'json': {'id': 1, 'title': 'Slow'}}, {'json': {'id': 1, 'title': 'Fast'}}
+    ))
+
+    threading.Timer(0.2, release.set).start()
+    assert create_api(policy)(_requests={'session': create_session(adapter)})().title == 'Slow'
+    assert adapter.call_count == 1
+    assert policy.hedged == 0
+
+
+def test_duplicate_rate_limited(release):  # pylint: disable=redefined-outer-name
+    policy = HedgePolicy(delay=0.05)
+    adapter = requests_mock.Adapter()
+    adapter.register_uri('GET', URL, headers=JSON_HEADERS, json=slow_first(
+        release, {'json': {}, 'status_code': 503}, {'json': {'id': 1, 'title': 'Fast'}}
+    ))
+
+    # The duplicate needs a token of its own, which the limit doesn't allow
+    api_cls = create_api(policy, rate_limit=RateLimiter(1, 'minute', max_wait=0))
+    threading.Timer(0.2, release.set).start()
+    with pytest.raises(EaterUnexpectedError):
+        api_cls(_requests={'session': create_session(adapter)})()
+    assert adapter.call_count == 1
+    assert (policy.hedged, policy.won) == (1, 0)
+
+
+def test_duplicate_circuit_outcome(release):  # pylint: disable=redefined-outer-name
+    policy = HedgePolicy(delay=0.05)
+    breaker = CircuitBreaker()
+    adapter = requests_mock.Adapter()
+    adapter.register_uri('GET', URL, headers=JSON_HEADERS, json=slow_first(
+        release, {'json': {}, 'status_code': 503}, {'json': {'id': 1, 'title': 'Fast'}}
+    ))
+
+    api_cls = create_api(policy, circuit_breaker=breaker)
+    threading.Timer(0.2, release.set).start()
+    assert api_cls(_requests={'session': create_session(adapter)})().title == 'Fast'
+
+    # The duplicate's success and the first request's failure were each recorded
+    assert list(breaker.get_circuit(breaker.get_key(api_cls, URL)).outcomes) == [False, True]
+
+
+def test_post_not_hedged():
+    policy = HedgePolicy(delay=0)
+
+    with requests_mock.Mocker() as mock:
+        mock.post(URL, headers=JSON_HEADERS, json={'id': 1, 'title': 'Dune'})
+        assert create_api(policy, method='post')()().title == 'Dune'
+        assert mock.call_count == 1
+
+
+def test_call_threads():
+    policy = HedgePolicy(delay=0.05)
+    threads = []
+
+    def respond(status_code: int, seconds: float=0):
+        def send():
+            threads.append(threading.current_thread())
+            time.sleep(seconds)
+            response = requests.Response()
+            response.status_code = status_code
+            response.raw = io.BytesIO()
+            return response
+        return send
+
+    assert policy.call(respond(503, 0.2), respond(200)).status_code == 200
+    policy.shutdown()
+
+    # Only the duplicate is sent from the pool
+    assert len(threads) == 2
+    primary, hedge = threads[0], threads[1]
+    assert primary is threading.current_thread()
+    assert hedge is not primary
+    assert (policy.hedged, policy.won) == (1, 1)
+
+
+def test_timers():
+    timers = Timers()
+    called = []
+    done = threading.Event()
+
+    cancelled = timers.schedule(0.01, lambda: called.append('cancelled'))
+    timers.schedule(0.05, lambda: (called.append('second'), done.set()))
+    timers.schedule(0.02, lambda: called.append('first'))
+    assert timers.cancel(cancelled)
+
+    assert done.wait(5)
+    assert called == ['first', 'second']
+    assert not timers.cancel(cancelled)
+
+
+def test_percentile_delay():
+    policy = HedgePolicy(delay=5, percentile=90, min_samples=10)
+    for latency in range(1, 10):
+        policy.observe(latency / 100)
+    assert policy.get_delay() == 5
+
+    policy.observe(0.10)
+    assert policy.get_delay() == 0.10
+
+    # Only recalculated every 16 samples
+    for _ in range(5):
+        policy.observe(0.01)
+    assert policy.get_delay() == 0.10
+    policy.observe(0.01)
+    assert policy.get_delay() == 0.09
+
+    for _ in range(16):
+        policy.observe(0.01)
+    assert policy.get_delay() == 0.07
+
+
+def test_acall():
+    policy = HedgePolicy(delay=0.05)
+    calls = []
+    cancelled = []
+
+    async def send():
+        calls.append(len(calls))
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'slow' if len(calls) == 1 else 'fast'
+        try:
+            await asyncio.sleep(5 if len(calls) == 1 else 0)
+        except asyncio.CancelledError:
+            cancelled.append(response.reason)
+            raise
+        return response
+
+    assert asyncio.run(policy.acall(send)).reason == 'fast'
+    assert cancelled == ['slow']
+    assert (policy.hedged, policy.won) == (1, 1)
@@ -6,6 +6,7 @@
 
     Tests on :py:mod:`eater.api.http`
 """
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 
 import pytest
@@ -403,3 +404,56 @@ def test_non_json_content_response():
         )
         with pytest.raises(NotImplementedError):
             api()
+
+
+def test_call():
+    class Person(Model):
+        pk = IntType()  # pylint: disable=invalid-name
+        name = StringType()
+
+    class GetPersonAPI(HTTPEater):
+        request_cls = Person
+        response_cls = Person
+        url = 'http://example.com/person/{request_model.pk}/'
+
+        def get_request_kwargs(self, request_model: Union[Model, None], **kwargs):
+            kwargs['url'] = self.url + '?full=1'
+            return kwargs
+
+    api = GetPersonAPI()
+
+    with requests_mock.Mocker() as mock:
+        mock.get('http://example.com/person/1/?full=1', json={'pk': 1, 'name': 'John'}, headers=JSON_HEADERS)
+        mock.get('http://example.com/person/2/?full=1', json={'pk': 2, 'name': 'Jane'}, headers=JSON_HEADERS)
+
+        assert api.call(pk=1).name == 'John'
+        assert api.call(Person({'pk': 2})).name == 'Jane'
+        assert api.call(pk=1, _request_kwargs={'timeout': 5}).name == 'John'
+        assert mock.request_history[-1].timeout == 5
+
+    # The instance itself is unchanged
+    assert api.request_model.pk is None
+    assert api.url == 'http://example.com/person/None/'
+
+
+def test_call_threads():
+    class Person(Model):
+        pk = IntType()  # pylint: disable=invalid-name
+
+    class GetPersonAPI(HTTPEater):
+        request_cls = Person
+        response_cls = Person
+        url = 'http://example.com/person/{request_model.pk}/'
+
+    api = GetPersonAPI()
+
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            requests_mock.ANY,
+            json=lambda request, context: {'pk': int(request.path.strip('/').split('/')[-1])},
+            headers=JSON_HEADERS
+        )
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda pk: api.call(pk=pk), range(100)))
+
+    assert [response.pk for response in responses] == list(range(100))
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.lazy
+    ~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.lazy`
+"""
+import threading
+import time
+from unittest import mock as unittest_mock
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.exceptions import DataError, ValidationError
+from schematics.types import IntType, ListType, ModelType, StringType
+
+from eater import HTTPEater
+from eater.api import lazy
+from eater.api.lazy import LazyModel, build_lazy
+from eater.api.validation import get_validation_policy
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+
+class Book(Model):
+    title = StringType(required=True, min_length=3)
+    pages = IntType(min_value=1)
+
+
+class BookListResponse(Model):
+    count = IntType(required=True)
+    books = ListType(ModelType(Book))
+    featured = ModelType(Book)
+
+
+class BookListAPI(HTTPEater):
+    url = 'http://example.com/books/'
+    response_cls = BookListResponse
+    validation = 'lazy'
+
+
+VALID = {'count': '2', 'books': [{'title': 'Dune', 'pages': 412}, {'title': 'Emma'}], 'featured': {'title': 'Dune'}}
+
+# Only a nested field is invalid
+DRIFTED = {'count': 2, 'books': [{'title': 'Dune'}, {'title': 'Ox', 'pages': 0}], 'featured': {'title': 'Ox'}}
+
+
+@pytest.mark.parametrize('compiled', [True, False])
+def test_fields_converted_on_access(compiled):
+    model = build_lazy(BookListResponse, VALID, compiled)
+    assert isinstance(model, LazyModel)
+    assert model.count == 2
+    assert model._pending.keys() == {'books', 'featured'}  # pylint: disable=protected-access
+
+    books = model.books
+    assert [book.title for book in books] == ['Dune', 'Emma']
+    assert model.books is books
+    assert model._pending.keys() == {'featured'}  # pylint: disable=protected-access
+    assert model['featured'].title == 'Dune'
+
+
+@pytest.mark.parametrize('compiled', [True, False])
+def test_top_level_validated_immediately(compiled):
+    with pytest.raises(DataError):
+        build_lazy(BookListResponse, {'books': []}, compiled)
+    with pytest.raises(DataError):
+        build_lazy(BookListResponse, {'count': 'many'}, compiled)
+    with pytest.raises(DataError):
+        build_lazy(BookListResponse, {'count': 1, 'author': 'Frank Herbert'}, compiled)
+
+
+@pytest.mark.parametrize('compiled', [True, False])
+def test_invalid_field_raises_on_access(compiled):
+    model = build_lazy(BookListResponse, DRIFTED, compiled)
+    assert model.count == 2
+
+    with pytest.raises(DataError) as exc_info:
+        model.books  # pylint: disable=pointless-statement
+    assert isinstance(exc_info.value.errors['books'][1]['title'], ValidationError)
+
+    with pytest.raises(DataError) as exc_info:
+        model.validate_all()
+    assert set(exc_info.value.errors) == {'books', 'featured'}
+
+
+@pytest.mark.parametrize('compiled', [True, False])
+def test_validate_all(compiled):
+    model = build_lazy(BookListResponse, VALID, compiled)
+    books = model.books
+    full = model.validate_all()
+
+    assert type(full) is BookListResponse  # pylint: disable=unidiomatic-typecheck
+    assert full.books is books
+    assert model.validate_all() is full
+    assert model == BookListResponse(VALID)
+    assert model.to_primitive() == full.to_primitive()
+
+
+def test_concurrent_access():
+    model = build_lazy(BookListResponse, VALID)
+    barrier = threading.Barrier(8)
+    results, errors = [], []
+    convert_field = lazy.convert_field
+
+    def slow_convert_field(*args):
+        # Widen the window in which every thread is converting the same field
+        time.sleep(0.01)
+        return convert_field(*args)
+
+    def read():
+        barrier.wait()
+        try:
+            results.append(model.books)
+        except Exception as exc_info:  # pylint: disable=broad-except
+            errors.append(exc_info)
+
+    with unittest_mock.patch('eater.api.lazy.convert_field', slow_convert_field):
+        threads = [threading.Thread(target=read) for _ in range(barrier.parties)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert not errors
+    assert len(results) == barrier.parties
+    assert all(books is results[0] for books in results)
+    assert model.validate_all().books is results[0]
+    # Loading a field that has already been loaded returns the kept value
+    assert model._load('books') is results[0]  # pylint: disable=protected-access
+
+
+def test_set_field():
+    model = build_lazy(BookListResponse, VALID)
+    model.books = []
+    assert model.validate_all().books == []
+
+    model.count = 3
+    assert model.validate_all().count == 3
+
+
+def test_model_validators_not_lazy():
+    class CheckedResponse(BookListResponse):
+        def validate_count(self, data, value):  # pylint: disable=no-self-use
+            if value != len(data['books']):
+                raise ValidationError('count is wrong')
+            return value
+
+    model = build_lazy(CheckedResponse, VALID)
+    assert type(model) is CheckedResponse  # pylint: disable=unidiomatic-typecheck
+    with pytest.raises(DataError):
+        build_lazy(CheckedResponse, dict(VALID, count=3))
+
+
+def test_policy():
+    assert get_validation_policy('lazy').name == 'lazy'
+
+    with requests_mock.Mocker() as mock:
+        mock.get('http://example.com/books/', json=DRIFTED, headers=JSON_HEADERS)
+        response = BookListAPI()()
+
+    assert response.count == 2
+    with pytest.raises(DataError):
+        response.validate_all()
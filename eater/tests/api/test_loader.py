@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.loader
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.loader`
+"""
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.types import IntType, ListType, ModelType, StringType
+
+from eater import HTTPEater, EaterUnexpectedError, EaterUnexpectedResponseError
+from eater.api.loader import BatchLoader
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+TITLES = {1: 'Dune', 2: 'Emma', 3: 'Ulysses', 4: 'Persuasion', 5: 'Beloved', 6: 'Middlemarch'}
+
+
+class Book(Model):
+    id = IntType()  # pylint: disable=invalid-name
+    title = StringType()
+
+
+class BookListRequest(Model):
+    ids = ListType(IntType())
+
+
+class BookListResponse(Model):
+    books = ListType(ModelType(Book))
+
+
+class GetBooksAPI(HTTPEater):
+    url = 'http://example.com/books/'
+    request_cls = BookListRequest
+    response_cls = BookListResponse
+
+    def get_request_kwargs(self, request_model, **kwargs):
+        return dict(kwargs, params={'ids': ','.join(str(pk) for pk in request_model.ids)})
+
+
+def create_loader(batch_cls: type=GetBooksAPI, **kwargs) -> BatchLoader:
+    return BatchLoader(
+        batch_cls,
+        batch_kwargs=lambda models: {'ids': [model.id for model in models]},
+        request_key=lambda model: model.id,
+        response_key=lambda book: book.id,
+        **kwargs
+    )
+
+
+def create_api(loader: BatchLoader) -> type:
+    class GetBookAPI(HTTPEater):
+        url = 'http://example.com/books/{request_model.id}/'
+        request_cls = Book
+        response_cls = Book
+        batch_loader = loader
+
+    return GetBookAPI
+
+
+def list_books(request, context):  # pylint: disable=unused-argument
+    ids = [int(pk) for pk in parse_qs(urlsplit(request.url).query)['ids'][0].split(',')]
+    return {'books': [{'id': pk, 'title': TITLES[pk]} for pk in ids if pk in TITLES]}
+
+
+def test_batched():
+    loader = create_loader(max_batch_size=3, window=1)
+    api_cls = create_api(loader)
+
+    with requests_mock.Mocker() as mock:
+        mock.get(GetBooksAPI.url, headers=JSON_HEADERS, json=list_books)
+        results = list(api_cls.map([{'id': pk} for pk in range(1, 7)], concurrency=6))
+
+    assert [result.response.title for result in results] == [TITLES[pk] for pk in range(1, 7)]
+    assert mock.call_count == 2
+    assert sorted(len(request.qs['ids'][0].split(',')) for request in mock.request_history) == [3, 3]
+    assert (loader.batches, loader.loaded) == (2, 6)
+
+
+def test_single_call():
+    loader = create_loader(window=0.01)
+
+    with requests_mock.Mocker() as mock:
+        mock.get(GetBooksAPI.url, headers=JSON_HEADERS, json=list_books)
+        assert create_api(loader)(id=2)().title == 'Emma'
+        assert mock.request_history[0].qs == {'ids': ['2']}
+
+
+def test_duplicates_and_missing():
+    loader = create_loader(window=0.5)
+    api_cls = create_api(loader)
+
+    with requests_mock.Mocker() as mock:
+        mock.get(GetBooksAPI.url, headers=JSON_HEADERS, json=list_books)
+        results = list(api_cls.map([{'id': 1}, {'id': 7}, {'id': 1}], concurrency=3))
+
+    assert mock.call_count == 1
+    assert mock.request_history[0].qs['ids'][0] in ('1,7', '7,1')
+    assert results[0].response.title == results[2].response.title == 'Dune'
+    assert isinstance(results[1].error, EaterUnexpectedResponseError)
+
+
+def test_batch_error():
+    loader = create_loader(window=0.5)
+
+    with requests_mock.Mocker() as mock:
+        mock.get(GetBooksAPI.url, status_code=503)
+        results = list(create_api(loader).map([{'id': 1}, {'id': 2}], concurrency=2))
+
+    assert mock.call_count == 1
+    assert all(isinstance(result.error, EaterUnexpectedError) for result in results)
+
+
+def test_response_cls_built():
+    class Title(Model):
+        id = IntType()  # pylint: disable=invalid-name
+        title = StringType(required=True)
+
+    loader = create_loader(window=0.01)
+
+    class GetTitleAPI(create_api(loader)):
+        response_cls = Title
+
+    with requests_mock.Mocker() as mock:
+        mock.get(GetBooksAPI.url, headers=JSON_HEADERS, json=list_books)
+        assert GetTitleAPI(id=3)() == Title({'id': 3, 'title': 'Ulysses'})
+
+
+def test_request_kwargs():
+    with pytest.raises(TypeError):
+        create_api(create_loader())(id=1)(timeout=1)
+
+
+def test_items_field():
+    class AmbiguousResponse(BookListResponse):
+        others = ListType(ModelType(Book))
+
+    class AmbiguousAPI(GetBooksAPI):
+        response_cls = AmbiguousResponse
+
+    with requests_mock.Mocker() as mock:
+        mock.get(GetBooksAPI.url, headers=JSON_HEADERS, json=lambda request, context: {
+            'books': [{'id': 1, 'title': 'Dune'}], 'others': [{'id': 1, 'title': 'Other'}]
+        })
+
+        with pytest.raises(TypeError):
+            create_api(create_loader(AmbiguousAPI, window=0.01))(id=1)()
+
+        assert create_api(create_loader(AmbiguousAPI, window=0.01, items_field='others'))(id=1)().title == 'Other'
+
+
+def test_aload():
+    pytest.importorskip('aiohttp')
+    from aiohttp import web  # pylint: disable=import-outside-toplevel
+    from aiohttp.test_utils import TestServer  # pylint: disable=import-outside-toplevel
+
+    from eater import AsyncHTTPEater  # pylint: disable=import-outside-toplevel
+
+    requested = []
+
+    async def list_books_handler(request):
+        ids = [int(pk) for pk in request.query['ids'].split(',')]
+        requested.append(ids)
+        return web.json_response({'books': [{'id': pk, 'title': TITLES[pk]} for pk in ids]})
+
+    async def test():
+        app = web.Application()
+        app.router.add_get('/books/', list_books_handler)
+        server = TestServer(app)
+        await server.start_server()
+        base_url = 'http://%s:%s' % (server.host, server.port)
+
+        class AsyncGetBooksAPI(AsyncHTTPEater):
+            url = base_url + '/books/'
+            request_cls = BookListRequest
+            response_cls = BookListResponse
+            get_request_kwargs = GetBooksAPI.get_request_kwargs
+
+        class AsyncGetBookAPI(AsyncHTTPEater):
+            url = base_url + '/books/{request_model.id}/'
+            request_cls = Book
+            response_cls = Book
+            batch_loader = create_loader(AsyncGetBooksAPI, max_batch_size=4, window=1)
+
+        try:
+            return await asyncio.gather(*[AsyncGetBookAPI(id=pk)() for pk in range(1, 7)])
+        finally:
+            await AsyncHTTPEater.session_registry.close()
+            await server.close()
+
+    books = asyncio.run(test())
+    assert [book.title for book in books] == [TITLES[pk] for pk in range(1, 7)]
+    assert requested == [[1, 2, 3, 4], [5, 6]]
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.memo
+    ~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.memo`
+"""
+from unittest import mock
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.exceptions import DataError
+from schematics.types import IntType, ListType, ModelType, PolyModelType, StringType
+
+from eater import HTTPEater
+from eater.api.memo import ModelMemo
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+URL = 'http://example.com/books/'
+
+
+class Book(Model):
+    id = IntType()  # pylint: disable=invalid-name
+    title = StringType(min_length=2)
+
+
+class BookListResponse(Model):
+    books = ListType(ModelType(Book))
+
+
+class ShelfResponse(Model):
+    item = PolyModelType([Book])
+
+
+class BookListAPI(HTTPEater):
+    url = URL
+    response_cls = BookListResponse
+
+
+def call(api_cls: type, *responses) -> list:
+    """
+    Call ``api_cls`` once for each response, returning the models.
+    """
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, [dict(response, headers=JSON_HEADERS) for response in responses])
+        return [api_cls()() for _ in responses]
+
+
+def test_memo():
+    class MemoAPI(BookListAPI):
+        memo = ModelMemo()
+
+    api_cls, memo = MemoAPI, MemoAPI.memo
+    dune = {'json': {'books': [{'id': 1, 'title': 'Dune'}]}}
+    emma = {'json': {'books': [{'id': 2, 'title': 'Emma'}]}}
+
+    with mock.patch.object(api_cls, 'decode_response', wraps=api_cls().decode_response) as decode:
+        first, second, third, fourth = call(api_cls, dune, dune, emma, dune)
+        assert decode.call_count == 2
+
+    assert first is second is fourth
+    assert third.books[0].title == 'Emma'
+    assert (memo.hits, memo.misses, len(memo)) == (2, 2, 2)
+
+
+def test_memo_copy():
+    class MemoAPI(BookListAPI):
+        memo = ModelMemo(copy=True)
+
+    api_cls, memo = MemoAPI, MemoAPI.memo
+    dune = {'json': {'books': [{'id': 1, 'title': 'Dune'}]}}
+
+    first, second, third = call(api_cls, dune, dune, dune)
+    first.books[0].title = 'Changed'
+    second.books.append(Book({'id': 2}))
+
+    assert third is not second
+    assert third.books is not second.books
+    assert third.to_primitive() == {'books': [{'id': 1, 'title': 'Dune'}]}
+    assert memo.hits == 2
+
+
+def test_memo_copy_unsupported():
+    class ShelfAPI(BookListAPI):
+        response_cls = ShelfResponse
+        memo = ModelMemo(copy=True)
+
+    api_cls, memo = ShelfAPI, ShelfAPI.memo
+    first, second = call(api_cls, {'json': {'item': None}}, {'json': {'item': None}})
+    assert first is not second
+    assert len(memo) == 0
+
+
+def test_memo_keys():
+    class MemoAPI(BookListAPI):
+        memo = ModelMemo()
+
+    class TypesOnlyAPI(MemoAPI):
+        validation = 'types-only'
+
+    body = {'json': {'books': [{'id': 1, 'title': 'D'}]}}
+
+    types_only, = call(TypesOnlyAPI, body)
+    assert types_only.books[0].title == 'D'
+
+    # The same body isn't served to an eater validating it more thoroughly
+    with pytest.raises(DataError):
+        call(MemoAPI, body)
+
+    assert MemoAPI.memo.hits == 0
+
+
+def test_memo_maxsize():
+    class MemoAPI(BookListAPI):
+        memo = ModelMemo(maxsize=2)
+
+    api_cls, memo = MemoAPI, MemoAPI.memo
+    bodies = [{'json': {'books': [{'id': index}]}} for index in range(3)]
+
+    call(api_cls, *bodies)
+    assert len(memo) == 2
+
+    call(api_cls, bodies[0], bodies[2])
+    assert memo.hits == 1
+
+    memo.clear()
+    assert len(memo) == 0
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.offload
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.offload`
+"""
+import datetime
+from unittest import mock
+
+import msgpack
+import pytest
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.exceptions import DataError
+from schematics.types import (
+    DateTimeType, DictType, IntType, ListType, ModelType, PolyModelType, StringType
+)
+
+from eater import HTTPEater, EaterUnexpectedResponseError
+from eater.api.offload import ProcessOffload, dump, is_restorable, restore
+from eater.api.timing import CallTiming
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+URL = 'http://example.com/books/'
+
+
+# Models are defined at module level so worker processes can import them
+
+class Author(Model):
+    name = StringType(required=True, min_length=2)
+
+
+class Book(Model):
+    id = IntType(required=True)  # pylint: disable=invalid-name
+    title = StringType(serialized_name='name')
+    published = DateTimeType()
+    authors = ListType(ModelType(Author))
+    editions = DictType(ModelType(Author))
+
+
+class BookListResponse(Model):
+    count = IntType()
+    books = ListType(ModelType(Book))
+
+
+class ShelfResponse(Model):
+    item = PolyModelType([Book, Author])
+
+
+BOOKS = {
+    'count': 2,
+    'books': [
+        {'id': 1, 'name': 'Dune', 'published': '1965-08-01T00:00:00', 'authors': [{'name': 'Frank Herbert'}],
+         'editions': {'uk': {'name': 'Gollancz'}}},
+        {'id': '2', 'name': 'Emma'},
+    ],
+}
+
+
+class BookListAPI(HTTPEater):
+    url = URL
+    response_cls = BookListResponse
+
+
+@pytest.fixture(scope='module')
+def pool():
+    offload = ProcessOffload(threshold=100, max_workers=1)
+    yield offload
+    offload.shutdown()
+
+
+def check_books(model: BookListResponse):
+    assert isinstance(model, BookListResponse)
+    assert model.count == 2
+    dune, emma = model.books
+    assert dune.title == 'Dune'
+    assert dune.published == datetime.datetime(1965, 8, 1)
+    assert dune.authors[0].name == 'Frank Herbert'
+    assert dune.editions['uk'].name == 'Gollancz'
+    assert emma.id == 2
+    assert emma.authors is None
+
+
+def test_dump_restore():
+    model = BookListResponse(BOOKS)
+    restored = restore(BookListResponse, dump(model))
+    assert restored == model
+    assert restored.to_primitive() == model.to_primitive()
+    check_books(restored)
+
+
+def test_is_restorable():
+    assert is_restorable(BookListResponse)
+    assert not is_restorable(ShelfResponse)
+
+
+def test_offload(pool):  # pylint: disable=redefined-outer-name
+    class OffloadedAPI(BookListAPI):
+        offload = pool
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, json=BOOKS, headers=JSON_HEADERS)
+        with mock.patch('eater.api.offload.restore', wraps=restore) as restored:
+            model = OffloadedAPI()()
+            assert restored.called
+
+    check_books(model)
+    model.validate()
+    assert model.to_primitive() == BookListResponse(BOOKS).to_primitive()
+
+
+@pytest.mark.parametrize('validation', ['full', 'types-only'])
+def test_offload_invalid(pool, validation):  # pylint: disable=redefined-outer-name
+    class OffloadedAPI(BookListAPI):
+        offload = pool
+
+    invalid = {'count': 'many', 'books': [{'id': 1, 'authors': [{'name': 'F'}]}]}
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, json=invalid, headers=JSON_HEADERS)
+        with pytest.raises(DataError) as exc_info:
+            OffloadedAPI(_validation=validation)()
+
+    assert 'count' in exc_info.value.errors
+    assert ('books' in exc_info.value.errors) == (validation == 'full')
+
+
+def test_offload_undecodable(pool):  # pylint: disable=redefined-outer-name
+    class OffloadedAPI(BookListAPI):
+        offload = pool
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, text='{"count": 2, "books": [' + ' ' * 100, headers=JSON_HEADERS)
+        with pytest.raises(EaterUnexpectedResponseError):
+            OffloadedAPI()()
+
+
+def test_offload_msgpack(pool):  # pylint: disable=redefined-outer-name
+    class OffloadedAPI(BookListAPI):
+        offload = pool
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, content=msgpack.packb(BOOKS), headers={'Content-Type': 'application/msgpack'})
+        check_books(OffloadedAPI()())
+
+
+def test_not_offloaded(pool):  # pylint: disable=redefined-outer-name
+    class OffloadedAPI(BookListAPI):
+        offload = pool
+
+    with requests_mock.Mocker() as mocker, mock.patch.object(pool, 'build') as build:
+        mocker.get(URL, json={'count': 0, 'books': []}, headers=JSON_HEADERS)
+        assert OffloadedAPI()().count == 0
+
+        mocker.get(URL, json=BOOKS, headers=JSON_HEADERS)
+        check_books(OffloadedAPI(_validation='sampled')())
+
+    assert not build.called
+
+
+def test_offload_timing(pool):  # pylint: disable=redefined-outer-name
+    timings = []
+
+    class OffloadedAPI(BookListAPI):
+        offload = pool
+        timing_listeners = (timings.append,)
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, json=BOOKS, headers=JSON_HEADERS)
+        OffloadedAPI()()
+
+    assert len(timings) == 1
+    timing = timings[0]
+    assert isinstance(timing, CallTiming)
+    assert timing.phases['offload'] > 0
+    assert 'validate' not in timing.phases
+
+
+def test_requires_shared_memory():
+    with mock.patch('sys.version_info', (3, 7, 9)):
+        with pytest.raises(RuntimeError):
+            ProcessOffload()
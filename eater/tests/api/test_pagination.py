@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.pagination
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.pagination`
+"""
+import threading
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.types import IntType, ListType, ModelType, StringType
+
+from eater import EaterUnexpectedError, PaginatedHTTPEater
+from eater.api.pagination import (
+    CursorPagination, LinkHeaderPagination, OffsetPagination, PageNumberPagination, set_query_params
+)
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+BOOKS = [{'id': index} for index in range(7)]
+
+
+class Book(Model):
+    id = IntType()  # pylint: disable=invalid-name
+
+
+class BookListResponse(Model):
+    books = ListType(ModelType(Book))
+    next_cursor = StringType()
+
+
+class BookListAPI(PaginatedHTTPEater):
+    url = 'http://example.com/books/?sort=id'
+    response_cls = BookListResponse
+
+
+def ids(books) -> list:
+    return [book.id for book in books]
+
+
+def test_set_query_params():
+    assert set_query_params('http://example.com/?a=1&b=2', b=3, c='x y') == 'http://example.com/?a=1&b=3&c=x+y'
+
+
+@pytest.mark.parametrize('prefetch', [0, 1, 3])
+def test_page_number(prefetch):
+    class PageAPI(BookListAPI):
+        pagination = PageNumberPagination(size=3, size_param='per_page')
+
+    PageAPI.prefetch = prefetch
+
+    def books(request, context):  # pylint: disable=unused-argument
+        assert request.qs['sort'] == ['id']
+        assert request.qs['per_page'] == ['3']
+        page = int(request.qs['page'][0])
+        return {'books': BOOKS[(page - 1) * 3:page * 3]}
+
+    with requests_mock.Mocker() as mock:
+        mock.get('http://example.com/books/', json=books, headers=JSON_HEADERS)
+        assert ids(PageAPI()) == list(range(7))
+        assert [request.qs['page'] for request in mock.request_history] == [['1'], ['2'], ['3']]
+
+
+def test_page_number_until_empty():
+    def books(request, context):  # pylint: disable=unused-argument
+        page = int(request.qs['page'][0])
+        return {'books': BOOKS[(page - 1) * 3:page * 3]}
+
+    with requests_mock.Mocker() as mock:
+        mock.get('http://example.com/books/', json=books, headers=JSON_HEADERS)
+        pages = list(BookListAPI().pages())
+        assert [len(page.items) for page in pages] == [3, 3, 1, 0]
+        assert [page.number for page in pages] == [0, 1, 2, 3]
+
+
+def test_offset():
+    class OffsetAPI(BookListAPI):
+        pagination = OffsetPagination(limit=4)
+
+    def books(request, context):  # pylint: disable=unused-argument
+        offset, limit = int(request.qs['offset'][0]), int(request.qs['limit'][0])
+        return {'books': BOOKS[offset:offset + limit]}
+
+    with requests_mock.Mocker() as mock:
+        mock.get('http://example.com/books/', json=books, headers=JSON_HEADERS)
+        assert ids(OffsetAPI().items()) == list(range(7))
+        assert [request.qs['offset'] for request in mock.request_history] == [['0'], ['4']]
+
+
+def test_cursor():
+    class CursorAPI(BookListAPI):
+        pagination = CursorPagination()
+
+    def books(request, context):  # pylint: disable=unused-argument
+        start = int(request.qs.get('cursor', ['0'])[0])
+        return {
+            'books': BOOKS[start:start + 5],
+            'next_cursor': str(start + 5) if start + 5 < len(BOOKS) else None,
+        }
+
+    with requests_mock.Mocker() as mock:
+        mock.get('http://example.com/books/', json=books, headers=JSON_HEADERS)
+        assert ids(CursorAPI()) == list(range(7))
+        assert mock.call_count == 2
+
+
+def test_link_header():
+    class LinkAPI(BookListAPI):
+        pagination = LinkHeaderPagination()
+
+    with requests_mock.Mocker() as mock:
+        mock.get('http://example.com/books/?sort=id', complete_qs=True, json={'books': BOOKS[:4]}, headers={
+            'Content-Type': 'application/json',
+            'Link': '</books/?sort=id&after=3>; rel="next", </books/?sort=id>; rel="first"',
+        })
+        mock.get('http://example.com/books/?sort=id&after=3', json={'books': BOOKS[4:]}, headers=JSON_HEADERS)
+        assert ids(LinkAPI()) == list(range(7))
+
+
+def test_max_pages():
+    class LimitedAPI(BookListAPI):
+        max_pages = 2
+
+    with requests_mock.Mocker() as mock:
+        mock.get('http://example.com/books/', json={'books': BOOKS[:1]}, headers=JSON_HEADERS)
+        assert len(list(LimitedAPI())) == 2
+        assert mock.call_count == 2
+
+
+def test_prefetch():
+    class PrefetchAPI(BookListAPI):
+        pagination = PageNumberPagination(size=1)
+        prefetch = 2
+
+    requested = threading.Semaphore(0)
+
+    def books(request, context):  # pylint: disable=unused-argument
+        requested.release()
+        page = int(request.qs['page'][0])
+        return {'books': BOOKS[page - 1:page]}
+
+    with requests_mock.Mocker() as mock:
+        mock.get('http://example.com/books/', json=books, headers=JSON_HEADERS)
+        items = PrefetchAPI().items()
+        assert next(items).id == 0
+
+        # Pages two and three are retrieved while the first is consumed, but no further
+        for _ in range(3):
+            assert requested.acquire(timeout=5)
+        assert not requested.acquire(timeout=0.2)
+
+        items.close()
+
+
+def test_error():
+    def books(request, context):  # pylint: disable=unused-argument
+        if request.qs['page'] == ['2']:
+            context.status_code = 500
+        return {'books': BOOKS[:1]}
+
+    with requests_mock.Mocker() as mock:
+        mock.get('http://example.com/books/', json=books, headers=JSON_HEADERS)
+        items = iter(BookListAPI())
+        assert next(items).id == 0
+        with pytest.raises(EaterUnexpectedError):
+            next(items)
+
+
+def test_call_retrieves_single_page():
+    with requests_mock.Mocker() as mock:
+        mock.get('http://example.com/books/?sort=id', json={'books': BOOKS[:2]}, headers=JSON_HEADERS)
+        assert ids(BookListAPI()().books) == [0, 1]
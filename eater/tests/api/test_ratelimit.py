@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.ratelimit
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.ratelimit`
+"""
+import asyncio
+import time
+from unittest import mock
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.types import StringType
+
+from eater import HTTPEater, EaterError, EaterRateLimitError
+from eater.api.ratelimit import RateLimiter, TokenBucket, get_rate_limiter
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+URL = 'http://example.com/book/'
+
+OK = {'json': {'title': 'Dune'}, 'headers': JSON_HEADERS}
+
+
+class Book(Model):
+    title = StringType()
+
+
+def create_api(limit, address: str=URL):
+    class GetBookAPI(HTTPEater):
+        url = address
+        response_cls = Book
+        rate_limit = limit
+
+    return GetBookAPI
+
+
+class Clock:
+    """
+    A fake monotonic clock, advanced by sleeping.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    fake = Clock()
+    with mock.patch('eater.api.ratelimit.time.monotonic', fake.monotonic), \
+            mock.patch('eater.api.ratelimit.time.sleep', fake.sleep):
+        yield fake
+
+
+def test_bucket(clock):  # pylint: disable=redefined-outer-name
+    bucket = TokenBucket(rate=10, burst=2)
+    assert [round(bucket.reserve(), 6) for _ in range(4)] == [0, 0, 0.1, 0.2]
+
+    clock.now += 10
+    assert [round(bucket.reserve(), 6) for _ in range(3)] == [0, 0, 0.1]
+
+
+def test_bucket_max_wait(clock):  # pylint: disable=redefined-outer-name,unused-argument
+    bucket = TokenBucket(rate=1, burst=1)
+    assert bucket.reserve(max_wait=0.5) == 0
+    assert bucket.reserve(max_wait=0.5) is None
+    assert bucket.reserve() == 1
+
+
+def test_bucket_pause(clock):  # pylint: disable=redefined-outer-name,unused-argument
+    bucket = TokenBucket(rate=10, burst=5)
+    bucket.pause(5)
+    assert round(bucket.reserve(), 6) == 5
+    assert round(bucket.reserve(), 6) == 5.1
+
+
+def test_bucket_limit(clock):  # pylint: disable=redefined-outer-name,unused-argument
+    bucket = TokenBucket(rate=10, burst=5)
+    bucket.limit(1)
+    assert [round(bucket.reserve(), 6) for _ in range(2)] == [0, 0.1]
+
+
+def test_rate_limiter_args():
+    assert RateLimiter(120, 'minute').tokens_per_second == 2
+    assert RateLimiter(10, 5).tokens_per_second == 2
+    with pytest.raises(ValueError):
+        RateLimiter(1, 'fortnight')
+    with pytest.raises(ValueError):
+        RateLimiter(1, per='endpoint')
+
+
+def test_get_rate_limiter():
+    assert get_rate_limiter(None) is None
+    limiter = RateLimiter(1)
+    assert get_rate_limiter(limiter) is limiter
+    assert get_rate_limiter((7, 'second', 2)) is get_rate_limiter((7, 'second', 2))
+    assert get_rate_limiter((7, 'second', 2)).burst == 2
+
+
+def test_shared_by_host(clock):  # pylint: disable=redefined-outer-name
+    first_cls = create_api((4, 'second', 2, 'host'))
+    second_cls = create_api((4, 'second', 2, 'host'), 'http://example.com/author/')
+    other_host_cls = create_api((4, 'second', 2, 'host'), 'http://example.org/book/')
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(requests_mock.ANY, **OK)
+        for _ in range(2):
+            first_cls()()
+            second_cls()()
+        other_host_cls()()
+
+    assert clock.sleeps == [0.25, 0.25]
+
+
+def test_shared_by_class(clock):  # pylint: disable=redefined-outer-name
+    limiter = RateLimiter(1, per='class')
+    first_cls, second_cls = create_api(limiter), create_api(limiter)
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, **OK)
+        first_cls()()
+        second_cls()()
+        first_cls()()
+
+    assert clock.sleeps == [1]
+
+
+def test_retry_after(clock):  # pylint: disable=redefined-outer-name
+    api_cls = create_api(RateLimiter(100, burst=10))
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, [{'status_code': 429, 'headers': {'Retry-After': '3'}}, OK])
+        with pytest.raises(EaterError):
+            api_cls()()
+        assert api_cls()().title == 'Dune'
+
+    assert clock.sleeps == [3]
+
+
+def test_rate_limit_headers(clock):  # pylint: disable=redefined-outer-name
+    api_cls = create_api(RateLimiter(100, burst=10))
+    exhausted = dict(OK, headers=dict(JSON_HEADERS, **{'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '2'}))
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, [exhausted, OK])
+        api_cls()()
+        api_cls()()
+
+    assert clock.sleeps == [2]
+
+
+def test_rate_limit_reset_timestamp():
+    limiter = RateLimiter(100, burst=10)
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = CaseInsensitiveDict({'RateLimit-Remaining': '0', 'RateLimit-Reset': str(int(time.time()) + 60)})
+    limiter.update('key', response)
+    assert 55 < limiter.get_bucket('key').reserve() <= 60
+
+
+def test_max_wait(clock):  # pylint: disable=redefined-outer-name,unused-argument
+    api_cls = create_api(RateLimiter(1, 'minute', max_wait=1))
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, **OK)
+        api_cls()()
+        with pytest.raises(EaterRateLimitError):
+            api_cls()()
+        assert mocker.call_count == 1
+
+
+def test_acall(clock):  # pylint: disable=redefined-outer-name,unused-argument
+    limiter = RateLimiter(1, burst=1)
+    response = requests.Response()
+    response.status_code = 200
+
+    async def send():
+        return response
+
+    async def call_twice():
+        await limiter.acall('key', send)
+        await limiter.acall('key', send)
+
+    with mock.patch('eater.api.ratelimit.asyncio.sleep') as sleep:
+        asyncio.run(call_twice())
+        assert [call[0][0] for call in sleep.await_args_list] == [1]
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.replay
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.replay`
+"""
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.types import IntType, ListType, StringType
+
+from eater import HTTPEater, EaterReplayError
+from eater.api.replay import RecordingAdapter, ReplayAdapter, ReplayRegistry, ReplayStore
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+
+class Book(Model):
+    id = IntType()  # pylint: disable=invalid-name
+    title = StringType()
+
+
+class BookListRequest(Model):
+    ids = ListType(IntType())
+
+
+class GetBookAPI(HTTPEater):
+    url = 'http://example.com/books/{request_model.id}/'
+    request_cls = Book
+    response_cls = Book
+
+
+class SearchBooksAPI(HTTPEater):
+    url = 'http://example.com/books/search/'
+    method = 'post'
+    request_cls = BookListRequest
+    response_cls = Book
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'books.replay')
+
+
+def record(path: str) -> requests_mock.Adapter:
+    """
+    Record responses from a mock upstream to the store at ``path``.
+    """
+    upstream = requests_mock.Adapter()
+    upstream.register_uri('GET', 'http://example.com/books/1/', json={'id': 1, 'title': 'Dune'}, headers=JSON_HEADERS)
+    upstream.register_uri('GET', 'http://example.com/books/2/', json={'id': 2, 'title': 'Emma'}, headers=JSON_HEADERS)
+    upstream.register_uri('POST', 'http://example.com/books/search/', json=lambda request, context: {
+        'id': request.json()['ids'][0], 'title': 'Search'
+    }, headers=JSON_HEADERS)
+
+    store = ReplayStore(path)
+    session = requests.Session()
+    session.mount('http://', RecordingAdapter(store, upstream))
+    try:
+        assert GetBookAPI(id=1, _requests={'session': session})().title == 'Dune'
+        assert GetBookAPI(id=2, _requests={'session': session})().title == 'Emma'
+        assert SearchBooksAPI(ids=[3], _requests={'session': session})().id == 3
+        assert SearchBooksAPI(ids=[4], _requests={'session': session})().id == 4
+    finally:
+        store.close()
+    return upstream
+
+
+def test_record_and_replay(path):  # pylint: disable=redefined-outer-name
+    upstream = record(path)
+    assert upstream.call_count == 4
+
+    store = ReplayStore(path)
+    assert len(store) == 4
+
+    session = requests.Session()
+    session.mount('http://', ReplayAdapter(store))
+    for _ in range(3):
+        assert GetBookAPI(id=1, _requests={'session': session})().title == 'Dune'
+        assert GetBookAPI(id=2, _requests={'session': session})().title == 'Emma'
+        assert SearchBooksAPI(ids=[4], _requests={'session': session})().id == 4
+        assert SearchBooksAPI(ids=[3], _requests={'session': session})().id == 3
+
+    assert upstream.call_count == 4
+
+
+def test_replay_missing(path):  # pylint: disable=redefined-outer-name
+    record(path)
+
+    class ReplayBookAPI(GetBookAPI):
+        session_registry = ReplayRegistry(path)
+
+    assert ReplayBookAPI(id=1)().title == 'Dune'
+    with pytest.raises(EaterReplayError):
+        ReplayBookAPI(id=3)()
+
+
+def test_registry(path, monkeypatch):  # pylint: disable=redefined-outer-name
+    upstream = record(path)
+    monkeypatch.setattr(HTTPEater, 'session_registry', ReplayRegistry(path))
+
+    assert GetBookAPI(id=2)().title == 'Emma'
+
+    class NewSessionAPI(GetBookAPI):
+        pool_sessions = False
+
+    assert NewSessionAPI(id=1)().title == 'Dune'
+    assert upstream.call_count == 4
+
+
+def test_record_latest(path):  # pylint: disable=redefined-outer-name
+    store = ReplayStore(path)
+    request = requests.Request('GET', 'http://example.com/books/1/').prepare()
+    key = store.get_key(request)
+
+    for status_code in (500, 200):
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = b'{}'  # pylint: disable=protected-access
+        response.headers = CaseInsensitiveDict({'Content-Encoding': 'gzip', 'Content-Length': '29'})
+        store.record(key, response)
+
+    assert key not in store
+    store.load()
+    status_code, _, _, headers, body = store.get(key)
+    assert status_code == 200
+    assert dict(headers) == {'Content-Length': '2'}
+    assert body == b'{}'
+    store.close()
+
+
+def test_interrupted_recording(path):  # pylint: disable=redefined-outer-name
+    record(path)
+    with open(path + '.idx', 'a', encoding='utf-8') as index_file:
+        index_file.write('abc')
+    assert len(ReplayStore(path)) == 4
+
+
+def test_get_key():
+    def key(method, url, data=None):
+        return ReplayStore.get_key(requests.Request(method, url, data=data).prepare())
+
+    assert key('get', 'http://example.com/') == key('GET', 'http://example.com/')
+    assert key('GET', 'http://example.com/') != key('POST', 'http://example.com/')
+    assert key('GET', 'http://example.com/?a=1') != key('GET', 'http://example.com/?a=2')
+    assert key('POST', 'http://example.com/', b'1') != key('POST', 'http://example.com/', b'2')
+
+
+def test_registry_mode(path):  # pylint: disable=redefined-outer-name
+    with pytest.raises(ValueError):
+        ReplayRegistry(path, mode='rewind')
+
+
+def test_replay_send_arguments(path):  # pylint: disable=redefined-outer-name
+    upstream = requests_mock.Adapter()
+    upstream.register_uri('GET', 'http://example.com/books/1/', json={'id': 1, 'title': 'Dune'}, headers=JSON_HEADERS)
+    store = ReplayStore(path)
+    request = requests.Request('GET', 'http://example.com/books/1/').prepare()
+    RecordingAdapter(store, upstream).send(request)
+    store.close()
+
+    # Accepted like any other adapter, though none of them apply to a recorded response
+    response = ReplayAdapter(ReplayStore(path)).send(
+        request, stream=True, timeout=1, verify=False, cert=None, proxies={}
+    )
+    assert response.json() == {'id': 1, 'title': 'Dune'}
+    assert b''.join(response.iter_content(4)) == response.content
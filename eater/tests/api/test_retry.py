@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.retry
+    ~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.retry`
+"""
+import asyncio
+from email.utils import formatdate
+import time
+from unittest import mock
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.types import StringType
+
+from eater import HTTPEater, EaterConnectError, EaterTimeoutError, EaterUnexpectedError
+from eater.api.retry import RetryBudget, RetryPolicy, parse_retry_after
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+URL = 'http://example.com/book/'
+
+
+class Book(Model):
+    title = StringType()
+
+
+def create_api(method: str='get', **kwargs):
+    class GetBookAPI(HTTPEater):
+        url = URL
+        response_cls = Book
+        retry = RetryPolicy(retry_budget=kwargs.pop('retry_budget', None), **kwargs)
+
+    GetBookAPI.method = method
+    return GetBookAPI
+
+
+OK = {'json': {'title': 'Dune'}, 'headers': JSON_HEADERS}
+
+
+@mock.patch('eater.api.retry.time.sleep')
+def test_retry_status(sleep):
+    api_cls = create_api(jitter=False)
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, [{'status_code': 503}, {'status_code': 502}, OK])
+        assert api_cls()().title == 'Dune'
+        assert mocker.call_count == 3
+
+    assert [call[0][0] for call in sleep.call_args_list] == [0.1, 0.2]
+
+
+@mock.patch('eater.api.retry.time.sleep')
+def test_retry_exceptions(sleep):  # pylint: disable=unused-argument
+    api_cls = create_api()
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, [{'exc': requests.ConnectTimeout}, {'exc': requests.ConnectionError}, OK])
+        assert api_cls()().title == 'Dune'
+        assert mocker.call_count == 3
+
+
+@mock.patch('eater.api.retry.time.sleep')
+def test_attempts_exhausted(sleep):  # pylint: disable=unused-argument
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, [{'status_code': 503}] * 3 + [OK])
+        with pytest.raises(EaterUnexpectedError):
+            create_api()()()
+        assert mocker.call_count == 3
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, exc=requests.ConnectTimeout)
+        with pytest.raises(EaterTimeoutError):
+            create_api(attempts=2)()()
+        assert mocker.call_count == 2
+
+
+@mock.patch('eater.api.retry.time.sleep')
+def test_not_retried(sleep):  # pylint: disable=unused-argument
+    with requests_mock.Mocker() as mocker:
+        # Not a retryable status
+        mocker.get(URL, [{'status_code': 500}, OK])
+        with pytest.raises(EaterUnexpectedError):
+            create_api()()()
+
+        # Not an idempotent method
+        mocker.post(URL, [{'exc': requests.ConnectionError}, OK])
+        with pytest.raises(EaterConnectError):
+            create_api(method='post')()()
+
+        assert mocker.call_count == 2
+
+        mocker.post(URL, [{'exc': requests.ConnectionError}, OK])
+        assert create_api(method='post', methods=['POST'])()().title == 'Dune'
+
+
+@mock.patch('eater.api.retry.time.sleep')
+def test_retry_after(sleep):
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, [{'status_code': 429, 'headers': {'Retry-After': '3'}}, OK])
+        assert create_api(jitter=False)()().title == 'Dune'
+        assert sleep.call_args[0][0] == 3
+
+        # Longer than max_backoff, give up
+        mocker.get(URL, [{'status_code': 429, 'headers': {'Retry-After': '120'}}, OK])
+        with pytest.raises(EaterUnexpectedError):
+            create_api()()()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('nonsense') is None
+    assert parse_retry_after('5') == 5
+    assert parse_retry_after('-5') == 0
+    assert 58 < parse_retry_after(formatdate(time.time() + 60, usegmt=True)) <= 60
+
+
+def test_jitter():
+    policy = RetryPolicy(backoff=1, max_backoff=3, retry_budget=None)
+    for attempt, maximum in [(1, 1), (2, 2), (3, 3)]:
+        policy.attempts = attempt + 1
+        assert all(0 <= policy.get_delay(attempt) <= maximum for _ in range(100))
+
+
+def test_budget():
+    retry_budget = RetryBudget(ratio=0.5, minimum=1)
+    assert retry_budget.withdraw()
+    assert not retry_budget.withdraw()
+
+    for _ in range(4):
+        retry_budget.deposit()
+    assert retry_budget.withdraw()
+    assert retry_budget.withdraw()
+    assert not retry_budget.withdraw()
+
+    # Once the window has passed the budget is replenished
+    with mock.patch('eater.api.retry.time.monotonic', return_value=time.monotonic() + 11):
+        assert retry_budget.withdraw()
+        assert not retry_budget.withdraw()
+
+
+@mock.patch('eater.api.retry.time.sleep')
+def test_budget_stops_retries(sleep):  # pylint: disable=unused-argument
+    api_cls = create_api(attempts=5, retry_budget=RetryBudget(ratio=0, minimum=2))
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(URL, status_code=503)
+        with pytest.raises(EaterUnexpectedError):
+            api_cls()()
+        with pytest.raises(EaterUnexpectedError):
+            api_cls()()
+        assert mocker.call_count == 4
+
+
+def test_acall():
+    policy = RetryPolicy(backoff=0, retry_budget=None)
+    responses = [EaterConnectError(), requests.Response(), requests.Response()]
+    responses[1].status_code, responses[2].status_code = 503, 200
+
+    async def send():
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    assert asyncio.run(policy.acall(send)).status_code == 200
+    assert not responses
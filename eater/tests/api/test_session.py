@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.session
+    ~~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.session`
+"""
+import threading
+
+from requests.auth import HTTPBasicAuth, HTTPDigestAuth
+from schematics import Model
+
+from eater import HTTPEater, SessionRegistry
+
+
+def test_instances_share_session():
+    class PersonAPI(HTTPEater):
+        request_cls = Model
+        response_cls = Model
+        url = 'http://example.com/person/'
+        session_registry = SessionRegistry()
+
+    assert PersonAPI().session is PersonAPI().session
+    assert len(PersonAPI.session_registry) == 1
+
+
+def test_session_keyed_by_host_auth_and_headers():  # pylint: disable=invalid-name
+    class PersonAPI(HTTPEater):
+        request_cls = Model
+        response_cls = Model
+        url = 'http://example.com/person/'
+        session_registry = SessionRegistry()
+
+    class OtherHostAPI(PersonAPI):
+        url = 'http://example.org/person/'
+
+    session = PersonAPI().session
+    assert OtherHostAPI().session is not session
+    assert PersonAPI(_requests={'auth': ('john', 's3cr3t')}).session is not session
+    assert PersonAPI(_requests={'headers': {'EGGS': 'Sausage'}}).session is not session
+    assert PersonAPI(_requests={'headers': {'eggs': 'Sausage'}}).session is \
+        PersonAPI(_requests={'headers': {'EGGS': 'Sausage'}}).session
+
+
+def test_session_keyed_by_auth_value():
+    class PersonAPI(HTTPEater):
+        request_cls = Model
+        response_cls = Model
+        url = 'http://example.com/person/'
+        session_registry = SessionRegistry()
+
+    sessions = {id(PersonAPI(_requests={'auth': HTTPBasicAuth('alice', 'pw')}).session) for _ in range(1000)}
+    assert len(sessions) == 1
+    assert len(PersonAPI.session_registry) == 1
+    assert PersonAPI(_requests={'auth': HTTPBasicAuth('bob', 'pw')}).session.auth.username == 'bob'
+
+    # Digest auth keeps per-instance state, so it's never pooled
+    assert PersonAPI(_requests={'auth': HTTPDigestAuth('alice', 'pw')}).session is not \
+        PersonAPI(_requests={'auth': HTTPDigestAuth('alice', 'pw')}).session
+    assert len(PersonAPI.session_registry) == 2
+
+
+def test_max_sessions():
+    registry = SessionRegistry(max_sessions=2)
+    first = registry.get_session('http://example.com/')
+    second = registry.get_session('http://example.org/')
+    assert registry.get_session('http://example.com/') is first
+
+    registry.get_session('http://example.net/')
+    assert len(registry) == 2
+    assert registry.get_session('http://example.com/') is first
+    assert registry.get_session('http://example.org/') is not second
+
+
+def test_pool_size():
+    class PersonAPI(HTTPEater):
+        request_cls = Model
+        response_cls = Model
+        url = 'http://example.com/person/'
+        session_registry = SessionRegistry()
+        pool_maxsize = 42
+
+    adapter = PersonAPI().session.get_adapter('http://example.com/')
+    assert adapter._pool_maxsize == 42  # pylint: disable=protected-access
+
+
+def test_pool_sessions_false():
+    class PersonAPI(HTTPEater):
+        request_cls = Model
+        response_cls = Model
+        url = 'http://example.com/person/'
+        session_registry = SessionRegistry()
+        pool_sessions = False
+
+    assert PersonAPI().session is not PersonAPI().session
+    assert len(PersonAPI.session_registry) == 0
+
+
+def test_close():
+    registry = SessionRegistry()
+    session = registry.get_session('http://example.com/')
+    other = registry.get_session('http://example.org/')
+
+    registry.close('http://example.com/anything')
+    assert len(registry) == 1
+    assert registry.get_session('http://example.com/') is not session
+    assert registry.get_session('http://example.org/') is other
+
+    registry.close()
+    assert len(registry) == 0
+
+
+def test_reset():
+    registry = SessionRegistry()
+    session = registry.get_session('http://example.com/')
+    registry.reset()
+    assert len(registry) == 0
+    assert registry.get_session('http://example.com/') is not session
+
+
+def test_thread_safe():
+    registry = SessionRegistry()
+    sessions = []
+
+    def get_session():
+        sessions.append(registry.get_session('http://example.com/'))
+
+    threads = [threading.Thread(target=get_session) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(map(id, sessions))) == 1
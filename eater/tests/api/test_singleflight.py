@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.singleflight
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.singleflight`
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.types import IntType, StringType
+
+from eater import HTTPEater, EaterUnexpectedError
+from eater.api.singleflight import SingleFlight
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+
+class BookRequest(Model):
+    id = IntType(required=True)  # pylint: disable=invalid-name
+
+
+class Book(Model):
+    title = StringType(required=True)
+
+
+def create_api(method: str='get'):
+    class GetBookAPI(HTTPEater):
+        url = 'http://example.com/books/{request_model.id}/'
+        request_cls = BookRequest
+        response_cls = Book
+        single_flight = SingleFlight()
+
+    GetBookAPI.method = method
+    return GetBookAPI
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def call_concurrently(api_cls, count, **kwargs):
+    def call():
+        try:
+            return api_cls(**kwargs)()
+        except EaterUnexpectedError as exc_info:
+            return exc_info
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(lambda _: call(), range(count)))
+
+
+def test_coalesce():
+    api_cls = create_api()
+
+    def respond(request, context):  # pylint: disable=unused-argument
+        # Hold the request open until every other thread is waiting on it
+        wait_for(lambda: api_cls.single_flight.shared == 7)
+        return {'title': 'Dune'}
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get('http://example.com/books/42/', json=respond, headers=JSON_HEADERS)
+        results = call_concurrently(api_cls, 8, id=42)
+
+        assert mocker.call_count == 1
+
+    assert all(result is results[0] for result in results)
+    assert results[0].title == 'Dune'
+    assert (api_cls.single_flight.calls, len(api_cls.single_flight)) == (1, 0)
+
+
+def test_different_credentials_not_coalesced():  # pylint: disable=invalid-name
+    class MeAPI(HTTPEater):
+        url = 'http://example.com/me/'
+        response_cls = Book
+        single_flight = SingleFlight()
+
+    held = []
+
+    def respond(request, context):  # pylint: disable=unused-argument
+        # Hold the first request open until the other is in flight too
+        if not held:
+            held.append(request)
+            wait_for(lambda: len(MeAPI.single_flight) == 2)
+        return {'title': request.headers['Authorization']}
+
+    def call(name):
+        return MeAPI(_requests={'headers': {'Authorization': name}})()
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(MeAPI.url, json=respond, headers=JSON_HEADERS)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(call, ['alice', 'bob']))
+
+        assert mocker.call_count == 2
+
+    assert [result.title for result in results] == ['alice', 'bob']
+    assert (MeAPI.single_flight.calls, MeAPI.single_flight.shared) == (2, 0)
+
+
+def test_errors_propagate():
+    api_cls = create_api()
+
+    def respond(request, context):  # pylint: disable=unused-argument
+        wait_for(lambda: api_cls.single_flight.shared == 3)
+        context.status_code = 500
+        return {}
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get('http://example.com/books/42/', json=respond, headers=JSON_HEADERS)
+        results = call_concurrently(api_cls, 4, id=42)
+        assert mocker.call_count == 1
+
+    assert all(isinstance(result, EaterUnexpectedError) for result in results)
+
+
+def test_sequential_calls_not_coalesced():
+    api_cls = create_api()
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get('http://example.com/books/1/', json={'title': 'Dune'}, headers=JSON_HEADERS)
+        mocker.get('http://example.com/books/2/', json={'title': 'Emma'}, headers=JSON_HEADERS)
+        assert api_cls(id=1)().title == 'Dune'
+        assert api_cls(id=1)().title == 'Dune'
+        assert api_cls(id=2)().title == 'Emma'
+        assert mocker.call_count == 3
+
+
+def test_non_idempotent_methods_not_coalesced():
+    api_cls = create_api(method='post')
+
+    with requests_mock.Mocker() as mocker:
+        mocker.post('http://example.com/books/42/', json={'title': 'Dune'}, headers=JSON_HEADERS)
+        call_concurrently(api_cls, 4, id=42)
+        assert mocker.call_count == 4
+
+    assert api_cls.single_flight.calls == 0
+
+
+def test_async():
+    single_flight = SingleFlight()
+    calls = []
+
+    async def fetch(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        if value == 'error':
+            raise ValueError(value)
+        return value
+
+    async def main():
+        results = await asyncio.gather(*[
+            single_flight.ado(key, lambda key=key: fetch(key)) for key in ['a', 'a', 'b', 'a']
+        ])
+        assert results == ['a', 'a', 'b', 'a']
+
+        # Cancelling the caller that started the call doesn't cancel it for others
+        first = asyncio.ensure_future(single_flight.ado('c', lambda: fetch('c')))
+        second = asyncio.ensure_future(single_flight.ado('c', lambda: fetch('c')))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == 'c'
+
+        errors = await asyncio.gather(*[
+            single_flight.ado('error', lambda: fetch('error')) for _ in range(3)
+        ], return_exceptions=True)
+        assert all(isinstance(error, ValueError) for error in errors)
+
+    asyncio.run(main())
+    assert calls == ['a', 'b', 'c', 'error']
+    assert (single_flight.calls, single_flight.shared, len(single_flight)) == (4, 5, 0)
+
+
+def test_leader_exception_not_swallowed():
+    single_flight = SingleFlight()
+
+    with pytest.raises(KeyError):
+        single_flight.do('key', lambda: {}['missing'])
+    assert not single_flight
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.streaming
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.streaming`
+"""
+import io
+import json
+from unittest import mock as unittest_mock
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.exceptions import DataError
+from schematics.types import IntType, ListType, ModelType, StringType
+
+from eater import HTTPEater
+from eater.api.retry import RetryPolicy
+from eater.api.streaming import ChunkReader, JSONArrayParser, iter_json_array, iter_ndjson
+
+
+class Book(Model):
+    title = StringType(required=True, min_length=3)
+
+
+class BookListResponse(Model):
+    count = IntType()
+    books = ListType(ModelType(Book))
+
+
+class BookListAPI(HTTPEater):
+    url = 'http://example.com/books/'
+    response_cls = BookListResponse
+    stream_chunk_size = 7
+
+
+DOCUMENT = {
+    'count': 3,
+    'decoy': [1, {'books': ['not these']}],
+    'escaped': 'a\\"b,[]{}:',
+    'books': [{'title': 'a,b]"\\\\', 'tags': [1, [2]]}, {'title': 'xyz'}, {'title': None}],
+    'after': True,
+}
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 1024])
+def test_iter_json_array_field(size):
+    chunks = chunked(json.dumps(DOCUMENT).encode(), size)
+    assert list(iter_json_array(chunks, 'books')) == DOCUMENT['books']
+
+
+@pytest.mark.parametrize('size', [1, 5, 1024])
+def test_iter_json_array_top_level(size):
+    chunks = chunked(json.dumps(DOCUMENT['books']).encode(), size)
+    assert list(iter_json_array(chunks)) == DOCUMENT['books']
+
+
+def test_iter_json_array_empty():
+    assert list(iter_json_array([b'[ ]'])) == []
+    assert list(iter_json_array([b'{"books": []}'], 'books')) == []
+    assert list(iter_json_array([b'{"books": null}'], 'books')) == []
+
+
+def test_parser_memory_is_bounded():
+    parser = JSONArrayParser('books')
+    parser.feed(b'{"books": [')
+    for _ in range(1000):
+        assert parser.feed(b'{"title": "Book"}, ') == [{'title': 'Book'}]
+        assert len(parser._buf) < 100  # pylint: disable=protected-access
+    assert parser.feed(b'{"title": "Last"}]}') == [{'title': 'Last'}]
+    assert parser.done
+
+
+def test_iter_ndjson():
+    assert list(iter_ndjson([b'{"a": 1}', b'', b'{"a": 2}'])) == [{'a': 1}, {'a': 2}]
+
+
+def test_chunk_reader():
+    reader = ChunkReader([b'abc', b'', b'defg', b'h'])
+    assert reader.read(2) == b'ab'
+    assert reader.read(4) == b'cdef'
+    buffer = bytearray(5)
+    assert reader.readinto(buffer) == 2
+    assert buffer[:2] == b'gh'
+    assert reader.read(1) == b''
+
+    reader = ChunkReader(chunked(b'abcdefghij', 3))
+    assert reader.read(1) == b'a'
+    assert reader.read() == bytearray(b'bcdefghij')
+    assert reader.read() == bytearray()
+
+
+def test_stream_json():
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            BookListAPI.url,
+            body=io.BytesIO(json.dumps({'count': 2, 'books': [{'title': 'One'}, {'title': 'Two'}]}).encode()),
+            headers=CaseInsensitiveDict({'Content-Type': 'application/json; charset=utf-8'})
+        )
+        books = BookListAPI().stream()
+        assert next(books) == Book({'title': 'One'})
+        assert next(books) == Book({'title': 'Two'})
+        assert next(books, None) is None
+
+
+def test_stream_ndjson():
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            BookListAPI.url,
+            body=io.BytesIO(b'{"title": "One"}\n{"title": "Two"}\n'),
+            headers=CaseInsensitiveDict({'Content-Type': 'application/x-ndjson'})
+        )
+        assert [book.title for book in BookListAPI().stream()] == ['One', 'Two']
+
+
+def test_stream_data_error():
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            BookListAPI.url,
+            body=io.BytesIO(json.dumps({'books': [{'title': 'One'}, {'title': 'No'}]}).encode()),
+            headers=CaseInsensitiveDict({'Content-Type': 'application/json'})
+        )
+        books = BookListAPI().stream()
+        assert next(books).title == 'One'
+        with pytest.raises(DataError) as exc_info:
+            next(books)
+        assert 'books' in exc_info.value.errors
+        assert 1 in exc_info.value.errors['books']
+
+
+def test_stream_field_required():
+    class AmbiguousResponse(Model):
+        books = ListType(ModelType(Book))
+        others = ListType(ModelType(Book))
+
+    class AmbiguousAPI(HTTPEater):
+        url = 'http://example.com/books/'
+        response_cls = AmbiguousResponse
+
+    with pytest.raises(TypeError):
+        next(AmbiguousAPI().stream())
+
+    class ChosenAPI(AmbiguousAPI):
+        stream_field = 'others'
+
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            ChosenAPI.url,
+            body=io.BytesIO(json.dumps({'books': [{'title': 'No'}], 'others': [{'title': 'Yes'}]}).encode()),
+            headers=CaseInsensitiveDict({'Content-Type': 'application/json'})
+        )
+        assert [book.title for book in ChosenAPI().stream()] == ['Yes']
+
+
+@unittest_mock.patch('eater.api.retry.time.sleep')
+def test_stream_retried(sleep):  # pylint: disable=unused-argument
+    class RetriedAPI(BookListAPI):
+        retry = RetryPolicy(jitter=False)
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get(RetriedAPI.url, [
+            {'status_code': 503},
+            {
+                'body': io.BytesIO(b'{"title": "One"}\n'),
+                'headers': CaseInsensitiveDict({'Content-Type': 'application/x-ndjson'})
+            },
+        ])
+        assert [book.title for book in RetriedAPI().stream()] == ['One']
+        assert mocker.call_count == 2
+
+
+def test_stream_missing_content_type():
+    with requests_mock.Mocker() as mocker:
+        mocker.get(BookListAPI.url, body=io.BytesIO(b'{"title": "One"}\n'), headers=CaseInsensitiveDict())
+        with pytest.raises(NotImplementedError):
+            next(BookListAPI().stream())
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.timing
+    ~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.timing`
+"""
+import pytest
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.types import IntType, StringType
+
+from eater import HTTPEater, EaterUnexpectedError
+from eater.api import timing
+from eater.api.cache import ResponseCache
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+
+class BookRequest(Model):
+    id = IntType(required=True)  # pylint: disable=invalid-name
+
+
+class Book(Model):
+    title = StringType()
+
+
+class UpdateBookAPI(HTTPEater):
+    url = 'http://example.com/books/{request_model.id}/'
+    method = 'post'
+    request_cls = BookRequest
+    response_cls = Book
+
+
+@pytest.fixture
+def timings():
+    collected = []
+    timing.add_listener(collected.append)
+    yield collected
+    timing.remove_listener(collected.append)
+
+
+def test_phases(timings):  # pylint: disable=redefined-outer-name
+    with requests_mock.Mocker() as mocker:
+        mocker.post('http://example.com/books/1/', json={'title': 'Dune'}, headers=JSON_HEADERS)
+        UpdateBookAPI(id=1)()
+
+    assert len(timings) == 1
+    call = timings[0]
+    assert (call.eater, call.method, call.url, call.status) == (
+        'UpdateBookAPI', 'post', 'http://example.com/books/1/', 200
+    )
+    assert call.request_bytes == len(UpdateBookAPI(id=1).json_codec.dumps({'id': 1}))
+    assert call.response_bytes == len(b'{"title": "Dune"}')
+    assert call.error is None
+    assert set(call.phases) == {'prepare', 'ttfb', 'download', 'decode', 'validate', 'total'}
+    assert call.phases['total'] >= sum(seconds for name, seconds in call.phases.items() if name != 'total')
+    assert 'UpdateBookAPI POST' in repr(call)
+
+
+def test_error(timings):  # pylint: disable=redefined-outer-name
+    with requests_mock.Mocker() as mocker:
+        mocker.post('http://example.com/books/1/', status_code=500)
+        with pytest.raises(EaterUnexpectedError):
+            UpdateBookAPI(id=1)()
+
+    assert isinstance(timings[0].error, EaterUnexpectedError)
+    assert timings[0].status == 500
+    assert 'validate' not in timings[0].phases
+
+
+def test_class_listeners():
+    collected = []
+
+    class GetBookAPI(UpdateBookAPI):
+        method = 'get'
+        cache = ResponseCache()
+        timing_listeners = [collected.append]
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get('http://example.com/books/1/', json={'title': 'Dune'}, headers=JSON_HEADERS)
+        GetBookAPI(id=1)()
+        GetBookAPI(id=1)()
+        UpdateBookAPI(id=1)  # Not called, so not timed
+
+    assert len(collected) == 2
+    # The second call was served from the cache
+    assert set(collected[1].phases) == {'prepare', 'total'}
+
+
+def test_failing_listener_ignored(caplog):
+    def fail(call):
+        raise ValueError(call)
+
+    class GetBookAPI(UpdateBookAPI):
+        method = 'get'
+        timing_listeners = [fail]
+
+    with requests_mock.Mocker() as mocker:
+        mocker.get('http://example.com/books/1/', json={'title': 'Dune'}, headers=JSON_HEADERS)
+        assert GetBookAPI(id=1)().title == 'Dune'
+
+    assert 'Timing listener' in caplog.text
+
+
+def test_no_listeners():
+    assert timing.get_listeners(UpdateBookAPI) == []
+    assert timing.phase('decode') is timing.NULL_PHASE
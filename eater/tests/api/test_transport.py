@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.transport
+    ~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.transport`
+"""
+import gzip
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from schematics import Model
+from schematics.types import IntType, ListType, ModelType, StringType
+
+from eater import HTTPEater, EaterConnectError, EaterTimeoutError, EaterTransportError, EaterUnexpectedError
+from eater.api.replay import ReplayRegistry
+from eater.api.transport import HTTPXTransport, MemoryTransport, Urllib3Transport
+
+
+class Book(Model):
+    id = IntType()  # pylint: disable=invalid-name
+    title = StringType()
+
+
+class BookListResponse(Model):
+    books = ListType(ModelType(Book))
+
+
+class BookHandler(BaseHTTPRequestHandler):
+    """
+    Serve books, echoing the request body and headers, slowly or compressed on request.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        if self.path == '/redirect/':
+            self.send_response(302)
+            self.send_header('Location', '/books/1/')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/books/':
+            self.respond({'books': [{'id': 1, 'title': 'Dune'}, {'id': 2, 'title': 'Emma'}]})
+            return
+        if self.path == '/slow/':
+            time.sleep(0.5)
+        self.respond({'id': 1, 'title': self.headers.get('X-Title', 'Dune')})
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.respond({'id': request['id'], 'title': request['title'].upper()})
+
+    def respond(self, data: dict):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture(scope='module')
+def server_url():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), BookHandler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:%d' % httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def create_apis(base_url: str, api_transport) -> tuple:
+    class GetBookAPI(HTTPEater):
+        url = base_url + '/books/1/'
+        response_cls = Book
+        transport = api_transport
+
+    class PostBookAPI(GetBookAPI):
+        method = 'post'
+        request_cls = Book
+
+    return GetBookAPI, PostBookAPI
+
+
+@pytest.fixture(params=['urllib3', 'httpx'])
+def transport(request):
+    if request.param == 'httpx':
+        pytest.importorskip('httpx')
+        instance = HTTPXTransport(http2=False)
+    else:
+        pytest.importorskip('urllib3', minversion='1.26')
+        instance = Urllib3Transport()
+    yield instance
+    instance.close()
+
+
+def test_network_transport(server_url, transport):  # pylint: disable=redefined-outer-name
+    get_api, post_api = create_apis(server_url, transport)
+
+    assert get_api()().title == 'Dune'
+    assert post_api(id=2, title='emma')().title == 'EMMA'
+    assert get_api(_requests={'headers': {'X-Title': 'Persuasion'}})().title == 'Persuasion'
+
+    class RedirectAPI(get_api):
+        url = server_url + '/redirect/'
+
+    assert RedirectAPI()().title == 'Dune'
+
+
+def test_network_transport_errors(server_url, transport):  # pylint: disable=redefined-outer-name
+    get_api, _ = create_apis(server_url, transport)
+
+    class SlowAPI(get_api):
+        url = server_url + '/slow/'
+
+        def get_request_kwargs(self, request_model, **kwargs):
+            return dict(super().get_request_kwargs(request_model, **kwargs), timeout=0.1)
+
+    with pytest.raises(EaterTimeoutError):
+        SlowAPI()()
+
+    # Find a port nothing is listening on
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    class RefusedAPI(get_api):
+        url = 'http://127.0.0.1:%d/books/1/' % port
+
+    with pytest.raises(EaterConnectError):
+        RefusedAPI()()
+
+
+def test_network_transport_stream(server_url, transport):  # pylint: disable=redefined-outer-name
+    class StreamBooksAPI(HTTPEater):
+        url = server_url + '/books/'
+        response_cls = BookListResponse
+
+    StreamBooksAPI.transport = transport
+    assert [book.title for book in StreamBooksAPI().stream()] == ['Dune', 'Emma']
+
+
+def test_memory_transport():
+    transport = MemoryTransport()  # pylint: disable=redefined-outer-name
+    transport.add('GET', 'http://example.com/books/1/', json={'id': 1, 'title': 'Dune'})
+    transport.add('GET', 'http://example.com/books/1/?edition=2', json={'id': 1, 'title': 'Dune II'})
+    transport.add('POST', 'http://example.com/books/1/', lambda request: (
+        201, {'Content-Type': 'application/json'}, request.body
+    ))
+    transport.add('GET', 'http://example.com/books/2/', status_code=404)
+    get_api, post_api = create_apis('http://example.com', transport)
+
+    assert get_api()().title == 'Dune'
+    assert get_api(_requests={'headers': {'X-Edition': '1'}})().title == 'Dune'
+    assert transport.requests[-1].headers['X-Edition'] == '1'
+    assert post_api(id=1, title='Emma')().title == 'Emma'
+
+    class EditionAPI(get_api):
+        def get_request_kwargs(self, request_model, **kwargs):
+            return dict(super().get_request_kwargs(request_model, **kwargs), params={'edition': self.edition})
+
+    EditionAPI.edition = 2
+    assert EditionAPI()().title == 'Dune II'
+    EditionAPI.edition = 3
+    assert EditionAPI()().title == 'Dune'
+
+    class MissingAPI(get_api):
+        url = 'http://example.com/books/2/'
+
+    with pytest.raises(EaterUnexpectedError):
+        MissingAPI()()
+
+    class UnknownAPI(get_api):
+        url = 'http://example.com/books/3/'
+
+    with pytest.raises(EaterConnectError):
+        UnknownAPI()()
+
+    class StreamBooksAPI(get_api):
+        url = 'http://example.com/books/'
+        response_cls = BookListResponse
+
+    transport.add('GET', StreamBooksAPI.url, json={'books': [{'id': 1, 'title': 'Dune'}, {'id': 2, 'title': 'Emma'}]})
+    assert [book.title for book in StreamBooksAPI().stream()] == ['Dune', 'Emma']
+
+    assert len(transport.requests) == 8
+
+
+def test_unsupported(tmpdir):
+    transport = MemoryTransport()  # pylint: disable=redefined-outer-name
+    transport.add('GET', 'http://example.com/books/1/', json={'id': 1, 'title': 'Dune'})
+    get_api, _ = create_apis('http://example.com', transport)
+
+    for kwargs in ({'verify': False}, {'proxies': {'http': 'http://proxy'}}, {'cookies': {'a': '1'}},
+                   {'cert': 'client.pem'}, {'hooks': {'response': []}}):
+        with pytest.raises(EaterTransportError):
+            get_api()(**kwargs)
+    with pytest.raises(TypeError):
+        get_api()(verfiy=False)
+
+    # The transport would bypass the adapters that record and replay
+    registry = ReplayRegistry(str(tmpdir.join('books.replay')), mode='record')
+    with pytest.raises(EaterTransportError):
+        get_api(_requests={'session': registry.get_session(get_api.url)})()
+    registry.close()
+
+    session = requests.Session()
+    assert get_api(_requests={'session': session})().title == 'Dune'
+    assert len(transport.requests) == 1
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+    eater.tests.api.validation
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Tests on :py:mod:`eater.api.validation`
+"""
+import pytest
+from requests.structures import CaseInsensitiveDict
+import requests_mock
+from schematics import Model
+from schematics.exceptions import DataError
+from schematics.types import IntType, ListType, ModelType, StringType
+
+from eater import HTTPEater
+from eater.api.validation import (
+    FullValidation, SampledValidation, TypesOnlyValidation, get_validation_policy, validate_sample
+)
+
+
+JSON_HEADERS = CaseInsensitiveDict({
+    'Content-Type': 'application/json'
+})
+
+
+class Book(Model):
+    title = StringType(required=True, min_length=3)
+    pages = IntType(min_value=1)
+
+
+class BookListResponse(Model):
+    books = ListType(ModelType(Book))
+
+
+class BookListAPI(HTTPEater):
+    url = 'http://example.com/books/'
+    response_cls = BookListResponse
+
+
+VALID = {'books': [{'title': 'Dune', 'pages': 412}, {'title': 'Emma'}]}
+
+# Types are correct but validators fail
+DRIFTED = {'books': [{'title': 'Dune'}, {'title': 'Ox', 'pages': 0}]}
+
+# Types are wrong
+BROKEN = {'books': [{'title': 'Dune', 'pages': 'many'}]}
+
+
+def titles(model: BookListResponse) -> list:
+    return [book.title for book in model.books]
+
+
+@pytest.mark.parametrize('compiled', [True, False])
+def test_full(compiled):
+    policy = FullValidation()
+    assert titles(policy.build(BookListResponse, VALID, compiled)) == ['Dune', 'Emma']
+    with pytest.raises(DataError):
+        policy.build(BookListResponse, DRIFTED, compiled)
+
+
+@pytest.mark.parametrize('compiled', [True, False])
+def test_types_only(compiled):
+    policy = TypesOnlyValidation()
+    assert titles(policy.build(BookListResponse, DRIFTED, compiled)) == ['Dune', 'Ox']
+
+    with pytest.raises(DataError):
+        policy.build(BookListResponse, BROKEN, compiled)
+
+    with pytest.raises(DataError):
+        policy.build(BookListResponse, {'books': [{'pages': 1}]}, compiled)
+
+
+def test_sampled_rate():
+    policy = SampledValidation(rate=3)
+
+    with pytest.raises(DataError):
+        policy.build(BookListResponse, DRIFTED)
+    policy.build(BookListResponse, DRIFTED)
+    policy.build(BookListResponse, DRIFTED)
+    with pytest.raises(DataError):
+        policy.build(BookListResponse, DRIFTED)
+
+    assert (policy.count, policy.sampled, policy.violations) == (4, 2, 2)
+
+
+def test_sampled_items():
+    policy = SampledValidation(rate=None, items=1)
+
+    # Only the first book is validated
+    model = policy.build(BookListResponse, DRIFTED)
+    assert titles(model) == ['Dune', 'Ox']
+    assert (policy.count, policy.sampled, policy.violations) == (1, 1, 0)
+
+    with pytest.raises(DataError):
+        policy.build(BookListResponse, {'books': list(reversed(DRIFTED['books']))})
+    assert policy.violations == 1
+
+
+def test_sampled_count_only():
+    policy = SampledValidation(rate=1, raise_errors=False)
+    assert titles(policy.build(BookListResponse, DRIFTED)) == ['Dune', 'Ox']
+    assert policy.violations == 1
+
+    # Conversion errors are always raised
+    with pytest.raises(DataError):
+        policy.build(BookListResponse, BROKEN)
+    assert policy.violations == 2
+
+
+def test_validate_sample():
+    class Shelf(Model):
+        books = ListType(ModelType(Book), min_size=5)
+        tags = ListType(StringType(min_length=2))
+
+    class Library(Model):
+        name = StringType(min_length=3)
+        shelf = ModelType(Shelf)
+
+    books = [{'title': 'Dune'}] * 9 + [{'title': 'Ox'}]
+    validate_sample(Library, {'name': 'Main', 'shelf': {'books': books, 'tags': ['sf']}}, 2)
+
+    # Lists of scalars aren't truncated, only lists of models
+    with pytest.raises(DataError):
+        validate_sample(Library, {'name': 'Main', 'shelf': {'books': books, 'tags': ['sf', 'x']}}, 2)
+
+    # The size of a list is checked when it isn't truncated
+    with pytest.raises(DataError):
+        validate_sample(Library, {'name': 'Main', 'shelf': {'books': books[:2], 'tags': []}}, 2)
+
+    with pytest.raises(DataError):
+        validate_sample(Library, {'name': 'X', 'shelf': {'books': books}}, 2)
+
+    with pytest.raises(DataError):
+        validate_sample(Library, {'shelf': {'books': [{'title': 'Ox'}] + books}}, 2)
+
+
+def test_sampled_items_min_size():
+    class MinSizeResponse(Model):
+        books = ListType(ModelType(Book), min_size=5)
+
+    policy = SampledValidation(rate=None, items=2)
+    model = policy.build(MinSizeResponse, {'books': [{'title': 'Dune'}] * 10})
+    assert len(model.books) == 10
+    assert policy.violations == 0
+
+
+def test_get_validation_policy():
+    assert isinstance(get_validation_policy('full'), FullValidation)
+    assert isinstance(get_validation_policy('types-only'), TypesOnlyValidation)
+    assert isinstance(get_validation_policy('sampled'), SampledValidation)
+
+    policy = SampledValidation()
+    assert get_validation_policy(policy) is policy
+
+    with pytest.raises(ValueError):
+        get_validation_policy('some')
+
+
+def test_class_and_call_policy():
+    class TypesOnlyAPI(BookListAPI):
+        validation = 'types-only'
+
+    with requests_mock.Mocker() as mock:
+        mock.get(BookListAPI.url, json=DRIFTED, headers=JSON_HEADERS)
+
+        with pytest.raises(DataError):
+            BookListAPI()()
+
+        assert titles(TypesOnlyAPI()()) == ['Dune', 'Ox']
+        assert titles(BookListAPI(_validation='types-only')()) == ['Dune', 'Ox']
+
+        with pytest.raises(DataError):
+            TypesOnlyAPI(_validation='full')()
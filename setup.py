@@ -33,7 +33,11 @@ classes = """
     Intended Audience :: Developers
     Programming Language :: Python
     Programming Language :: Python :: 3
-    Programming Language :: Python :: 3.5
+    Programming Language :: Python :: 3.7
+    Programming Language :: Python :: 3.8
+    Programming Language :: Python :: 3.9
+    Programming Language :: Python :: 3.10
+    Programming Language :: Python :: 3.11
     Programming Language :: Python :: Implementation :: CPython
     Programming Language :: Python :: Implementation :: PyPy
     Operating System :: OS Independent
@@ -109,6 +113,16 @@ def reqs(*f):
 
 install_requires = reqs('default.txt')
 
+extras_require = {
+    'async': reqs('async.txt'),
+    'fast': reqs('fast.txt'),
+    'msgpack': reqs('msgpack.txt'),
+    'cbor': reqs('cbor.txt'),
+    'http2': reqs('http2.txt'),
+    'urllib3': reqs('urllib3.txt'),
+    'brotli': reqs('brotli.txt'),
+}
+
 # -*- Tests Requires -*-
 
 tests_require = reqs('test.txt')
@@ -132,7 +146,9 @@ setup(
     packages=find_packages(),
     package_data={'eater': ['tests/templates/*.html']},
     zip_safe=False,
+    python_requires='>=3.7',
     install_requires=install_requires,
+    extras_require=extras_require,
     tests_require=tests_require,
     test_suite='nose.collector',
     classifiers=classifiers,